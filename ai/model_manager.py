@@ -16,6 +16,8 @@ import logging
 from dataclasses import dataclass
 import time
 
+from monitoring.resource_sampler import gpu_temperature
+
 # 한국어 로깅 설정
 logging.basicConfig(
     level=logging.INFO,
@@ -33,7 +35,7 @@ class GPUStatus:
     device_id: int
     memory_used: float
     memory_total: float
-    temperature: float
+    temperature: Optional[float]  # NVML을 사용할 수 없으면 None
     utilization: float
     is_available: bool
 
@@ -69,8 +71,9 @@ class H100MemoryManager:
                 # GPU 사용률 (근사치)
                 utilization = torch.cuda.utilization(i) if hasattr(torch.cuda, 'utilization') else 0
                 
-                # 온도 정보 (nvidia-ml-py 필요시 추가)
-                temperature = 70  # 기본값 (실제 구현시 nvidia-ml-py 사용)
+                # 온도 정보 (nvidia-ml-py 미설치 시 None → 온도 제한 미적용)
+                temperature = gpu_temperature(i)
+                temperature_ok = temperature is None or temperature < self.temperature_threshold
                 
                 gpu_status = GPUStatus(
                     device_id=i,
@@ -78,7 +81,7 @@ class H100MemoryManager:
                     memory_total=memory_total,
                     temperature=temperature,
                     utilization=utilization,
-                    is_available=memory_used/memory_total < self.memory_threshold and temperature < self.temperature_threshold
+                    is_available=memory_used/memory_total < self.memory_threshold and temperature_ok
                 )
                 
                 gpu_statuses.append(gpu_status)
@@ -6,7 +6,7 @@ import warnings
 warnings.filterwarnings("ignore", message="pkg_resources is deprecated")
 from threading import Lock
 
-from flask import Flask, request, jsonify, send_from_directory, render_template_string
+from flask import Flask, request, jsonify, send_from_directory, render_template_string, stream_with_context, g, has_request_context
 from flask_cors import CORS
 import torch
 import torch.nn as nn
@@ -20,15 +20,11 @@ from concurrent.futures import ThreadPoolExecutor
 import asyncio
 from functools import wraps
 import warnings
-import whisper
 import tempfile
+import shutil
 from werkzeug.utils import secure_filename
 import requests
 import json
-import librosa
-import noisereduce as nr
-from pydub import AudioSegment
-from pydub.silence import split_on_silence
 import numpy as np
 from datetime import datetime, timedelta
 import uuid
@@ -55,6 +51,27 @@ from concurrent.futures import ThreadPoolExecutor
 from flask import Response
 from threading import Lock
 
+from audio.preprocess import preprocess_file
+from audio.streaming_stt import StreamingTranscriber, SUPPORTED_ENCODINGS
+from audio.transcript_cache import TranscriptCache
+from audio.model_loader import LazyModel
+from audio.stt_engines import (
+    STTRouter, FasterWhisperEngine, TransformersWhisperEngine, SpeechRecognitionEngine, probe_duration
+)
+from audio.diarization import Diarizer, assign_speakers, format_speaker_transcript
+from audio.summarizer import MapReduceSummarizer
+from audio.session_events import SessionStore, session_event, sse_events
+from audio.chunked_upload import ChunkedUploadStore, UploadError, save_stream
+from monitoring.ring_buffer import RingBuffer, RequestLogRecord
+from monitoring.hyperloglog import SlidingWindowDistinct
+from monitoring.usage_store import UsageStore
+from monitoring.tracing import Tracer, OTLPJsonFileExporter
+from monitoring.resource_sampler import ResourceSampler
+from monitoring.metrics import (
+    observe_request, stage_timer, timed_stage, set_queue_depth, track_queue, submit_tracked,
+    record_cache, observe_stt, uptime_seconds, render_metrics
+)
+
 # ============= 로깅 설정 (먼저 설정) =============
 logging.basicConfig(
     level=logging.INFO,
@@ -63,29 +80,39 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # ============= 음성 처리 관련 imports =============
-try:
-    from faster_whisper import WhisperModel
-    FASTER_WHISPER_AVAILABLE = True
-    logger.info("✅ Faster Whisper 사용 가능")
-except ImportError:
-    FASTER_WHISPER_AVAILABLE = False
-    logger.warning("⚠️ Faster Whisper 사용 불가")
+# EXGPT_AUDIO_ENABLED=false 이면 채팅 전용 워커로 실행 (음성 스택을 import하지 않음)
+AUDIO_ENABLED = os.getenv('EXGPT_AUDIO_ENABLED', 'true').lower() == 'true'
 
-try:
-    import speech_recognition as sr
-    SPEECH_RECOGNITION_AVAILABLE = True
-    logger.info("✅ SpeechRecognition 사용 가능")
-except ImportError:
-    SPEECH_RECOGNITION_AVAILABLE = False
-    logger.warning("⚠️ SpeechRecognition 사용 불가")
+FASTER_WHISPER_AVAILABLE = False
+SPEECH_RECOGNITION_AVAILABLE = False
+TRANSFORMERS_AVAILABLE = False
 
-try:
-    from transformers import WhisperProcessor, WhisperForConditionalGeneration
-    TRANSFORMERS_AVAILABLE = True
-    logger.info("✅ Transformers Whisper 사용 가능")
-except ImportError:
-    TRANSFORMERS_AVAILABLE = False
-    logger.warning("⚠️ Transformers 사용 불가")
+if AUDIO_ENABLED:
+    import librosa
+    from pydub import AudioSegment
+    
+    try:
+        from faster_whisper import WhisperModel
+        FASTER_WHISPER_AVAILABLE = True
+        logger.info("✅ Faster Whisper 사용 가능")
+    except ImportError:
+        logger.warning("⚠️ Faster Whisper 사용 불가")
+    
+    try:
+        import speech_recognition as sr
+        SPEECH_RECOGNITION_AVAILABLE = True
+        logger.info("✅ SpeechRecognition 사용 가능")
+    except ImportError:
+        logger.warning("⚠️ SpeechRecognition 사용 불가")
+    
+    try:
+        from transformers import WhisperProcessor, WhisperForConditionalGeneration
+        TRANSFORMERS_AVAILABLE = True
+        logger.info("✅ Transformers Whisper 사용 가능")
+    except ImportError:
+        logger.warning("⚠️ Transformers 사용 불가")
+else:
+    logger.info("💬 채팅 전용 모드: 음성 처리 모듈을 로드하지 않습니다")
 
 # ============= Flask 앱 및 CORS 설정 =============
 app = Flask(__name__)
@@ -112,19 +139,47 @@ request_queue = Queue()
 gpu_load_tracker = {device: 0 for device in available_devices}
 gpu_lock = threading.Lock()
 
-# 통계 데이터 저장
+# 통계 데이터 저장 (최근 로그 / GPU 사용 이력은 고정 용량 링 버퍼)
 stats_data = {
     'total_requests': 0,
     'successful_requests': 0,
     'failed_requests': 0,
-    'active_users': set(),
-    'daily_usage': {},
-    'gpu_usage_history': [],
-    'recent_logs': []
+    # 5분/1시간/24시간 고유 사용자 수 (HyperLogLog, 고정 메모리)
+    'active_users': SlidingWindowDistinct(shared_dir=os.getenv('ACTIVE_USERS_SHARED_DIR')),
+    'gpu_usage_history': RingBuffer(int(os.getenv('GPU_HISTORY_CAPACITY', '2000'))),
+    'recent_logs': RingBuffer(int(os.getenv('REQUEST_LOG_CAPACITY', '1000')),
+                              spill_path=os.getenv('REQUEST_LOG_SPILL_PATH'),
+                              spill_max_bytes=int(float(os.getenv('REQUEST_LOG_SPILL_MAX_MB', '50')) * 1024 * 1024))
 }
 
-# 업로드 세션 관리
-upload_sessions = {}
+# 통계 카운터 동기화 (여러 요청 스레드에서 갱신)
+stats_lock = threading.Lock()
+
+# CPU/RSS/GPU 자원 샘플링 → gpu_usage_history (요청 경로에서는 장치를 조회하지 않음)
+resource_sampler = ResourceSampler(stats_data['gpu_usage_history'],
+                                   interval=float(os.getenv('RESOURCE_SAMPLE_INTERVAL', '5')))
+if resource_sampler.interval > 0:
+    resource_sampler.start()
+
+# 요청 추적 (TRACE_SAMPLE_RATE 비율로 기록, TRACE_ALLOW_CLIENT_FORCE=true면 X-Trace: 1 헤더 요청도 기록)
+# 추적 ID는 항상 서버가 생성 - 클라이언트 X-Request-ID는 속성으로만 남겨 다른 요청의 추적을 덮어쓰지 못하게 함
+TRACE_ALLOW_CLIENT_FORCE = os.getenv('TRACE_ALLOW_CLIENT_FORCE', 'false').lower() == 'true'
+tracer = Tracer(
+    sample_rate=float(os.getenv('TRACE_SAMPLE_RATE', '0')),
+    exporter=OTLPJsonFileExporter(os.getenv('TRACE_EXPORT_PATH')) if os.getenv('TRACE_EXPORT_PATH') else None,
+    max_traces=int(os.getenv('TRACE_MAX_STORED', '500'))
+)
+
+# 사용량 이벤트 영구 저장 (백그라운드 배치 기록 + 일별 집계)
+usage_store = UsageStore(os.getenv('USAGE_DB_PATH', 'data/usage.db'))
+
+# 분할 업로드 세션 관리 (상태는 디스크에 기록 - 워커 간 공유, 재시작 후 이어받기)
+UPLOAD_CHUNK_SIZE = int(os.getenv('UPLOAD_CHUNK_MB', '8')) * 1024 * 1024
+upload_sessions = ChunkedUploadStore(
+    upload_dir=os.getenv('UPLOAD_DIR', 'data/uploads'),
+    max_bytes=int(os.getenv('UPLOAD_MAX_MB', '2048')) * 1024 * 1024,
+    ttl_seconds=float(os.getenv('UPLOAD_TTL_SECONDS', '86400'))
+)
 
 # ============================================================================
 # STEP 2: 전역 변수 섹션에 추가
@@ -132,15 +187,11 @@ upload_sessions = {}
 # 글로벌 변수 선언
 qdrant_client = None
 embedding_model = None
-whisper_model = None
 optimized_ollama = None
 gpu_ollama = None
 
 # 음성 처리 모델들
 faster_whisper_model = None
-transformers_whisper_model = None
-transformers_processor = None
-speech_recognizer = None
 
 
 # 음성 처리 설정
@@ -157,13 +208,43 @@ WHISPER_OPTIONS = {
     'beam_size': 5,
     'condition_on_previous_text': True,
     'compression_ratio_threshold': 2.4,
-    'logprob_threshold': -1.0,
+    'log_prob_threshold': -1.0,
     'no_speech_threshold': 0.6
 }
 
-# 음성 처리 세션 관리
-audio_processing_sessions = {}
-audio_processing_lock = Lock()
+# STT 모델 크기 (전사 캐시 키에도 사용)
+STT_MODEL_SIZE = os.getenv('STT_MODEL_SIZE', 'medium')
+
+# 전사 결과 캐시 (같은 녹음을 다른 처리 유형으로 재요청할 때 STT 생략)
+transcript_cache = TranscriptCache(
+    cache_dir=os.getenv('TRANSCRIPT_CACHE_DIR', 'data/transcript_cache'),
+    max_bytes=int(os.getenv('TRANSCRIPT_CACHE_MAX_MB', '1024')) * 1024 * 1024
+)
+
+# 실시간 스트리밍 STT 동시 추론 수 (모델은 모든 세션이 공유)
+STT_STREAM_WORKERS = int(os.getenv('STT_STREAM_WORKERS', '2'))
+
+# STT 모델은 첫 사용 시 로드, 유휴 시간(초) 경과 후 언로드 (0이면 언로드하지 않음)
+STT_IDLE_UNLOAD_SECONDS = float(os.getenv('STT_IDLE_UNLOAD_SECONDS', '900'))
+STT_PRELOAD = os.getenv('STT_PRELOAD', 'false').lower() == 'true'
+
+# 온라인 STT(Google) 허용 여부 - 기본은 오프라인 엔진만 사용
+STT_ALLOW_ONLINE = os.getenv('STT_ALLOW_ONLINE', 'false').lower() == 'true'
+STT_TRANSFORMERS_MODEL = os.getenv('STT_TRANSFORMERS_MODEL', 'openai/whisper-medium')
+
+# 화자 분리 (CPU 임베딩 모델, 요청 시 form 필드 diarize=true)
+SPEAKER_EMBEDDING_BACKEND = os.getenv('SPEAKER_EMBEDDING_BACKEND', 'auto')
+speaker_diarizer = LazyModel('speaker-diarizer', lambda: Diarizer(backend=SPEAKER_EMBEDDING_BACKEND),
+                             idle_timeout=STT_IDLE_UNLOAD_SECONDS)
+diarization_executor = ThreadPoolExecutor(max_workers=int(os.getenv('DIARIZATION_WORKERS', '2')),
+                                          thread_name_prefix='diarize')
+
+# 음성 처리 세션 관리 (상한·TTL 적용, 갱신 시 SSE 구독자에게 발행)
+audio_processing_sessions = SessionStore(
+    max_sessions=int(os.getenv('AUDIO_SESSION_MAX', '1000')),
+    ttl_seconds=float(os.getenv('AUDIO_SESSION_TTL_SECONDS', '3600')),
+    size_observer=lambda count: set_queue_depth('audio_sessions', count)
+)
 
 # ============================================================================
 # STEP 3: 음성 처리 함수들 추가
@@ -223,6 +304,8 @@ except Exception as e:
     logger.warning(f"❌ 임베딩 모델 로드 실패: {e}")
     embedding_model = None
 
+@tracer.traced('embed_text')
+@timed_stage('embed')
 def embed_text(text):
     """텍스트를 벡터로 임베딩"""
     if not embedding_model:
@@ -236,6 +319,7 @@ def embed_text(text):
         return [0.0] * 384
 
 # 검색 함수
+@tracer.traced('search_documents')
 def search_documents(query, limit=5):
     """실제 Qdrant 검색"""
     global qdrant_client
@@ -263,13 +347,14 @@ def search_documents(query, limit=5):
         query_vector = embed_text(query)
         
         # Qdrant 검색 수행
-        search_result = qdrant_client.query_points(
-            collection_name="documents",
-            query=query_vector,
-            limit=limit,
-            with_payload=True,
-            with_vectors=False
-        )
+        with stage_timer('search'), tracer.span('qdrant.query_points', limit=limit):
+            search_result = qdrant_client.query_points(
+                collection_name="documents",
+                query=query_vector,
+                limit=limit,
+                with_payload=True,
+                with_vectors=False
+            )
         
         if not search_result.points:
             logger.info(f"🔍 '{query}' 검색 결과 없음")
@@ -294,39 +379,6 @@ def search_documents(query, limit=5):
         logger.error(f"❌ 검색 오류: {e}")
         return []
 
-# 1. Faster Whisper 사용 (기존 PyTorch와 충돌 없음)
-try:
-    from faster_whisper import WhisperModel
-    FASTER_WHISPER_AVAILABLE = True
-    logger.info("✅ Faster Whisper 사용 가능")
-except ImportError:
-    FASTER_WHISPER_AVAILABLE = False
-    logger.warning("⚠️ Faster Whisper 사용 불가")
-
-# 2. SpeechRecognition 백업 옵션
-try:
-    import speech_recognition as sr
-    SPEECH_RECOGNITION_AVAILABLE = True
-    logger.info("✅ SpeechRecognition 사용 가능")
-except ImportError:
-    SPEECH_RECOGNITION_AVAILABLE = False
-    logger.warning("⚠️ SpeechRecognition 사용 불가")
-
-# 3. Hugging Face Transformers 사용 (PyTorch 기반)
-try:
-    from transformers import pipeline, WhisperProcessor, WhisperForConditionalGeneration
-    TRANSFORMERS_AVAILABLE = True
-    logger.info("✅ Transformers Whisper 사용 가능")
-except ImportError:
-    TRANSFORMERS_AVAILABLE = False
-    logger.warning("⚠️ Transformers 사용 불가")
-
-# 글로벌 모델 변수들
-faster_whisper_model = None
-transformers_whisper_model = None
-transformers_processor = None
-speech_recognizer = None
-
 # Ollama 설정
 OLLAMA_API_URL = "http://localhost:11434/api/generate"
 MODEL_NAME = "qwen3:8b"
@@ -334,89 +386,6 @@ ALLOWED_AUDIO_EXTENSIONS = {'mp3', 'm4a', 'wav', 'flac', 'aac', 'ogg', 'wma'}
 
 
 
-def transcribe_with_faster_whisper(audio_path):
-    """Faster Whisper로 음성 인식"""
-    if not faster_whisper_model:
-        return None
-    
-    try:
-        logger.info("🔄 Faster Whisper STT 시작...")
-        
-        segments, info = faster_whisper_model.transcribe(
-            audio_path,
-            language="ko",
-            beam_size=5,
-            temperature=0.0,
-            condition_on_previous_text=True,
-            compression_ratio_threshold=2.4,
-            logprob_threshold=-1.0,
-            no_speech_threshold=0.6
-        )
-        
-        # 세그먼트들을 텍스트로 결합
-        transcription = ""
-        for segment in segments:
-            transcription += segment.text + " "
-        
-        transcription = transcription.strip()
-        logger.info(f"✅ Faster Whisper STT 완료: {len(transcription)}자")
-        return transcription
-        
-    except Exception as e:
-        logger.error(f"❌ Faster Whisper STT 오류: {e}")
-        return None
-
-def transcribe_with_transformers(audio_path):
-    """Transformers Whisper로 음성 인식"""
-    if not transformers_whisper_model or not transformers_processor:
-        return None
-    
-    try:
-        logger.info("🔄 Transformers Whisper STT 시작...")
-        
-        # 오디오 로드 및 전처리
-        audio, sr_rate = librosa.load(audio_path, sr=16000)
-        
-        # 입력 특성 추출
-        input_features = transformers_processor(
-            audio, 
-            sampling_rate=16000, 
-            return_tensors="pt"
-        ).input_features
-        
-        # GPU로 이동
-        if torch.cuda.is_available():
-            input_features = input_features.to("cuda")
-        
-        # 강제로 한국어 토큰 설정
-        forced_decoder_ids = transformers_processor.get_decoder_prompt_ids(
-            language="korean", 
-            task="transcribe"
-        )
-        
-        # 추론 실행
-        with torch.no_grad():
-            predicted_ids = transformers_whisper_model.generate(
-                input_features, 
-                forced_decoder_ids=forced_decoder_ids,
-                max_length=448,
-                temperature=0.0,
-                do_sample=False
-            )
-        
-        # 디코딩
-        transcription = transformers_processor.batch_decode(
-            predicted_ids, 
-            skip_special_tokens=True
-        )[0]
-        
-        logger.info(f"✅ Transformers Whisper STT 완료: {len(transcription)}자")
-        return transcription.strip()
-        
-    except Exception as e:
-        logger.error(f"❌ Transformers Whisper STT 오류: {e}")
-        return None
-
 def allowed_audio_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_AUDIO_EXTENSIONS
 
@@ -426,105 +395,54 @@ def allowed_audio_file(filename):
 
 # 기존 함수들 아래에 추가하세요:
 
+def load_faster_whisper_model():
+    """Faster Whisper 모델 로드 (LazyModel 로더)"""
+    if torch.cuda.is_available():
+        return WhisperModel(STT_MODEL_SIZE, device="cuda", compute_type="float16",
+                            num_workers=STT_STREAM_WORKERS)
+    return WhisperModel(STT_MODEL_SIZE, device="cpu", compute_type="int8",
+                        num_workers=STT_STREAM_WORKERS)
+
+if FASTER_WHISPER_AVAILABLE:
+    faster_whisper_model = LazyModel('faster-whisper', load_faster_whisper_model,
+                                     idle_timeout=STT_IDLE_UNLOAD_SECONDS)
+
+# STT 엔진 레지스트리 (오디오 길이·대기열·실측 RTF로 선택, 실패 시 폴백)
+stt_router = STTRouter(allow_online=STT_ALLOW_ONLINE)
+
 def initialize_audio_models():
-    """음성 처리 모델들 초기화"""
-    global faster_whisper_model, transformers_whisper_model, transformers_processor, speech_recognizer
+    """음성 처리 모델들 초기화 (STT 모델은 첫 요청 시 지연 로딩)"""
+    if not AUDIO_ENABLED:
+        logger.info("💬 채팅 전용 모드: 음성 처리 모델 초기화 생략")
+        return False
     
-    models_loaded = []
+    device = "cuda" if torch.cuda.is_available() else "cpu"
     
-    # Faster Whisper 초기화
-    if FASTER_WHISPER_AVAILABLE:
-        try:
-            if torch.cuda.is_available():
-                faster_whisper_model = WhisperModel("medium", device="cuda", compute_type="float16")
-                logger.info("✅ Faster Whisper GPU 모델 로드 성공")
-            else:
-                faster_whisper_model = WhisperModel("medium", device="cpu", compute_type="int8")
-                logger.info("✅ Faster Whisper CPU 모델 로드 성공")
-            models_loaded.append("faster_whisper")
-        except Exception as e:
-            logger.error(f"❌ Faster Whisper 로드 실패: {e}")
+    # Faster Whisper 등록 (STT_PRELOAD=true 이면 바로 로드)
+    if faster_whisper_model and 'faster-whisper' not in stt_router.engines:
+        stt_router.register(FasterWhisperEngine(faster_whisper_model, device=device, options=WHISPER_OPTIONS,
+                                                model_size=STT_MODEL_SIZE))
+        if STT_PRELOAD:
+            try:
+                faster_whisper_model.get()
+            except Exception as e:
+                logger.error(f"❌ Faster Whisper 로드 실패: {e}")
+    
+    # Transformers Whisper 등록 (짧은 오디오 전용)
+    if TRANSFORMERS_AVAILABLE and 'transformers-whisper' not in stt_router.engines:
+        stt_router.register(TransformersWhisperEngine(STT_TRANSFORMERS_MODEL, device=device,
+                                                      idle_timeout=STT_IDLE_UNLOAD_SECONDS))
     
-    # SpeechRecognition 초기화
-    if SPEECH_RECOGNITION_AVAILABLE:
+    # SpeechRecognition 등록 (온라인 API - STT_ALLOW_ONLINE=true 일 때만 사용)
+    if SPEECH_RECOGNITION_AVAILABLE and 'speech-recognition-google' not in stt_router.engines:
         try:
-            speech_recognizer = sr.Recognizer()
-            models_loaded.append("speech_recognition")
-            logger.info("✅ SpeechRecognition 초기화 성공")
+            stt_router.register(SpeechRecognitionEngine())
         except Exception as e:
             logger.error(f"❌ SpeechRecognition 초기화 실패: {e}")
     
-    logger.info(f"🎤 사용 가능한 STT 모델: {', '.join(models_loaded)}")
-    return len(models_loaded) > 0
-
-def transcribe_with_faster_whisper(audio_path):
-    """Faster Whisper로 음성 인식"""
-    if not faster_whisper_model:
-        return None
-    
-    try:
-        segments, info = faster_whisper_model.transcribe(
-            audio_path,
-            language="ko",
-            beam_size=5,
-            temperature=0.0
-        )
-        
-        transcription = ""
-        for segment in segments:
-            transcription += segment.text + " "
-        
-        return transcription.strip()
-        
-    except Exception as e:
-        logger.error(f"Faster Whisper STT 오류: {e}")
-        return None
-
-def transcribe_with_speech_recognition(audio_path):
-    """SpeechRecognition으로 음성 인식"""
-    if not speech_recognizer:
-        return None
-    
-    try:
-        # WAV 파일로 변환
-        audio = AudioSegment.from_file(audio_path)
-        wav_path = audio_path.rsplit('.', 1)[0] + '_sr.wav'
-        audio.export(wav_path, format="wav")
-        
-        # 음성 인식
-        with sr.AudioFile(wav_path) as source:
-            audio_data = speech_recognizer.record(source)
-        
-        transcription = speech_recognizer.recognize_google(
-            audio_data, 
-            language='ko-KR'
-        )
-        
-        # 임시 파일 정리
-        if os.path.exists(wav_path):
-            os.remove(wav_path)
-        
-        return transcription
-        
-    except Exception as e:
-        logger.error(f"SpeechRecognition STT 오류: {e}")
-        return None
-
-def transcribe_audio(audio_path):
-    """통합 음성 인식 함수"""
-    # Faster Whisper 우선 시도
-    if faster_whisper_model:
-        result = transcribe_with_faster_whisper(audio_path)
-        if result:
-            return enhance_transcription_quality(result)
-    
-    # 백업으로 SpeechRecognition 시도
-    if speech_recognizer:
-        result = transcribe_with_speech_recognition(audio_path)
-        if result:
-            return enhance_transcription_quality(result)
-    
-    return None
+    enabled = [name for name, info in stt_router.status().items() if info['enabled']]
+    logger.info(f"🎤 사용 가능한 STT 엔진: {', '.join(enabled)}")
+    return len(enabled) > 0
 
 def enhance_transcription_quality(text):
     """전사 품질 향상"""
@@ -559,28 +477,13 @@ def enhance_transcription_quality(text):
     
     return text
 
-def create_processing_session(user_id):
-    """오디오 처리 세션 생성"""
-    session_id = str(uuid.uuid4())
-    audio_processing_sessions[session_id] = {
-        'user_id': user_id,
-        'status': 'initialized',
-        'progress': 0,
-        'message': '처리 준비 중...',
-        'created_at': datetime.now(),
-        'result': None
-    }
-    return session_id
+def create_processing_session(user_id, session_id=None):
+    """오디오 처리 세션 생성 (클라이언트가 미리 만든 session_id가 있으면 그 세션 사용)"""
+    return audio_processing_sessions.claim(session_id, user_id)
 
 def update_processing_session(session_id, status=None, progress=None, message=None, result=None):
-    """처리 세션 업데이트"""
-    if session_id in audio_processing_sessions:
-        session = audio_processing_sessions[session_id]
-        if status: session['status'] = status
-        if progress is not None: session['progress'] = progress
-        if message: session['message'] = message
-        if result: session['result'] = result
-        session['updated_at'] = datetime.now()
+    """처리 세션 업데이트 (진행 이벤트 구독자에게 발행)"""
+    audio_processing_sessions.update(session_id, status, progress, message, result)
         
 # GPU 가속 LLM 클래스 (수정된 버전)
 class GPUAcceleratedLLM:
@@ -657,6 +560,18 @@ class GPUAcceleratedLLM:
 # 글로벌 GPU LLM 인스턴스
 gpu_llm = None
 
+def record_ollama_timings(result):
+    """Ollama 응답의 단계별 소요 시간(ns)을 현재 스팬에 기록 (모델 로딩 / 프롬프트 처리 / 생성)"""
+    span = tracer.current_span()
+    for key in ('total_duration', 'load_duration', 'prompt_eval_duration', 'eval_duration'):
+        if key in result:
+            span.set_attribute(f"ollama.{key}_ms", round(result[key] / 1e6, 1))
+    for key in ('prompt_eval_count', 'eval_count'):
+        if key in result:
+            span.set_attribute(f"ollama.{key}", result[key])
+
+@tracer.traced('query_ollama_streaming')
+@timed_stage('llm')
 def query_ollama_streaming(prompt):
     """Ollama 스트리밍 응답"""
     try:
@@ -692,6 +607,7 @@ def query_ollama_streaming(prompt):
                     chunk = json_line.get("response", "")
                     full_response += chunk
                     if json_line.get("done"):
+                        record_ollama_timings(json_line)
                         break
                 except json.JSONDecodeError:
                     continue
@@ -713,6 +629,8 @@ def query_ollama_streaming(prompt):
         logger.error(f"❌ Ollama 처리 오류: {e}")
         return None
 
+@tracer.traced('query_ollama_fast')
+@timed_stage('llm')
 def query_ollama_fast(prompt):
     """빠른 Ollama 호출"""
     try:
@@ -731,6 +649,7 @@ def query_ollama_fast(prompt):
         
         if response.status_code == 200:
             result = response.json()
+            record_ollama_timings(result)
             return result.get("response", "").strip()
         else:
             return None
@@ -739,36 +658,111 @@ def query_ollama_fast(prompt):
         logger.error(f"❌ 빠른 Ollama 오류: {e}")
         return None
 
-def log_request(request_type, user_id, action, status, processing_time):
-    """요청 로그 기록"""
-    log_entry = {
-        'timestamp': datetime.now().isoformat(),
-        'type': request_type,
-        'user': user_id,
-        'action': action,
-        'status': status,
-        'processing_time': processing_time
-    }
+# 긴 전사문 요약 (query_ollama_fast의 num_ctx 1024에 맞춰 청크 단위 map-reduce)
+transcript_summarizer = MapReduceSummarizer(
+    query_ollama_fast,
+    max_chunk_tokens=int(os.getenv('SUMMARY_CHUNK_TOKENS', '600')),
+    max_workers=int(os.getenv('SUMMARY_WORKERS', '4')),
+    namespace=MODEL_NAME,
+    cache_observer=lambda hit: record_cache('summary_chunk', hit)
+)
+
+def log_request(request_type, user_id, action, status, processing_time,
+                endpoint=None, mode=None, docs_found=None):
+    """요청 로그 기록
     
-    stats_data['recent_logs'].insert(0, log_entry)
-    if len(stats_data['recent_logs']) > 100:
-        stats_data['recent_logs'].pop()
+    endpoint/mode를 생략하면 현재 요청의 라우트와 g.request_mode를 사용합니다.
+    """
+    now = datetime.now()
+    stats_data['recent_logs'].append(RequestLogRecord(
+        now.isoformat(), request_type, user_id, action, status, processing_time
+    ))
+    stats_data['active_users'].add(user_id)
     
-    stats_data['total_requests'] += 1
-    if status == 'success':
-        stats_data['successful_requests'] += 1
-    else:
-        stats_data['failed_requests'] += 1
+    with stats_lock:
+        stats_data['total_requests'] += 1
+        if status == 'success':
+            stats_data['successful_requests'] += 1
+        else:
+            stats_data['failed_requests'] += 1
     
-    today = datetime.now().strftime('%Y-%m-%d')
-    if today not in stats_data['daily_usage']:
-        stats_data['daily_usage'][today] = 0
-    stats_data['daily_usage'][today] += 1
+    if has_request_context():
+        if endpoint is None and request.url_rule is not None:
+            endpoint = request.url_rule.rule
+        if mode is None:
+            mode = g.get('request_mode')
+    try:
+        latency = float(str(processing_time).rstrip('초'))
+    except ValueError:
+        latency = None
+    usage_store.record(endpoint or request_type, mode, user_id, latency, status, docs_found,
+                       timestamp=now.timestamp())
+
+def format_uptime(seconds):
+    """가동 시간 표시 문자열"""
+    days, remainder = divmod(int(seconds), 86400)
+    hours, remainder = divmod(remainder, 3600)
+    minutes = remainder // 60
+    return f"{days}일 {hours}시간 {minutes}분" if days else f"{hours}시간 {minutes}분"
 
 # =============================================================================
 # 라우트 정의
 # =============================================================================
 
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+    g.request_id = uuid.uuid4().hex
+    route = request.url_rule.rule if request.url_rule is not None else request.path
+    attributes = {'http.method': request.method, 'http.route': route}
+    client_request_id = request.headers.get('X-Request-ID')
+    if client_request_id:
+        attributes['http.client_request_id'] = client_request_id[:128]
+    g.trace_handle = tracer.start_trace(
+        f"{request.method} {route}", g.request_id,
+        force=TRACE_ALLOW_CLIENT_FORCE and request.headers.get('X-Trace') == '1',
+        attributes=attributes
+    )
+
+@app.after_request
+def record_request_metrics(response):
+    """엔드포인트(라우트 패턴)·모드별 지연 기록"""
+    started = g.get('request_started')
+    if started is not None and request.url_rule is not None and request.url_rule.rule != '/metrics':
+        observe_request(request.url_rule.rule, request.method, g.get('request_mode', ''),
+                        response.status_code, time.perf_counter() - started)
+    if 'request_id' in g:
+        response.headers['X-Request-ID'] = g.request_id
+    g.response_status = response.status_code
+    return response
+
+@app.teardown_request
+def finish_request_trace(exc):
+    """루트 스팬 종료 (스트리밍 응답은 전송이 끝난 뒤 호출됨)"""
+    handle = g.pop('trace_handle', None)
+    if handle is not None:
+        tracer.end_trace(handle, {
+            'http.status_code': g.get('response_status', 500),
+            'request.mode': g.get('request_mode', '')
+        })
+
+@app.route('/api/debug/trace/<request_id>', methods=['GET'])
+def get_request_trace(request_id):
+    """요청 추적 조회 (X-Request-ID 응답 헤더 값)"""
+    trace = tracer.get_trace(request_id)
+    if trace is None:
+        return jsonify({
+            'error': '추적 정보를 찾을 수 없습니다. (샘플링되지 않았거나 보관 기간이 지났습니다)',
+            'sample_rate': tracer.sample_rate
+        }), 404
+    return jsonify(trace)
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus 메트릭 (대기열 깊이는 작업 제출/완료 시점에 기록됨)"""
+    body, content_type = render_metrics()
+    return Response(body, mimetype=None, content_type=content_type)
+
 @app.route('/')
 def index():
     """메인 페이지"""
@@ -865,6 +859,7 @@ def enhanced_text_chat():
             return jsonify({'error': '메시지를 입력해주세요.'}), 400
         
         logger.info(f"💬 사용자 메시지: '{message}' (모드: {mode})")
+        g.request_mode = mode
         
         # 활성 사용자 추가
         stats_data['active_users'].add(user_id)
@@ -999,7 +994,8 @@ def enhanced_text_chat():
             ]
         
         # 5. 로그 기록
-        log_request('텍스트', user_id, f'모드: {mode}', 'success', f"{processing_time:.2f}초")
+        log_request('텍스트', user_id, f'모드: {mode}', 'success', f"{processing_time:.2f}초",
+                    docs_found=len(relevant_docs))
         
         response_data = {
             'reply': ai_response,
@@ -1079,24 +1075,23 @@ def chat_stream():
 def get_dashboard_data():
     """대시보드 실시간 데이터"""
     try:
-        # GPU 상태
-        gpu_info = []
-        if torch.cuda.is_available():
-            for i in range(torch.cuda.device_count()):
-                device = f"cuda:{i}"
-                memory_allocated = torch.cuda.memory_allocated(device)
-                memory_total = torch.cuda.get_device_properties(device).total_memory
-                
-                gpu_info.append({
-                    'device': device,
-                    'memory_used_gb': memory_allocated / 1024**3,
-                    'memory_total_gb': memory_total / 1024**3,
-                    'utilization_percent': (memory_allocated / memory_total) * 100
-                })
+        # 자원 상태 (백그라운드 샘플러의 마지막 샘플)
+        resources = resource_sampler.latest() or {}
+        gpu_info = [
+            {
+                'device': f"cuda:{gpu['index']}",
+                'name': gpu['name'],
+                'memory_used_gb': gpu['memory_used_gb'],
+                'memory_total_gb': gpu['memory_total_gb'],
+                'utilization_percent': gpu['utilization_percent'],
+                'temperature_c': gpu['temperature_c']
+            }
+            for gpu in resources.get('gpus', [])
+        ]
         
         # 시스템 통계
         total_requests = stats_data['total_requests']
-        active_users = len(stats_data['active_users'])
+        active_users = stats_data['active_users'].counts()
         
         # 문서 통계
         document_count = 0
@@ -1109,11 +1104,17 @@ def get_dashboard_data():
         
         return jsonify({
             'total_requests': total_requests,
-            'active_users': active_users,
+            'active_users': active_users['1h'],
+            'active_users_windows': active_users,
             'gpu_usage': gpu_info,
+            'cpu_percent': resources.get('cpu_percent'),
+            'rss_mb': resources.get('rss_mb'),
+            'system_memory_percent': resources.get('system_memory_percent'),
+            'sampled_at': resources.get('timestamp'),
             'document_count': document_count,
             'target_document_count': 2199,
-            'system_uptime': "99.8%",
+            'system_uptime': format_uptime(uptime_seconds()),
+            'uptime_seconds': int(uptime_seconds()),
             'upload_sessions': len(upload_sessions),
             'timestamp': datetime.now().isoformat()
         })
@@ -1125,27 +1126,36 @@ def get_dashboard_data():
 def get_stats():
     """시스템 통계 데이터 반환"""
     try:
-        current_active = len(stats_data['active_users'])
+        active_users = stats_data['active_users'].counts()
         
-        today = datetime.now()
-        daily_data = {}
-        for i in range(15):
-            date = (today - timedelta(days=i)).strftime('%Y-%m-%d')
-            daily_data[date] = stats_data['daily_usage'].get(date, 0)
+        # 일별 사용량은 영구 저장소의 집계 테이블에서 조회
+        daily_data = usage_store.daily_totals(15)
+        usage_breakdown = usage_store.breakdown(15)
         
-        total = stats_data['total_requests']
-        success_rate = (stats_data['successful_requests'] / total * 100) if total > 0 else 100
+        # 일관된 스냅샷 (갱신 중인 값과 섞이지 않도록)
+        with stats_lock:
+            total = stats_data['total_requests']
+            successful = stats_data['successful_requests']
+            failed = stats_data['failed_requests']
+        
+        recent_logs = stats_data['recent_logs'].snapshot(20)
+        gpu_usage_history = stats_data['gpu_usage_history'].snapshot(50, newest_first=False)
+        
+        success_rate = (successful / total * 100) if total > 0 else 100
         
         return jsonify({
-            'total_requests': stats_data['total_requests'],
-            'successful_requests': stats_data['successful_requests'], 
-            'failed_requests': stats_data['failed_requests'],
+            'total_requests': total,
+            'successful_requests': successful, 
+            'failed_requests': failed,
             'success_rate': f"{success_rate:.1f}%",
-            'active_users': current_active,
+            'active_users': active_users['1h'],
+            'active_users_windows': active_users,
             'daily_usage': daily_data,
-            'recent_logs': stats_data['recent_logs'][:20],
-            'gpu_usage_history': stats_data['gpu_usage_history'][-50:],
-            'system_uptime': "99.7%",
+            'usage_breakdown': usage_breakdown,
+            'recent_logs': recent_logs,
+            'gpu_usage_history': gpu_usage_history,
+            'system_uptime': format_uptime(uptime_seconds()),
+            'uptime_seconds': int(uptime_seconds()),
             'timestamp': datetime.now().isoformat()
         })
         
@@ -1153,19 +1163,32 @@ def get_stats():
         logger.error(f"통계 데이터 조회 오류: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/admin/request_logs', methods=['GET'])
+def get_request_logs():
+    """요청 로그 이력 (메모리 용량을 넘는 범위는 REQUEST_LOG_SPILL_PATH 파일에서 조회)"""
+    limit = min(request.args.get('limit', 100, type=int), 10000)
+    return jsonify({
+        'logs': stats_data['recent_logs'].history(limit),
+        'in_memory': len(stats_data['recent_logs']),
+        'capacity': stats_data['recent_logs'].capacity,
+        'timestamp': datetime.now().isoformat()
+    })
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """서버 상태 확인"""
     try:
         return jsonify({
             'status': 'healthy',
-            'whisper_loaded': whisper_model is not None,
+            'whisper_loaded': bool(faster_whisper_model and faster_whisper_model.is_loaded),
+            'audio_enabled': AUDIO_ENABLED,
+            'stt_engines': stt_router.status(),
             'qdrant_connected': qdrant_client is not None,
             'embedding_model_loaded': embedding_model is not None,
             'torch_version': torch.__version__,
             'cuda_available': torch.cuda.is_available(),
             'total_requests': stats_data['total_requests'],
-            'active_users': len(stats_data['active_users']),
+            'active_users': stats_data['active_users'].counts()['1h'],
             'timestamp': datetime.now().isoformat()
         })
         
@@ -1209,7 +1232,7 @@ def test_endpoint():
     """테스트 엔드포인트"""
     return jsonify({
         "message": "EX-GPT 서버가 정상 작동 중입니다.", 
-        "whisper_loaded": whisper_model is not None,
+        "whisper_loaded": bool(faster_whisper_model and faster_whisper_model.is_loaded),
         "qdrant_connected": qdrant_client is not None,
         "embedding_loaded": embedding_model is not None,
         "endpoints": [
@@ -1247,53 +1270,144 @@ def serve_images(filename):
  
 @app.route('/api/upload_voice', methods=['POST'])
 def upload_voice():
-    """음성 파일 업로드 및 STT 처리"""
+    """음성 파일 업로드 및 STT 처리
+    
+    - multipart/form-data: audio 파일 필드 + form 옵션
+    - application/octet-stream: 본문이 오디오 원시 바이트, 파일명은 X-Filename 헤더, 옵션은 쿼리 문자열
+      (본문을 request.stream에서 바로 디스크로 기록하므로 multipart 파서의 임시 파일 복사가 없음)
+    """
     start_time = time.time()
-    session_id = None
     
-    try:
-        # 파일 검증
+    if not AUDIO_ENABLED:
+        return jsonify({'error': '이 서버는 채팅 전용 모드로 실행 중입니다. 음성 처리를 사용할 수 없습니다.'}), 503
+    
+    # 파일 검증
+    if request.mimetype == 'application/octet-stream':
+        original_name = request.headers.get('X-Filename') or request.args.get('filename', '')
+        stream, options = request.stream, request.args
+    else:
         if 'audio' not in request.files:
             return jsonify({'error': '음성 파일이 없습니다.'}), 400
-        
         file = request.files['audio']
-        if file.filename == '':
-            return jsonify({'error': '파일이 선택되지 않았습니다.'}), 400
-        
-        if not allowed_audio_file(file.filename):
-            return jsonify({'error': f'지원되지 않는 파일 형식입니다.'}), 400
-        
-        user_id = request.form.get('user_id', request.remote_addr)
-        process_type = request.form.get('type', 'transcribe')
-        
-        # 처리 세션 생성
-        session_id = create_processing_session(user_id)
-        
-        logger.info(f"🎤 음성 파일 업로드: {file.filename} (세션: {session_id})")
-        
-        # 임시 파일 저장
-        temp_dir = tempfile.mkdtemp()
-        filename = secure_filename(file.filename)
-        temp_file_path = os.path.join(temp_dir, filename)
-        file.save(temp_file_path)
-        
+        original_name, stream, options = file.filename, file.stream, request.form
+    
+    if original_name == '':
+        return jsonify({'error': '파일이 선택되지 않았습니다.'}), 400
+    
+    if not allowed_audio_file(original_name):
+        return jsonify({'error': f'지원되지 않는 파일 형식입니다.'}), 400
+    
+    logger.info(f"🎤 음성 파일 업로드: {original_name}")
+    
+    # 임시 파일 저장 (블록 단위 복사 + 전사 캐시 키용 해시 동시 계산)
+    temp_dir = tempfile.mkdtemp()
+    filename = secure_filename(original_name)
+    temp_file_path = os.path.join(temp_dir, filename)
+    try:
+        _, audio_digest = save_stream(stream, temp_file_path, max_bytes=upload_sessions.max_bytes)
+    except UploadError as e:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        return jsonify({'error': str(e), 'status': 'error'}), e.status
+    except Exception as e:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        logger.error(f"❌ 음성 파일 저장 오류: {e}")
+        return jsonify({'error': f'파일 저장 중 오류가 발생했습니다: {str(e)}', 'status': 'error'}), 500
+    
+    return process_voice_file(temp_file_path, filename, options, start_time, audio_digest)
+
+def transcript_cache_key(audio_digest, engine_name):
+    """전사 캐시 키 - 오디오 내용 + 결과를 만든 엔진/모델 + 인식·전처리 설정"""
+    return transcript_cache.make_key(
+        audio_digest,
+        engine_name,
+        {'whisper': WHISPER_OPTIONS, 'preprocess': 'normalize+vad+nr'}
+    )
+
+def process_voice_file(audio_path, filename, options, start_time, audio_digest=None):
+    """저장된 음성 파일 STT 및 후처리 (처리 후 파일과 디렉토리 삭제)
+    
+    Args:
+        audio_path: 업로드된 오디오 경로 (전용 임시 디렉토리 안)
+        options: user_id, type, diarize, num_speakers, session_id 값을 가진 매핑 (form 또는 JSON)
+        audio_digest: 업로드 중 계산한 SHA-256 (없으면 파일에서 계산)
+    """
+    session_id = None
+    processed_audio_path = None
+    
+    try:
+        user_id = options.get('user_id') or request.remote_addr
+        process_type = options.get('type') or 'transcribe'
+        diarize = str(options.get('diarize', 'false')).lower() == 'true'
+        num_speakers = int(options['num_speakers']) if options.get('num_speakers') else None
+        g.request_mode = process_type
+        
+        # 처리 세션 생성 (POST /api/audio_progress 로 미리 만든 세션이면 구독 중인 클라이언트가 진행 이벤트 수신)
+        session_id = create_processing_session(
+            user_id, options.get('session_id') or request.headers.get('X-Session-ID'))
         update_processing_session(session_id, 'uploading', 20, '파일 업로드 완료')
         
+        logger.info(f"🎤 음성 처리 시작: {filename} (세션: {session_id})")
+        
         try:
-            # 오디오 전처리
-            update_processing_session(session_id, 'preprocessing', 40, '오디오 전처리 중...')
-            processed_audio_path = preprocess_audio(temp_file_path)
+            # 동일한 녹음의 전사 결과가 캐시에 있으면 STT 생략
+            # 결과는 만든 엔진·모델 이름으로 저장되므로, 이 오디오를 처리할 수 있는 엔진 순서대로 조회
+            audio_digest = audio_digest or transcript_cache.audio_digest(audio_path)
+            cached = None
+            for engine in stt_router.candidates(probe_duration(audio_path)):
+                cached = transcript_cache.get(transcript_cache_key(audio_digest, engine.cache_name))
+                if cached:
+                    break
+            record_cache('transcript', cached is not None)
+            diarization_future = None
+            
+            if cached and not diarize:
+                update_processing_session(session_id, 'transcribing', 60, '캐시된 전사 결과 사용')
+                transcription_result = cached['text']
+                segments = cached.get('segments', [])
+                logger.info(f"♻️ 전사 캐시 적중 (세션: {session_id})")
+            else:
+                # 오디오 전처리
+                update_processing_session(session_id, 'preprocessing', 40, '오디오 전처리 중...')
+                processed_audio_path = preprocess_audio(audio_path)
+            
+                # 화자 분리는 같은 전처리 오디오로 STT와 병렬 수행 (CPU)
+                if diarize:
+                    diarization_future = submit_tracked(
+                        diarization_executor, 'diarization_pending',
+                        tracer.bind(diarize_audio), processed_audio_path, num_speakers)
             
-            # STT 수행
-            update_processing_session(session_id, 'transcribing', 60, '음성 인식 중...')
-            transcription_result = transcribe_audio(processed_audio_path)
+                if cached:
+                    update_processing_session(session_id, 'transcribing', 60, '캐시된 전사 결과 사용, 화자 분리 중...')
+                    transcription_result = cached['text']
+                    segments = cached.get('segments', [])
+                    logger.info(f"♻️ 전사 캐시 적중 (세션: {session_id})")
+                else:
+                    # STT 수행
+                    update_processing_session(session_id, 'transcribing', 60, '음성 인식 중...')
+                    stt_result = transcribe_audio(processed_audio_path)
             
-            if not transcription_result:
-                raise Exception('STT 처리에 실패했습니다.')
+                    if not stt_result or not stt_result.text:
+                        raise Exception('STT 처리에 실패했습니다.')
+            
+                    transcription_result = stt_result.text
+                    segments = [vars(segment) for segment in stt_result.segments]
+                    transcript_cache.put(
+                        transcript_cache_key(audio_digest, stt_result.model),
+                        transcription_result,
+                        {'filename': filename, 'engine': stt_result.model, 'segments': segments}
+                    )
+            
+            # 화자 라벨 부여
+            speaker_segments = None
+            if diarization_future is not None:
+                speaker_turns = diarization_future.result()
+                if speaker_turns and segments:
+                    speaker_segments = assign_speakers(segments, speaker_turns)
+                    transcription_result = format_speaker_transcript(speaker_segments)
             
             # 후처리
             update_processing_session(session_id, 'processing', 80, f'{process_type} 처리 중...')
-            processed_result = process_transcription(transcription_result, process_type)
+            processed_result, summary_info = process_transcription(transcription_result, process_type)
             
             processing_time = time.time() - start_time
             
@@ -1302,7 +1416,10 @@ def upload_voice():
                 'status': 'success',
                 'transcription': transcription_result,
                 'processed_content': processed_result,
+                'summary': summary_info,
                 'processing_time': f"{processing_time:.2f}초",
+                'transcript_cached': cached is not None,
+                'speakers': speaker_segments,
                 'session_id': session_id,
                 'timestamp': datetime.now().isoformat()
             }
@@ -1317,12 +1434,12 @@ def upload_voice():
         finally:
             # 임시 파일 정리
             try:
-                if os.path.exists(temp_file_path):
-                    os.remove(temp_file_path)
+                if os.path.exists(audio_path):
+                    os.remove(audio_path)
                 if processed_audio_path and os.path.exists(processed_audio_path):
                     os.remove(processed_audio_path)
-                if os.path.exists(temp_dir):
-                    os.rmdir(temp_dir)
+                if os.path.isdir(os.path.dirname(audio_path)):
+                    os.rmdir(os.path.dirname(audio_path))
             except Exception as e:
                 logger.warning(f"임시 파일 정리 실패: {e}")
                 
@@ -1344,6 +1461,105 @@ def upload_voice():
             'session_id': session_id
         }), 500
 
+# ============= 재개 가능한 분할 업로드 (대용량 녹음) =============
+@app.route('/api/upload_voice/init', methods=['POST'])
+def init_voice_upload():
+    """분할 업로드 시작 - JSON {filename, size, sha256(선택)}"""
+    if not AUDIO_ENABLED:
+        return jsonify({'error': '이 서버는 채팅 전용 모드로 실행 중입니다. 음성 처리를 사용할 수 없습니다.'}), 503
+    
+    data = request.get_json(silent=True) or {}
+    filename = data.get('filename', '')
+    if not filename or not allowed_audio_file(filename):
+        return jsonify({'error': '지원되지 않는 파일 형식입니다.'}), 400
+    
+    # 처리 세션을 미리 만들어 두면 업로드 중에도 /api/audio_progress/<session_id>/stream 구독 가능
+    user_id = data.get('user_id') or request.remote_addr
+    session_id = audio_processing_sessions.create(user_id)
+    try:
+        info = upload_sessions.create(secure_filename(filename), int(data.get('size', 0)),
+                                      sha256=data.get('sha256'),
+                                      metadata={'user_id': user_id, 'session_id': session_id})
+    except (UploadError, ValueError) as e:
+        return jsonify({'error': str(e)}), getattr(e, 'status', 400)
+    
+    logger.info(f"📦 분할 업로드 시작: {info['filename']} ({info['size'] / 1024**2:.1f}MB)")
+    return jsonify({
+        'upload_id': info['upload_id'],
+        'session_id': session_id,
+        'offset': 0,
+        'chunk_size': UPLOAD_CHUNK_SIZE
+    })
+
+@app.route('/api/upload_voice/<upload_id>', methods=['GET', 'PUT', 'DELETE'])
+def voice_upload_chunk(upload_id):
+    """분할 업로드 - GET: 받은 오프셋 조회, PUT: 청크 전송, DELETE: 취소
+    
+    PUT 본문은 원시 바이트(application/octet-stream)이며 Upload-Offset 헤더로 시작 위치를 지정합니다.
+    """
+    try:
+        if request.method == 'DELETE':
+            upload_sessions.info(upload_id)
+            upload_sessions.discard(upload_id)
+            return jsonify({'status': 'cancelled'})
+        
+        if request.method == 'GET':
+            info = upload_sessions.info(upload_id)
+            return jsonify({'upload_id': upload_id, 'offset': info['offset'], 'size': info['size']})
+        
+        offset = int(request.headers.get('Upload-Offset', request.args.get('offset', -1)))
+        new_offset = upload_sessions.append(upload_id, offset, request.stream)
+        return jsonify({'upload_id': upload_id, 'offset': new_offset})
+        
+    except UploadError as e:
+        body = {'error': str(e)}
+        if e.offset is not None:
+            body['offset'] = e.offset
+        return jsonify(body), e.status
+    except ValueError:
+        return jsonify({'error': 'Upload-Offset 헤더가 올바르지 않습니다.'}), 400
+
+@app.route('/api/upload_voice/<upload_id>/complete', methods=['POST'])
+def complete_voice_upload(upload_id):
+    """분할 업로드 완료 - 해시 검증 후 upload_voice와 같은 방식으로 처리"""
+    start_time = time.time()
+    
+    try:
+        part_path, audio_digest, info = upload_sessions.complete(upload_id)
+    except UploadError as e:
+        body = {'error': str(e)}
+        if e.offset is not None:
+            body['offset'] = e.offset
+        return jsonify(body), e.status
+    
+    # 업로드 디렉토리 안에서 이름만 바꿔 이동 (복사 없음)
+    job_dir = tempfile.mkdtemp(dir=upload_sessions.upload_dir)
+    audio_path = os.path.join(job_dir, info['filename'])
+    os.replace(part_path, audio_path)
+    
+    options = dict(request.get_json(silent=True) or request.form.to_dict())
+    options.setdefault('user_id', info['metadata'].get('user_id'))
+    options.setdefault('session_id', info['metadata'].get('session_id'))
+    return process_voice_file(audio_path, info['filename'], options, start_time, audio_digest)
+
+@tracer.traced('diarize_audio')
+@timed_stage('diarize')
+def diarize_audio(audio_path, num_speakers=None):
+    """화자 분리 (실패 시 빈 목록 - 전사 결과는 그대로 반환)"""
+    try:
+        with speaker_diarizer.use() as diarizer:
+            return diarizer.diarize_file(audio_path, num_speakers=num_speakers)
+    except Exception as e:
+        logger.warning(f"화자 분리 실패: {e}")
+        return []
+
+@app.route('/api/audio_progress', methods=['POST'])
+def create_audio_progress_session():
+    """처리 세션 미리 생성 - 업로드 전에 SSE를 구독하고 업로드 요청에 session_id(form 또는 X-Session-ID 헤더) 전달"""
+    data = request.get_json(silent=True) or request.form
+    session_id = audio_processing_sessions.create(data.get('user_id') or request.remote_addr)
+    return jsonify({'session_id': session_id}), 201
+
 @app.route('/api/audio_progress/<session_id>', methods=['GET'])
 def get_audio_progress(session_id):
     """오디오 처리 진행률 조회"""
@@ -1351,64 +1567,40 @@ def get_audio_progress(session_id):
     if not session:
         return jsonify({'error': '세션을 찾을 수 없습니다.'}), 404
     
-    return jsonify({
-        'session_id': session_id,
-        'status': session['status'],
-        'progress': session['progress'],
-        'message': session['message'],
-        'timestamp': session.get('updated_at', session['created_at']).isoformat()
+    event = session_event(session_id, session)
+    event.pop('result', None)
+    return jsonify(event)
+
+@app.route('/api/audio_progress/<session_id>/stream', methods=['GET'])
+def stream_audio_progress(session_id):
+    """오디오 처리 진행률 SSE 스트림 (완료/오류 이벤트 후 종료)"""
+    events = audio_processing_sessions.subscribe(session_id)
+    if events is None:
+        return jsonify({'error': '세션을 찾을 수 없습니다.'}), 404
+    
+    return Response(stream_with_context(sse_events(audio_processing_sessions, session_id, events)),
+                    mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
     })
     
+@tracer.traced('preprocess_audio')
+@timed_stage('preprocess')
 def preprocess_audio(audio_path):
-    """오디오 전처리 (노이즈 제거, 포맷 변환 등)"""
+    """오디오 전처리 (16kHz 모노 변환, 노이즈 제거, 긴 무음 제거)
+
+    디코딩부터 WAV 기록까지 블록 단위 제너레이터로 연결되어 녹음 길이와 무관하게 메모리 사용량이 일정합니다.
+    """
     try:
         logger.info("🔧 오디오 전처리 시작...")
-        
-        # 오디오 로드
-        audio = AudioSegment.from_file(audio_path)
-        
-        # 스테레오를 모노로 변환
-        if audio.channels > 1:
-            audio = audio.set_channels(1)
-        
-        # 샘플레이트 16kHz로 변환 (Whisper 최적화)
-        audio = audio.set_frame_rate(16000)
-        
-        # 볼륨 정규화
-        audio = audio.normalize()
-        
-        # 무음 제거
-        chunks = split_on_silence(
-            audio,
-            min_silence_len=500,  # 0.5초 이상 무음
-            silence_thresh=audio.dBFS - 16,
-            keep_silence=250  # 0.25초 무음 유지
-        )
-        
-        if chunks:
-            audio = sum(chunks)
-        
-        # 전처리된 오디오 저장
-        processed_path = audio_path.replace('.', '_processed.')
-        if not processed_path.endswith('.wav'):
-            processed_path = processed_path.rsplit('.', 1)[0] + '.wav'
-        
-        audio.export(processed_path, format="wav")
-        
-        # 노이즈 리덕션 (선택적)
-        try:
-            import librosa
-            y, sr = librosa.load(processed_path, sr=16000)
-            y_reduced = nr.reduce_noise(y=y, sr=sr, prop_decrease=0.8)
-            
-            # 다시 저장
-            import soundfile as sf
-            sf.write(processed_path, y_reduced, sr)
-            
-        except Exception as e:
-            logger.warning(f"노이즈 리덕션 실패: {e}")
-        
-        logger.info("✅ 오디오 전처리 완료")
+        processed_path = os.path.splitext(audio_path)[0] + '_processed.wav'
+        stats = preprocess_file(audio_path, processed_path, prop_decrease=0.8)
+        if stats['output_seconds'] <= 0:
+            logger.warning("전처리 결과가 비어 있어 원본을 사용합니다")
+            os.remove(processed_path)
+            return audio_path
+        
+        logger.info(f"✅ 오디오 전처리 완료 ({stats['output_seconds']:.1f}초)")
         return processed_path
         
     except Exception as e:
@@ -1447,56 +1639,40 @@ def cleanup_gpu_memory():
 
 logger.info("🎤 CUDA 호환 음성 처리 모듈 로드 완료")
 
+@tracer.traced('transcribe_audio')
+@timed_stage('stt')
 def transcribe_audio(audio_path):
-    """Whisper를 사용한 음성 인식"""
+    """STT 엔진 레지스트리를 통한 음성 인식
+    
+    Returns:
+        STTResult (text는 품질 보정 적용) 또는 실패 시 None
+    """
     try:
-        if not whisper_model:
-            raise Exception("Whisper 모델이 로드되지 않았습니다.")
-        
-        logger.info("🎯 Whisper STT 실행...")
-        
-        # Whisper 옵션 설정
-        options = {
-            "language": "ko",  # 한국어 우선
-            "task": "transcribe",
-            "fp16": torch.cuda.is_available(),  # GPU 사용 시 FP16
-            "temperature": 0,  # 더 정확한 결과를 위해
-            "best_of": 2,
-            "beam_size": 5,
-            "patience": 1.0,
-            "length_penalty": -0.05,
-            "suppress_tokens": "-1",
-            "initial_prompt": "안녕하세요. 한국도로공사입니다."  # 컨텍스트 힌트
-        }
-        
-        # STT 수행
-        result = whisper_model.transcribe(audio_path, **options)
-        
-        # 결과 검증
-        text = result.get("text", "").strip()
-        if not text:
-            raise Exception("음성을 인식할 수 없습니다.")
-        
-        # 언어 감지 결과 로깅
-        detected_language = result.get("language", "unknown")
-        logger.info(f"🌐 감지된 언어: {detected_language}")
-        
-        if detected_language != "ko" and detected_language != "korean":
-            logger.warning(f"⚠️ 한국어가 아닌 언어가 감지되었습니다: {detected_language}")
-        
-        logger.info(f"✅ STT 완료: {len(text)}자")
-        return text
+        with track_queue('stt_in_flight'):
+            result = stt_router.transcribe(audio_path)
+        observe_stt(result.engine, result.rtf, result.audio_seconds)
+        span = tracer.current_span()
+        span.set_attribute('stt.engine', result.engine)
+        span.set_attribute('stt.audio_seconds', round(result.audio_seconds, 2))
+        span.set_attribute('stt.rtf', round(result.rtf, 3))
+        result.text = enhance_transcription_quality(result.text)
+        return result
         
     except Exception as e:
         logger.error(f"STT 처리 오류: {e}")
         return None
 
+@tracer.traced('process_transcription')
+@timed_stage('postprocess')
 def process_transcription(text, process_type):
-    """STT 결과 후처리"""
+    """STT 결과 후처리 (처리 결과, 요약 정보)
+
+    요약 정보는 요약/분석 시에만 반환하며, partial이 True이면 일부 구간이 요약에서 빠진 것입니다.
+    """
     try:
         if process_type == "transcribe":
             # 단순 전사
-            return format_transcription(text)
+            return format_transcription(text), None
             
         elif process_type == "summarize":
             # 요약 처리
@@ -1507,11 +1683,20 @@ def process_transcription(text, process_type):
             return analyze_speech_content(text)
             
         else:
-            return format_transcription(text)
+            return format_transcription(text), None
             
     except Exception as e:
         logger.error(f"후처리 오류: {e}")
-        return format_transcription(text)
+        return format_transcription(text), None
+
+# 요약 자체를 만들지 못해 원본 전사만 반환한 경우의 요약 정보
+SUMMARY_FAILED = {'partial': True, 'failed': True}
+
+def partial_summary_notice(result):
+    """일부 청크 요약이 실패한 경우 결과 상단에 표시할 안내"""
+    if not result.partial:
+        return ""
+    return f"⚠️ 전사 내용 중 {result.failed_chunks}/{result.chunks}개 구간의 요약에 실패하여 해당 구간이 반영되지 않았습니다.\n\n"
 
 def format_transcription(text):
     """전사 텍스트 포맷팅"""
@@ -1532,8 +1717,8 @@ def format_transcription(text):
 def summarize_text(text):
     """텍스트 요약"""
     try:
-        # Ollama를 사용한 요약
-        prompt = f"""다음 음성 전사 내용을 요약해주세요:
+        # Ollama를 사용한 요약 (긴 전사문은 청크 요약 후 통합)
+        prompt = """다음 음성 전사 내용을 요약해주세요:
 
 원본 내용:
 {text}
@@ -1546,21 +1731,22 @@ def summarize_text(text):
 
 요약:"""
 
-        summary = query_ollama_fast(prompt)
+        summary = transcript_summarizer.summarize(text, prompt)
         if summary:
-            return f"📝 **요약**\n\n{summary}\n\n---\n\n📄 **원본 전사**\n\n{format_transcription(text)}"
+            return (f"📝 **요약**\n\n{partial_summary_notice(summary)}{summary.text}"
+                    f"\n\n---\n\n📄 **원본 전사**\n\n{format_transcription(text)}"), summary.info()
         else:
-            return format_transcription(text)
+            return format_transcription(text), dict(SUMMARY_FAILED)
             
     except Exception as e:
         logger.error(f"요약 처리 오류: {e}")
-        return format_transcription(text)
+        return format_transcription(text), dict(SUMMARY_FAILED)
 
 def analyze_speech_content(text):
     """음성 내용 분석"""
     try:
-        # 분석 프롬프트
-        prompt = f"""다음 음성 전사 내용을 분석해주세요:
+        # 분석 프롬프트 (긴 전사문은 청크 요약 후 분석)
+        prompt = """다음 음성 전사 내용을 분석해주세요:
 
 전사 내용:
 {text}
@@ -1574,15 +1760,16 @@ def analyze_speech_content(text):
 
 분석 결과:"""
 
-        analysis = query_ollama_fast(prompt)
+        analysis = transcript_summarizer.summarize(text, prompt)
         if analysis:
-            return f"🔍 **음성 내용 분석**\n\n{analysis}\n\n---\n\n📄 **원본 전사**\n\n{format_transcription(text)}"
+            return (f"🔍 **음성 내용 분석**\n\n{partial_summary_notice(analysis)}{analysis.text}"
+                    f"\n\n---\n\n📄 **원본 전사**\n\n{format_transcription(text)}"), analysis.info()
         else:
-            return format_transcription(text)
+            return format_transcription(text), dict(SUMMARY_FAILED)
             
     except Exception as e:
         logger.error(f"분석 처리 오류: {e}")
-        return format_transcription(text)
+        return format_transcription(text), dict(SUMMARY_FAILED)
 
 def get_audio_duration(audio_path):
     """오디오 파일 길이 반환"""
@@ -1592,28 +1779,122 @@ def get_audio_duration(audio_path):
     except:
         return 0.0
 
-# 실시간 음성 처리를 위한 WebSocket 지원 (선택사항)
+# ============= 실시간 스트리밍 STT (WebSocket) =============
+try:
+    from flask_sock import Sock
+    sock = Sock(app)
+    FLASK_SOCK_AVAILABLE = True
+except ImportError:
+    sock = None
+    FLASK_SOCK_AVAILABLE = False
+    logger.warning("⚠️ flask-sock 사용 불가 - 실시간 음성 스트리밍 비활성화")
+
+def transcribe_stream_segment(samples, final):
+    """스트리밍 세그먼트 인식 (중간 결과는 greedy, 확정 결과는 beam search)"""
+    if not faster_whisper_model:
+        return ''
+    
+    with faster_whisper_model.use() as model:
+        segments, info = model.transcribe(
+            samples,
+            language="ko",
+            beam_size=5 if final else 1,
+            temperature=0.0,
+            condition_on_previous_text=False
+        )
+        return " ".join(segment.text.strip() for segment in segments)
+
+streaming_transcriber = StreamingTranscriber(
+    transcribe_stream_segment, max_workers=STT_STREAM_WORKERS,
+    sessions_observer=lambda count: set_queue_depth('stt_stream_sessions', count)
+)
+
 @app.route('/api/voice_stream', methods=['POST'])
 def voice_stream():
-    """실시간 음성 스트리밍 처리"""
-    try:
-        # 실시간 음성 데이터 처리
-        # 구현 시 WebSocket이나 Server-Sent Events 사용 권장
-        return jsonify({"message": "실시간 음성 처리는 WebSocket으로 구현 예정"})
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    """실시간 음성 스트리밍 안내"""
+    return jsonify({
+        "available": AUDIO_ENABLED and FLASK_SOCK_AVAILABLE and faster_whisper_model is not None,
+        "websocket_url": "/ws/voice_stream",
+        "encodings": list(SUPPORTED_ENCODINGS),
+        "active_sessions": streaming_transcriber.active_sessions,
+        "protocol": {
+            "start": {"type": "start", "sample_rate": 16000, "encoding": "pcm_s16le"},
+            "audio": "binary frames",
+            "stop": {"type": "stop"}
+        }
+    })
+
+if sock and AUDIO_ENABLED:
+    @sock.route('/ws/voice_stream')
+    def voice_stream_ws(ws):
+        """실시간 음성 스트리밍 인식 (partial/final 이벤트 전송)"""
+        session = None
+        
+        def send_events(events):
+            for event in events:
+                ws.send(json.dumps(event, ensure_ascii=False))
+        
+        def send_error(message):
+            # 연결을 닫기 전에 클라이언트가 원인을 알 수 있도록 오류 프레임 전송
+            try:
+                ws.send(json.dumps({'type': 'error', 'message': message}, ensure_ascii=False))
+            except Exception:
+                pass
+        
+        try:
+            while True:
+                message = ws.receive(timeout=0.1)
+                
+                if message is None:
+                    if session:
+                        send_events(session.poll())
+                    continue
+                
+                if isinstance(message, str):
+                    try:
+                        control = json.loads(message)
+                        if not isinstance(control, dict):
+                            raise ValueError("JSON 객체가 아닙니다")
+                        started = control.get('type') == 'start' and session is None
+                        if started:
+                            session = streaming_transcriber.open_session(
+                                sample_rate=int(control.get('sample_rate', 16000)),
+                                encoding=control.get('encoding', 'pcm_s16le')
+                            )
+                    except (ValueError, TypeError) as e:
+                        logger.warning(f"음성 스트리밍 제어 메시지 오류: {e}")
+                        send_error(f"잘못된 제어 메시지: {e}")
+                        return
+                    if started:
+                        ws.send(json.dumps({'type': 'ready'}))
+                    elif control.get('type') == 'stop':
+                        break
+                    continue
+                
+                if session is None:
+                    session = streaming_transcriber.open_session()
+                send_events(session.feed(message))
+            
+            if session:
+                send_events(session.finish())
+            ws.send(json.dumps({'type': 'end'}))
+            
+        except Exception as e:
+            logger.warning(f"음성 스트리밍 세션 종료: {e}")
+            send_error(f"스트리밍 처리 오류: {e}")
+        finally:
+            if session:
+                session.finish()
         
 # 주기적 정리 작업
 def cleanup_old_data():
     """오래된 데이터 정리"""
-    if len(stats_data['recent_logs']) > 1000:
-        stats_data['recent_logs'] = stats_data['recent_logs'][:500]
-    
-    if len(stats_data['gpu_usage_history']) > 2000:
-        stats_data['gpu_usage_history'] = stats_data['gpu_usage_history'][-1000:]
+    # 만료된 처리 세션 / 미완료 분할 업로드 정리
+    audio_processing_sessions.evict_expired()
+    upload_sessions.cleanup_expired()
     
-    # 활성 사용자 목록 정리
-    stats_data['active_users'].clear()
+    # 원본 사용량 이벤트 보관 기간 (일별 집계는 계속 유지)
+    usage_store.purge_events(int(os.getenv('USAGE_EVENT_RETENTION_DAYS', '90')))
 
 def periodic_cleanup():
     """주기적 정리 실행"""
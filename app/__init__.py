@@ -31,7 +31,8 @@ def create_app(config_name='development'):
     
     # 기본 설정
     app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'ex-gpt-korea-expressway-2025')
-    app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB 파일 업로드 제한
+    # 단일 요청 업로드 제한 (대용량 녹음은 /api/upload_voice/init 분할 업로드 사용)
+    app.config['MAX_CONTENT_LENGTH'] = int(os.getenv('MAX_CONTENT_LENGTH_MB', '16')) * 1024 * 1024
     
     # 한국도로공사 특화 설정
     app.config['KOREAN_EXPRESSWAY_MODE'] = True
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+EX-GPT 대용량 오디오 스트리밍 / 재개 가능한 분할 업로드
+- 요청 본문을 고정 크기 블록으로 읽어 바로 디스크에 기록 (메모리에 전체 적재하지 않음)
+- 업로드 상태는 디스크에 기록 (.part 파일 크기 = 현재 오프셋) → 워커 재시작 후에도 이어받기
+- SHA-256은 받는 즉시 누적 계산, 완료 시 기대값과 비교
+- 오프셋 확인과 기록은 .part 파일 잠금(fcntl) 안에서 수행 → 여러 워커 프로세스가 같은 업로드를 받아도 안전
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import BinaryIO, Dict, Iterator, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BLOCK_SIZE = 1024 * 1024
+
+
+class UploadError(Exception):
+    """업로드 요청 오류 (status: 대응하는 HTTP 상태 코드)"""
+
+    def __init__(self, message: str, status: int = 400, offset: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+        self.offset = offset
+
+
+def save_stream(stream: BinaryIO, path: str, max_bytes: Optional[int] = None,
+                block_size: int = DEFAULT_BLOCK_SIZE, digest=None, mode: str = 'wb') -> Tuple[int, str]:
+    """스트림을 블록 단위로 파일에 기록
+
+    Returns:
+        (기록한 바이트 수, 누적 SHA-256 hex)
+    """
+    digest = digest or hashlib.sha256()
+    with open(path, mode) as f:
+        written = copy_stream(stream, f, max_bytes, block_size, digest)
+    return written, digest.hexdigest()
+
+
+def copy_stream(stream: BinaryIO, f: BinaryIO, max_bytes: Optional[int], block_size: int, digest) -> int:
+    """스트림을 열린 파일에 블록 단위로 복사하며 해시 누적 (기록한 바이트 수 반환)"""
+    written = 0
+    while True:
+        block = stream.read(block_size)
+        if not block:
+            break
+        written += len(block)
+        if max_bytes is not None and written > max_bytes:
+            raise UploadError('업로드 크기 제한을 초과했습니다.', status=413)
+        f.write(block)
+        digest.update(block)
+    return written
+
+
+class ChunkedUploadStore:
+    """재개 가능한 분할 업로드 저장소
+
+    흐름: create() → append(offset=0) → append(offset=n) ... → complete()
+    클라이언트는 연결이 끊기면 offset()으로 받은 위치를 확인하고 이어서 보냅니다.
+    """
+
+    def __init__(self, upload_dir: str = 'data/uploads', max_bytes: int = 2 * 1024 ** 3,
+                 ttl_seconds: float = 24 * 3600, block_size: int = DEFAULT_BLOCK_SIZE):
+        self.upload_dir = upload_dir
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.block_size = block_size
+        os.makedirs(upload_dir, exist_ok=True)
+        if fcntl is None:
+            logger.warning("⚠️ fcntl 사용 불가 - 분할 업로드는 단일 워커 프로세스에서만 안전합니다")
+
+        self._lock = threading.Lock()
+        self._upload_locks: Dict[str, threading.Lock] = {}
+        # upload_id -> (해시 객체, 해시에 반영된 바이트 수)
+        self._hashers: Dict[str, Tuple[object, int]] = {}
+
+    def __len__(self) -> int:
+        return sum(1 for name in os.listdir(self.upload_dir) if name.endswith('.json'))
+
+    def _meta_path(self, upload_id: str) -> str:
+        return os.path.join(self.upload_dir, f"{upload_id}.json")
+
+    def part_path(self, upload_id: str) -> str:
+        return os.path.join(self.upload_dir, f"{upload_id}.part")
+
+    def _upload_lock(self, upload_id: str) -> threading.Lock:
+        with self._lock:
+            return self._upload_locks.setdefault(upload_id, threading.Lock())
+
+    @contextmanager
+    def _locked_part(self, upload_id: str) -> Iterator[BinaryIO]:
+        """.part 파일을 추가 모드로 열고 프로세스 간 배타 잠금
+
+        threading.Lock은 같은 프로세스 안에서만 유효하므로, 여러 워커가 같은 업로드의
+        청크를 동시에 받으면 파일 잠금으로 오프셋 확인과 기록을 직렬화합니다.
+        """
+        with self._upload_lock(upload_id):
+            try:
+                f = open(self.part_path(upload_id), 'r+b')
+            except OSError:
+                raise UploadError('업로드를 찾을 수 없습니다.', status=404)
+            try:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+                if not os.path.exists(self._meta_path(upload_id)):
+                    # 잠금을 기다리는 동안 다른 워커가 완료하거나 취소함
+                    raise UploadError('업로드를 찾을 수 없습니다.', status=404)
+                f.seek(0, os.SEEK_END)
+                yield f
+            finally:
+                f.close()  # 닫으면 잠금도 해제
+
+    def create(self, filename: str, total_size: int, sha256: Optional[str] = None,
+               metadata: Optional[Dict] = None) -> Dict:
+        if total_size <= 0:
+            raise UploadError('파일 크기가 올바르지 않습니다.')
+        if total_size > self.max_bytes:
+            raise UploadError(f'파일이 너무 큽니다. (최대 {self.max_bytes // 1024 ** 2}MB)', status=413)
+
+        self.cleanup_expired()
+        upload_id = uuid.uuid4().hex
+        info = {
+            'upload_id': upload_id,
+            'filename': filename,
+            'size': total_size,
+            'sha256': sha256.lower() if sha256 else None,
+            'created_at': time.time(),
+            'metadata': metadata or {}
+        }
+        with open(self._meta_path(upload_id), 'w', encoding='utf-8') as f:
+            json.dump(info, f, ensure_ascii=False)
+        open(self.part_path(upload_id), 'wb').close()
+        return info
+
+    def info(self, upload_id: str) -> Dict:
+        if not upload_id.isalnum():
+            raise UploadError('업로드를 찾을 수 없습니다.', status=404)
+        try:
+            with open(self._meta_path(upload_id), 'r', encoding='utf-8') as f:
+                info = json.load(f)
+        except (OSError, ValueError):
+            raise UploadError('업로드를 찾을 수 없습니다.', status=404)
+        info['offset'] = self.offset(upload_id)
+        return info
+
+    def offset(self, upload_id: str) -> int:
+        try:
+            return os.path.getsize(self.part_path(upload_id))
+        except OSError:
+            return 0
+
+    def append(self, upload_id: str, offset: int, stream: BinaryIO) -> int:
+        """offset 위치부터 스트림 기록, 새 오프셋 반환
+
+        offset이 현재 받은 크기와 다르면 409 (클라이언트는 offset()부터 재전송)
+        """
+        info = self.info(upload_id)
+        with self._locked_part(upload_id) as f:
+            current = f.tell()
+            if offset != current:
+                raise UploadError('업로드 오프셋이 일치하지 않습니다.', status=409, offset=current)
+
+            hasher, hashed = self._hashers.get(upload_id, (None, 0))
+            if hasher is None or hashed != current:
+                # 다른 워커가 받은 구간이 있으면 디스크에서 이어서 계산
+                hasher, hashed = self._catch_up(upload_id, hasher, hashed, current)
+
+            try:
+                written = copy_stream(stream, f, info['size'] - current, self.block_size, hasher)
+            except Exception:
+                # 초과분이나 끊긴 요청의 기록 위치를 알 수 없으므로 해시는 다음 요청에서 디스크 기준으로 다시 계산
+                self._hashers.pop(upload_id, None)
+                raise
+
+            self._hashers[upload_id] = (hasher, current + written)
+            return current + written
+
+    def complete(self, upload_id: str) -> Tuple[str, str, Dict]:
+        """업로드 완료 확인 및 해시 검증
+
+        Returns:
+            (파일 경로, SHA-256 hex, 업로드 정보)
+        """
+        info = self.info(upload_id)
+        with self._locked_part(upload_id) as f:
+            size = f.tell()
+            if size != info['size']:
+                raise UploadError(f"업로드가 완료되지 않았습니다. ({size}/{info['size']} bytes)",
+                                  status=409, offset=size)
+
+            hasher, hashed = self._hashers.pop(upload_id, (None, 0))
+            hasher, _ = self._catch_up(upload_id, hasher, hashed, size)
+            digest = hasher.hexdigest()
+
+            if info['sha256'] and digest != info['sha256']:
+                self.discard(upload_id)
+                raise UploadError('파일 해시가 일치하지 않습니다. 다시 업로드해주세요.', status=422)
+
+            os.remove(self._meta_path(upload_id))
+            with self._lock:
+                self._upload_locks.pop(upload_id, None)
+        return self.part_path(upload_id), digest, info
+
+    def discard(self, upload_id: str):
+        for path in (self._meta_path(upload_id), self.part_path(upload_id)):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        with self._lock:
+            self._hashers.pop(upload_id, None)
+            self._upload_locks.pop(upload_id, None)
+
+    def cleanup_expired(self) -> int:
+        """TTL이 지난 미완료 업로드 삭제"""
+        now = time.time()
+        removed = 0
+        for name in os.listdir(self.upload_dir):
+            if not name.endswith('.json'):
+                continue
+            upload_id = name[:-5]
+            part = self.part_path(upload_id)
+            last_write = os.path.getmtime(part) if os.path.exists(part) else 0
+            if now - last_write > self.ttl_seconds:
+                self.discard(upload_id)
+                removed += 1
+        if removed:
+            logger.info(f"🧹 만료된 분할 업로드 {removed}개 정리")
+        return removed
+
+    def _catch_up(self, upload_id: str, hasher, hashed: int, target: int):
+        if hasher is None or hashed > target:
+            hasher, hashed = hashlib.sha256(), 0
+        if hashed < target:
+            with open(self.part_path(upload_id), 'rb') as f:
+                f.seek(hashed)
+                remaining = target - hashed
+                while remaining > 0:
+                    block = f.read(min(self.block_size, remaining))
+                    if not block:
+                        break
+                    hasher.update(block)
+                    remaining -= len(block)
+        return hasher, target
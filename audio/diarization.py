@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+EX-GPT 화자 분리 (Speaker Diarization)
+- VAD 음성 구간을 최대 3초 창으로 나누어 화자 임베딩 계산 (CPU)
+- 코사인 유사도 평균 연결 군집화 (numpy 벡터 연산)
+- 전사 세그먼트에 시간 겹침 기준으로 화자 라벨 부여
+"""
+
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from audio.vad import detect_speech_segments
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SpeakerTurn:
+    """화자 발화 구간"""
+    start: float
+    end: float
+    speaker: int
+
+
+# ----------------------------------------------------------------------
+# 화자 임베딩
+# ----------------------------------------------------------------------
+def _mel_filterbank(sr: int, n_fft: int, n_mels: int) -> np.ndarray:
+    def hz_to_mel(hz):
+        return 2595 * np.log10(1 + hz / 700)
+
+    def mel_to_hz(mel):
+        return 700 * (10 ** (mel / 2595) - 1)
+
+    mel_points = np.linspace(hz_to_mel(0), hz_to_mel(sr / 2), n_mels + 2)
+    bins = np.floor((n_fft + 1) * mel_to_hz(mel_points) / sr).astype(int)
+    fbank = np.zeros((n_mels, n_fft // 2 + 1), dtype=np.float32)
+    for m in range(1, n_mels + 1):
+        left, center, right = bins[m - 1], bins[m], bins[m + 1]
+        if center > left:
+            fbank[m - 1, left:center] = (np.arange(left, center) - left) / (center - left)
+        if right > center:
+            fbank[m - 1, center:right] = (right - np.arange(center, right)) / (right - center)
+    return fbank
+
+
+class SpeakerEmbedder:
+    """화자 임베딩 추출기
+
+    speechbrain ECAPA 모델이 있으면 사용하고, 없으면 MFCC 평균/표준편차
+    통계 벡터를 사용합니다. 둘 다 CPU에서 동작합니다.
+    """
+
+    def __init__(self, sr: int = 16000, backend: str = 'auto',
+                 model_source: str = 'speechbrain/spkrec-ecapa-voxceleb'):
+        self.sr = sr
+        self.n_fft = 512
+        self.hop = 160
+        self.n_mfcc = 20
+        self._fbank = _mel_filterbank(sr, self.n_fft, 40)
+        self._dct = np.cos(np.pi / 40 * (np.arange(40) + 0.5)[None, :] * np.arange(self.n_mfcc)[:, None])
+        self._model = None
+        self._lock = threading.Lock()
+        self.backend = 'mfcc'
+
+        if backend in ('auto', 'ecapa'):
+            try:
+                try:
+                    from speechbrain.inference.speaker import EncoderClassifier
+                except ImportError:
+                    from speechbrain.pretrained import EncoderClassifier
+                self._model = EncoderClassifier.from_hparams(
+                    source=os.getenv('SPEAKER_MODEL_DIR', model_source),
+                    run_opts={'device': 'cpu'}
+                )
+                self.backend = 'ecapa'
+            except Exception as e:
+                if backend == 'ecapa':
+                    raise
+                logger.info(f"화자 임베딩: ECAPA 사용 불가, MFCC 통계 사용 ({e})")
+
+    def _mfcc_stats(self, samples: np.ndarray) -> np.ndarray:
+        if len(samples) < self.n_fft:
+            samples = np.pad(samples, (0, self.n_fft - len(samples)))
+        n_frames = 1 + (len(samples) - self.n_fft) // self.hop
+        idx = np.arange(self.n_fft)[None, :] + self.hop * np.arange(n_frames)[:, None]
+        power = np.abs(np.fft.rfft(samples[idx] * np.hanning(self.n_fft), axis=1)) ** 2
+        log_mel = np.log(power @ self._fbank.T + 1e-10)
+        # 창 가장자리의 무음 프레임은 통계에서 제외 (최대 에너지 대비 -30dB 미만)
+        energy = log_mel.max(axis=1)
+        voiced = energy >= energy.max() - np.log(10 ** 3)
+        mfcc = log_mel[voiced] @ self._dct.T
+        return np.concatenate([mfcc.mean(axis=0), mfcc.std(axis=0)]).astype(np.float32)
+
+    def embed(self, windows: Sequence[np.ndarray]) -> np.ndarray:
+        """창 목록 → (N, D) 임베딩 행렬"""
+        if self._model is not None:
+            import torch
+            length = max(len(w) for w in windows)
+            batch = torch.zeros(len(windows), length)
+            lengths = torch.zeros(len(windows))
+            for i, window in enumerate(windows):
+                batch[i, :len(window)] = torch.from_numpy(np.asarray(window, dtype=np.float32))
+                lengths[i] = len(window) / length
+            with self._lock, torch.no_grad():
+                return self._model.encode_batch(batch, lengths).squeeze(1).numpy()
+
+        features = np.stack([self._mfcc_stats(np.asarray(w, dtype=np.float32)) for w in windows])
+        # 녹음 단위 평균 제거 (채널/마이크 특성 제거). 차원별 분산 정규화는
+        # 변동이 작은 차원의 잡음을 키우므로 하지 않음
+        return features - features.mean(axis=0)
+
+
+# ----------------------------------------------------------------------
+# 군집화 / 라벨링
+# ----------------------------------------------------------------------
+def cluster_embeddings(embeddings: np.ndarray, threshold: float = 0.3,
+                       num_speakers: Optional[int] = None) -> np.ndarray:
+    """코사인 유사도 평균 연결(average linkage) 응집 군집화
+
+    Args:
+        embeddings: (N, D) 임베딩
+        threshold: 군집 간 평균 유사도가 이 값보다 낮으면 병합 중단
+        num_speakers: 화자 수를 알고 있으면 해당 개수까지 병합
+
+    Returns:
+        (N,) 0부터 시작하는 화자 번호 (등장 순서대로)
+    """
+    n = len(embeddings)
+    if n == 0:
+        return np.zeros(0, dtype=int)
+    if n == 1:
+        return np.zeros(1, dtype=int)
+
+    normed = embeddings / (np.linalg.norm(embeddings, axis=1, keepdims=True) + 1e-10)
+    sim = (normed @ normed.T).astype(np.float64)
+    np.fill_diagonal(sim, -np.inf)
+
+    sizes = np.ones(n)
+    active = np.ones(n, dtype=bool)
+    labels = np.arange(n)
+    target = num_speakers or 1
+
+    for _ in range(n - 1):
+        if active.sum() <= target:
+            break
+        flat = np.argmax(sim)
+        a, b = divmod(flat, n)
+        if num_speakers is None and sim[a, b] < threshold:
+            break
+
+        # b를 a로 병합 - 평균 연결 갱신
+        merged = (sizes[a] * sim[a] + sizes[b] * sim[b]) / (sizes[a] + sizes[b])
+        sim[a, :] = merged
+        sim[:, a] = merged
+        sim[a, a] = -np.inf
+        sim[b, :] = -np.inf
+        sim[:, b] = -np.inf
+        sizes[a] += sizes[b]
+        active[b] = False
+        labels[labels == b] = a
+
+    _, first_seen = np.unique(labels, return_index=True)
+    order = {label: rank for rank, label in enumerate(labels[np.sort(first_seen)])}
+    return np.array([order[label] for label in labels], dtype=int)
+
+
+def merge_turns(turns: List[SpeakerTurn], gap: float = 0.5) -> List[SpeakerTurn]:
+    """같은 화자의 인접 구간 병합"""
+    merged: List[SpeakerTurn] = []
+    for turn in sorted(turns, key=lambda t: t.start):
+        if merged and merged[-1].speaker == turn.speaker and turn.start - merged[-1].end <= gap:
+            merged[-1].end = max(merged[-1].end, turn.end)
+        else:
+            merged.append(SpeakerTurn(turn.start, turn.end, turn.speaker))
+    return merged
+
+
+def assign_speakers(segments: List[Dict], turns: List[SpeakerTurn]) -> List[Dict]:
+    """전사 세그먼트마다 가장 많이 겹치는 화자 라벨 부여"""
+    if not turns:
+        return [dict(segment, speaker=None) for segment in segments]
+
+    starts = np.array([t.start for t in turns])
+    ends = np.array([t.end for t in turns])
+    speakers = np.array([t.speaker for t in turns])
+    mids = (starts + ends) / 2
+
+    labeled = []
+    for segment in segments:
+        overlap = np.minimum(ends, segment['end']) - np.maximum(starts, segment['start'])
+        if overlap.max() > 0:
+            per_speaker = np.bincount(speakers, weights=np.clip(overlap, 0, None))
+            speaker = int(np.argmax(per_speaker))
+        else:
+            # 겹치는 구간이 없으면 가장 가까운 구간의 화자
+            speaker = int(speakers[np.argmin(np.abs(mids - (segment['start'] + segment['end']) / 2))])
+        labeled.append(dict(segment, speaker=speaker))
+    return labeled
+
+
+def format_speaker_transcript(labeled_segments: List[Dict]) -> str:
+    """화자별 줄바꿈 전사 텍스트"""
+    lines = []
+    for segment in labeled_segments:
+        text = segment['text'].strip()
+        if not text:
+            continue
+        speaker = segment.get('speaker')
+        label = f"화자 {speaker + 1}" if speaker is not None else "화자 ?"
+        if lines and lines[-1][0] == label:
+            lines[-1][1].append(text)
+        else:
+            lines.append((label, [text]))
+    return "\n".join(f"[{label}] {' '.join(texts)}" for label, texts in lines)
+
+
+class Diarizer:
+    """VAD 구간 → 화자 구간"""
+
+    def __init__(self, embedder: Optional[SpeakerEmbedder] = None, window_seconds: float = 3.0,
+                 min_window_seconds: float = 0.5, threshold: float = 0.3, backend: str = 'auto'):
+        self.embedder = embedder or SpeakerEmbedder(backend=backend)
+        self.window_seconds = window_seconds
+        self.min_window_seconds = min_window_seconds
+        self.threshold = threshold
+
+    def _windows(self, speech_segments: List[Tuple[float, float]]) -> List[Tuple[float, float]]:
+        # 구간을 같은 길이로 나누어 짧은 꼬리 창이 생기지 않도록 함
+        windows = []
+        for start, end in speech_segments:
+            length = end - start
+            if length < self.min_window_seconds:
+                continue
+            n = int(np.ceil(length / self.window_seconds))
+            edges = np.linspace(start, end, n + 1)
+            windows.extend(zip(edges[:-1].tolist(), edges[1:].tolist()))
+        return windows
+
+    def diarize(self, samples: np.ndarray, sr: int, speech_segments: Optional[List[Tuple[float, float]]] = None,
+                num_speakers: Optional[int] = None) -> List[SpeakerTurn]:
+        if sr != self.embedder.sr:
+            # 임베딩 모델 샘플레이트로 선형 보간 (구간 시간은 그대로 유지)
+            target_len = int(len(samples) * self.embedder.sr / sr)
+            samples = np.interp(np.linspace(0, len(samples) - 1, target_len),
+                                np.arange(len(samples)), samples).astype(np.float32)
+            sr = self.embedder.sr
+        if speech_segments is None:
+            speech_segments = detect_speech_segments(samples, sr)
+        windows = self._windows(speech_segments)
+        if not windows:
+            return []
+
+        clips = [samples[int(s * sr):int(e * sr)] for s, e in windows]
+        embeddings = self.embedder.embed(clips)
+        labels = cluster_embeddings(embeddings, self.threshold, num_speakers)
+
+        turns = merge_turns([SpeakerTurn(s, e, int(label)) for (s, e), label in zip(windows, labels)])
+        logger.info(f"🗣️ 화자 분리 완료: {len(set(labels.tolist()))}명, {len(turns)}개 구간 "
+                    f"(임베딩: {self.embedder.backend})")
+        return turns
+
+    def diarize_file(self, audio_path: str, num_speakers: Optional[int] = None) -> List[SpeakerTurn]:
+        import soundfile as sf
+
+        samples, sr = sf.read(audio_path, dtype='float32', always_2d=True)
+        return self.diarize(samples.mean(axis=1), sr, num_speakers=num_speakers)
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+EX-GPT 지연 로딩 모델 관리
+- 첫 사용 시점에 락을 잡고 한 번만 로드
+- 설정한 유휴 시간 동안 사용되지 않으면 자동 언로드 (GPU/RSS 반환)
+- 추론 중인 모델은 언로드하지 않음
+"""
+
+import gc
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class LazyModel:
+    """필요할 때 로드되고 유휴 시 해제되는 모델 래퍼
+
+    사용 예:
+        stt = LazyModel('faster-whisper', load_fn, idle_timeout=600)
+        with stt.use() as model:
+            model.transcribe(...)
+    """
+
+    def __init__(self, name: str, loader: Callable[[], Any], idle_timeout: float = 600.0):
+        self.name = name
+        self.loader = loader
+        self.idle_timeout = idle_timeout
+
+        self._model: Optional[Any] = None
+        self._lock = threading.Lock()
+        self._in_use = 0
+        self._last_used = 0.0
+        self._reaper: Optional[threading.Thread] = None
+        self.load_count = 0
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._model is not None
+
+    def get(self) -> Any:
+        """모델 반환 (없으면 로드). 로드 실패 시 예외 전파"""
+        with self._lock:
+            return self._get_locked()
+
+    def _get_locked(self) -> Any:
+        if self._model is None:
+            started = time.time()
+            logger.info(f"⏳ {self.name} 모델 로딩...")
+            self._model = self.loader()
+            self.load_count += 1
+            logger.info(f"✅ {self.name} 모델 로드 완료 ({time.time() - started:.1f}초)")
+            self._start_reaper()
+        self._last_used = time.time()
+        return self._model
+
+    @contextmanager
+    def use(self):
+        """추론 구간 동안 언로드되지 않도록 보호 (로드와 사용 표시를 한 번의 락 안에서 처리)"""
+        with self._lock:
+            model = self._get_locked()
+            self._in_use += 1
+        try:
+            yield model
+        finally:
+            with self._lock:
+                self._in_use -= 1
+                self._last_used = time.time()
+
+    def unload(self) -> bool:
+        """모델 해제 (사용 중이면 실패)"""
+        with self._lock:
+            if self._model is None or self._in_use > 0:
+                return False
+            self._model = None
+        self._release_memory()
+        logger.info(f"💤 {self.name} 모델 언로드")
+        return True
+
+    @staticmethod
+    def _release_memory():
+        gc.collect()
+        try:
+            import torch
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+        except ImportError:
+            pass
+
+    def _start_reaper(self):
+        if self.idle_timeout <= 0 or (self._reaper and self._reaper.is_alive()):
+            return
+        self._reaper = threading.Thread(target=self._reap, name=f"{self.name}-reaper", daemon=True)
+        self._reaper.start()
+
+    def _reap(self):
+        # 한 번 시작되면 프로세스 종료까지 유지 (재로드 시 새 스레드 불필요)
+        interval = max(1.0, min(self.idle_timeout / 4, 30.0))
+        while True:
+            time.sleep(interval)
+            # 판정과 해제를 같은 락 안에서 처리 (그 사이에 get()/use()가 끼어들지 않도록)
+            with self._lock:
+                idle = time.time() - self._last_used
+                expired = self._model is not None and self._in_use == 0 and idle >= self.idle_timeout
+                if expired:
+                    self._model = None
+            if expired:
+                self._release_memory()
+                logger.info(f"💤 {self.name} 모델 언로드 (유휴 {self.idle_timeout:.0f}초 경과)")
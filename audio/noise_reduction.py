@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+EX-GPT 스트리밍 노이즈 제거
+- 고정 크기 블록 단위 스펙트럴 게이팅 (overlap-add)
+- 앞부분 N초 또는 무음 구간에서 노이즈 프로파일 추정
+- 녹음 길이와 무관하게 메모리 사용량 일정
+- 제너레이터 단계로 STT 파이프라인에 연결 가능
+"""
+
+import logging
+import os
+from typing import Iterable, Iterator, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class StreamingNoiseReducer:
+    """블록 단위 스펙트럴 게이팅 노이즈 제거기
+
+    sqrt-Hann 분석/합성 창과 50% 오버랩을 사용하므로 마스크가 1이면
+    입력이 그대로 복원됩니다. 노이즈 프로파일이 없으면 처음
+    ``profile_seconds`` 만큼을 버퍼링한 뒤 그 중 가장 조용한 프레임들로
+    프로파일을 추정합니다.
+    """
+
+    def __init__(self, sr: int = 16000, n_fft: int = 1024, prop_decrease: float = 0.8,
+                 n_std_thresh: float = 1.5, profile_seconds: float = 2.0,
+                 quiet_quantile: float = 0.2, time_smoothing: float = 0.5):
+        self.sr = sr
+        self.n_fft = n_fft
+        self.hop = n_fft // 2
+        self.prop_decrease = prop_decrease
+        self.n_std_thresh = n_std_thresh
+        self.profile_samples = int(profile_seconds * sr)
+        self.quiet_quantile = quiet_quantile
+        self.time_smoothing = time_smoothing
+
+        self.window = np.sqrt(np.hanning(n_fft + 1)[:-1]).astype(np.float32)
+        self.threshold_db: Optional[np.ndarray] = None
+
+        # 첫 프레임도 완전히 복원되도록 앞쪽에 (n_fft - hop)개의 0을 채움
+        self._pad = n_fft - self.hop
+        self._in = np.zeros(self._pad, dtype=np.float32)
+        self._ola = np.zeros(n_fft, dtype=np.float32)
+        self._prev_mask: Optional[np.ndarray] = None
+        self._pending: list = []
+        self._pending_len = 0
+        self._to_skip = self._pad
+        self._samples_in = 0
+        self._samples_out = 0
+
+    # ------------------------------------------------------------------
+    # 노이즈 프로파일
+    # ------------------------------------------------------------------
+    def _frame_db(self, samples: np.ndarray) -> np.ndarray:
+        """프레임별 크기 스펙트럼(dB) 계산"""
+        if len(samples) < self.n_fft:
+            samples = np.pad(samples, (0, self.n_fft - len(samples)))
+        n_frames = 1 + (len(samples) - self.n_fft) // self.hop
+        idx = np.arange(self.n_fft)[None, :] + self.hop * np.arange(n_frames)[:, None]
+        spec = np.fft.rfft(samples[idx] * self.window, axis=1)
+        return 20 * np.log10(np.abs(spec) + 1e-10)
+
+    def fit_noise(self, noise: np.ndarray, quiet_only: bool = False):
+        """노이즈 샘플로 주파수 대역별 임계값 설정
+
+        Args:
+            noise: 노이즈(또는 노이즈가 포함된 앞부분) 샘플
+            quiet_only: True이면 에너지가 낮은 프레임만 사용 (무음 구간 검출)
+        """
+        frames_db = self._frame_db(np.asarray(noise, dtype=np.float32))
+        if quiet_only and len(frames_db) > 1:
+            energy = frames_db.mean(axis=1)
+            cutoff = np.quantile(energy, self.quiet_quantile)
+            frames_db = frames_db[energy <= cutoff]
+        mean = frames_db.mean(axis=0)
+        std = frames_db.std(axis=0)
+        self.threshold_db = (mean + self.n_std_thresh * std).astype(np.float32)
+
+    # ------------------------------------------------------------------
+    # 블록 처리
+    # ------------------------------------------------------------------
+    def _process_frame(self, frame: np.ndarray) -> np.ndarray:
+        spec = np.fft.rfft(frame * self.window)
+        mag_db = 20 * np.log10(np.abs(spec) + 1e-10)
+        mask = np.where(mag_db > self.threshold_db, 1.0, 1.0 - self.prop_decrease)
+        if self._prev_mask is not None and self.time_smoothing > 0:
+            mask = self.time_smoothing * self._prev_mask + (1 - self.time_smoothing) * mask
+        self._prev_mask = mask
+        return np.fft.irfft(spec * mask, n=self.n_fft).astype(np.float32) * self.window
+
+    def _run(self, block: np.ndarray) -> np.ndarray:
+        self._in = np.concatenate([self._in, block])
+        n_frames = 0 if len(self._in) < self.n_fft else 1 + (len(self._in) - self.n_fft) // self.hop
+        out = np.empty(n_frames * self.hop, dtype=np.float32)
+
+        for i in range(n_frames):
+            start = i * self.hop
+            self._ola += self._process_frame(self._in[start:start + self.n_fft])
+            out[start:start + self.hop] = self._ola[:self.hop]
+            self._ola = np.concatenate([self._ola[self.hop:], np.zeros(self.hop, dtype=np.float32)])
+
+        self._in = self._in[n_frames * self.hop:]
+        return self._emit(out)
+
+    def _emit(self, out: np.ndarray) -> np.ndarray:
+        if self._to_skip:
+            skip = min(self._to_skip, len(out))
+            out = out[skip:]
+            self._to_skip -= skip
+        remaining = self._samples_in - self._samples_out
+        out = out[:max(remaining, 0)]
+        self._samples_out += len(out)
+        return out
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """블록을 입력받아 처리 완료된 샘플 반환 (지연 최대 n_fft 샘플)"""
+        block = np.asarray(block, dtype=np.float32).reshape(-1)
+        self._samples_in += len(block)
+
+        if self.threshold_db is None:
+            self._pending.append(block)
+            self._pending_len += len(block)
+            if self._pending_len < self.profile_samples:
+                return np.zeros(0, dtype=np.float32)
+            buffered = np.concatenate(self._pending)
+            self._pending, self._pending_len = [], 0
+            self.fit_noise(buffered[:self.profile_samples], quiet_only=True)
+            return self._run(buffered)
+
+        return self._run(block)
+
+    def flush(self) -> np.ndarray:
+        """남은 샘플을 모두 처리하여 반환"""
+        if self.threshold_db is None:
+            buffered = (np.concatenate(self._pending) if self._pending
+                        else np.zeros(0, dtype=np.float32))
+            self._pending, self._pending_len = [], 0
+            if len(buffered) == 0:
+                return buffered
+            self.fit_noise(buffered, quiet_only=True)
+            head = self._run(buffered)
+        else:
+            head = np.zeros(0, dtype=np.float32)
+        tail = self._run(np.zeros(self.n_fft, dtype=np.float32))
+        return np.concatenate([head, tail])
+
+
+def reduce_noise_stream(blocks: Iterable[np.ndarray], sr: int = 16000,
+                        noise_clip: Optional[np.ndarray] = None,
+                        **reducer_kwargs) -> Iterator[np.ndarray]:
+    """오디오 블록 제너레이터에 노이즈 제거를 적용하는 파이프라인 단계
+
+    Args:
+        blocks: float32 모노 오디오 블록 이터러블
+        sr: 샘플레이트
+        noise_clip: 미리 알고 있는 노이즈 샘플 (없으면 앞부분에서 추정)
+    """
+    reducer = StreamingNoiseReducer(sr=sr, **reducer_kwargs)
+    if noise_clip is not None:
+        reducer.fit_noise(noise_clip)
+
+    for block in blocks:
+        out = reducer.process(block)
+        if len(out):
+            yield out
+
+    tail = reducer.flush()
+    if len(tail):
+        yield tail
+
+
+def iter_audio_blocks(audio_path: str, block_seconds: float = 30.0) -> Iterator[np.ndarray]:
+    """오디오 파일을 고정 길이 블록으로 읽어오기 (모노 float32)"""
+    import soundfile as sf
+
+    with sf.SoundFile(audio_path) as f:
+        block_size = int(block_seconds * f.samplerate)
+        for block in f.blocks(blocksize=block_size, dtype='float32', always_2d=True):
+            yield block.mean(axis=1)
+
+
+def reduce_noise_file(input_path: str, output_path: Optional[str] = None,
+                      block_seconds: float = 30.0, **reducer_kwargs) -> str:
+    """파일 단위 스트리밍 노이즈 제거
+
+    입력을 블록 단위로 읽어 처리 결과를 바로 출력 파일에 기록하므로
+    2시간 녹음도 블록 크기만큼의 메모리만 사용합니다.
+    출력 경로가 없으면 입력 파일을 교체합니다.
+    """
+    import soundfile as sf
+
+    info = sf.info(input_path)
+    target_path = output_path or input_path
+    temp_path = target_path + '.nr.wav'
+
+    try:
+        with sf.SoundFile(temp_path, 'w', samplerate=info.samplerate, channels=1,
+                          subtype='PCM_16', format='WAV') as out:
+            blocks = iter_audio_blocks(input_path, block_seconds)
+            for processed in reduce_noise_stream(blocks, sr=info.samplerate, **reducer_kwargs):
+                out.write(processed)
+        os.replace(temp_path, target_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+    logger.info(f"🔇 스트리밍 노이즈 제거 완료: {info.duration:.1f}초")
+    return target_path
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+EX-GPT 스트리밍 오디오 전처리
+- 디코딩(ffmpeg) → 노이즈 제거 → 긴 무음 제거 → 16kHz 모노 WAV 기록을 블록 제너레이터로 연결
+- 전체 녹음을 메모리에 올리지 않으므로 녹음 길이와 무관하게 메모리 사용량 일정
+- 결과 WAV 파일을 STT·화자 분리 입력으로 사용
+"""
+
+import logging
+import os
+import subprocess
+from typing import Dict, Iterable, Iterator, List
+
+import numpy as np
+
+from audio.noise_reduction import iter_audio_blocks, reduce_noise_stream
+from audio.vad import EnergyVAD
+
+logger = logging.getLogger(__name__)
+
+TARGET_SAMPLE_RATE = 16000
+
+
+def decode_blocks(audio_path: str, sr: int = TARGET_SAMPLE_RATE, block_seconds: float = 30.0) -> Iterator[np.ndarray]:
+    """오디오 파일을 sr Hz 모노 float32 블록으로 디코딩
+
+    ffmpeg 표준 출력을 블록 단위로 읽으므로 m4a/mp3도 파일 전체를 메모리에 올리지 않습니다.
+    ffmpeg가 없으면 soundfile로 읽고 블록마다 선형 보간으로 리샘플링합니다.
+    """
+    block_bytes = int(block_seconds * sr) * 4
+    try:
+        process = subprocess.Popen(
+            ['ffmpeg', '-nostdin', '-v', 'error', '-i', audio_path, '-f', 'f32le', '-ac', '1', '-ar', str(sr), '-'],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+    except FileNotFoundError:
+        logger.warning("⚠️ ffmpeg 없음 - soundfile로 디코딩")
+        yield from _decode_soundfile(audio_path, sr, block_seconds)
+        return
+
+    try:
+        pending = b''
+        while True:
+            data = process.stdout.read(block_bytes)
+            if not data:
+                break
+            data = pending + data
+            usable = len(data) - len(data) % 4
+            pending = data[usable:]
+            if usable:
+                yield np.frombuffer(data[:usable], dtype='<f4').copy()
+        stderr = process.stderr.read()
+        if process.wait() != 0:
+            raise RuntimeError(f"ffmpeg 디코딩 실패: {stderr.decode('utf-8', 'replace').strip()[:500]}")
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        process.stdout.close()
+        process.stderr.close()
+
+
+def _decode_soundfile(audio_path: str, sr: int, block_seconds: float) -> Iterator[np.ndarray]:
+    import soundfile as sf
+
+    source_sr = sf.info(audio_path).samplerate
+    position = 0.0  # 다음 출력 샘플의 입력 기준 위치 (블록 경계에서도 간격 유지)
+    offset = 0
+    for block in iter_audio_blocks(audio_path, block_seconds):
+        if source_sr == sr:
+            yield block
+            continue
+        step = source_sr / sr
+        times = np.arange(position, offset + len(block) - 1, step)
+        if len(times):
+            yield np.interp(times, np.arange(offset, offset + len(block)), block).astype(np.float32)
+            position = times[-1] + step
+        offset += len(block)
+
+
+def trim_silence_stream(blocks: Iterable[np.ndarray], sr: int = TARGET_SAMPLE_RATE, min_silence_ms: int = 500,
+                        keep_silence_ms: int = 250, frame_ms: int = 30) -> Iterator[np.ndarray]:
+    """min_silence_ms 이상 이어지는 무음을 잘라내는 단계 (앞뒤로 keep_silence_ms씩 유지)
+
+    무음은 최대 min_silence_ms만큼만 보관하므로 메모리 사용량이 무음 길이와 무관합니다.
+    """
+    vad = EnergyVAD(sr=sr, frame_ms=frame_ms)
+    frame_size = vad.frame_size
+    min_frames = max(1, min_silence_ms // frame_ms)
+    keep_frames = keep_silence_ms // frame_ms
+
+    silence: List[np.ndarray] = []
+    dropped = False       # 현재 무음 구간이 길어 중간을 버렸는지
+    trailing = 0          # 음성 직후 그대로 내보낼 무음 프레임 수
+    remainder = np.zeros(0, dtype=np.float32)
+
+    for block in blocks:
+        samples = np.concatenate([remainder, np.asarray(block, dtype=np.float32).reshape(-1)])
+        n_frames = len(samples) // frame_size
+        remainder = samples[n_frames * frame_size:]
+        out = []
+        for i in range(n_frames):
+            frame = samples[i * frame_size:(i + 1) * frame_size]
+            if vad.is_speech(frame):
+                out.extend(silence)
+                silence, dropped = [], False
+                out.append(frame)
+                trailing = keep_frames
+            elif trailing:
+                out.append(frame)
+                trailing -= 1
+            else:
+                silence.append(frame)
+                if dropped or len(silence) + keep_frames >= min_frames:
+                    # 긴 무음 - 다음 음성 앞에 붙일 마지막 keep_frames개만 유지
+                    dropped = True
+                    if len(silence) > keep_frames:
+                        del silence[0]
+        if out:
+            yield np.concatenate(out)
+
+    if trailing and len(remainder):
+        yield remainder
+
+
+def preprocess_stream(blocks: Iterable[np.ndarray], sr: int = TARGET_SAMPLE_RATE, noise_reduction: bool = True,
+                      trim_silence: bool = True, prop_decrease: float = 0.8) -> Iterator[np.ndarray]:
+    """디코딩된 블록에 노이즈 제거와 무음 제거를 차례로 적용"""
+    if noise_reduction:
+        blocks = reduce_noise_stream(blocks, sr=sr, prop_decrease=prop_decrease)
+    if trim_silence:
+        blocks = trim_silence_stream(blocks, sr=sr)
+    return blocks
+
+
+def preprocess_file(input_path: str, output_path: str, sr: int = TARGET_SAMPLE_RATE, block_seconds: float = 30.0,
+                    **options) -> Dict[str, float]:
+    """입력 오디오를 스트리밍 전처리해 16kHz 모노 PCM WAV로 기록
+
+    Returns:
+        {'output_seconds': 전처리 후 길이}
+    """
+    import soundfile as sf
+
+    written = 0
+    temp_path = output_path + '.tmp.wav'
+    try:
+        with sf.SoundFile(temp_path, 'w', samplerate=sr, channels=1, subtype='PCM_16', format='WAV') as out:
+            for block in preprocess_stream(decode_blocks(input_path, sr, block_seconds), sr=sr, **options):
+                out.write(np.clip(block, -1.0, 1.0))
+                written += len(block)
+        os.replace(temp_path, output_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return {'output_seconds': written / sr}
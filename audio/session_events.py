@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+EX-GPT 오디오 처리 세션 저장소 / 이벤트 버스
+- 세션 수 상한과 TTL 기반 만료 (오래된 세션부터 제거)
+- 세션 갱신 시 구독자 큐로 진행 이벤트 발행 (SSE 스트리밍용)
+- 업로드 전에 세션을 미리 만들 수 있어 클라이언트가 처리 시작 전부터 구독 가능
+"""
+
+import json
+import logging
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = ('completed', 'error')
+
+
+def session_event(session_id: str, session: Dict) -> Dict:
+    """세션 상태 → JSON 직렬화 가능한 이벤트"""
+    event = {
+        'session_id': session_id,
+        'status': session['status'],
+        'progress': session['progress'],
+        'message': session['message'],
+        'timestamp': session.get('updated_at', session['created_at']).isoformat()
+    }
+    if session['status'] in TERMINAL_STATUSES and session.get('result') is not None:
+        event['result'] = session['result']
+    return event
+
+
+def sse_events(store: 'SessionStore', session_id: str, events: queue.Queue,
+               keepalive_seconds: float = 15.0) -> Iterator[str]:
+    """구독 큐를 SSE 메시지로 변환 (완료/오류 이벤트 후 종료, 세션 만료 시 expired)"""
+    try:
+        # 구독 이전 상태부터 전송
+        session = store.get(session_id)
+        event = session_event(session_id, session) if session else None
+        while event is not None:
+            yield f"event: progress\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+            if event['status'] in TERMINAL_STATUSES:
+                return
+            while True:
+                try:
+                    event = events.get(timeout=keepalive_seconds)
+                    break
+                except queue.Empty:
+                    yield ": keepalive\n\n"
+        yield "event: expired\ndata: {}\n\n"
+    finally:
+        store.unsubscribe(session_id, events)
+
+
+class SessionStore:
+    """상한·TTL이 있는 세션 저장소
+
+    세션은 마지막 갱신 순서로 유지되며, 생성 시 만료된 세션과
+    상한을 넘는 가장 오래된 세션을 제거합니다. 제거된 세션의 구독자에게는
+    None을 보내 스트림을 종료시킵니다.
+    """
+
+    def __init__(self, max_sessions: int = 1000, ttl_seconds: float = 3600.0, queue_size: int = 100,
+                 size_observer: Optional[Callable[[int], None]] = None):
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.queue_size = queue_size
+        # 세션 수가 바뀔 때마다 호출 (메트릭 기록용)
+        self.size_observer = size_observer
+
+        self._sessions: "OrderedDict[str, Dict]" = OrderedDict()
+        self._touched: Dict[str, float] = {}
+        self._subscribers: Dict[str, List[queue.Queue]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session_id: str) -> bool:
+        return self.get(session_id) is not None
+
+    def create(self, user_id: str) -> str:
+        session_id = str(uuid.uuid4())
+        with self._lock:
+            self._evict_locked()
+            self._sessions[session_id] = {
+                'user_id': user_id,
+                'status': 'initialized',
+                'progress': 0,
+                'message': '처리 준비 중...',
+                'created_at': datetime.now(),
+                'result': None
+            }
+            self._touched[session_id] = time.monotonic()
+            self._notify_locked()
+        return session_id
+
+    def claim(self, session_id: Optional[str], user_id: str) -> str:
+        """클라이언트가 미리 만든 세션을 처리에 사용 (없거나 다른 사용자·이미 시작된 세션이면 새로 생성)
+
+        클라이언트는 업로드 전에 세션을 만들어 SSE를 구독하고, 업로드 요청에
+        같은 session_id를 보내 처리 시작부터의 진행 이벤트를 받습니다.
+        """
+        if session_id:
+            with self._lock:
+                session = self._sessions.get(session_id)
+                if session and session['user_id'] == user_id and session['status'] == 'initialized':
+                    session['status'] = 'claimed'
+                    return session_id
+            logger.warning(f"⚠️ 사용할 수 없는 오디오 처리 세션 {session_id} - 새 세션 생성")
+        return self.create(user_id)
+
+    def get(self, session_id: str) -> Optional[Dict]:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return None
+            if time.monotonic() - self._touched[session_id] > self.ttl_seconds:
+                self._remove_locked(session_id)
+                return None
+            return dict(session)
+
+    def update(self, session_id: str, status=None, progress=None, message=None, result=None) -> bool:
+        """세션 갱신 후 구독자에게 발행 (세션이 없으면 False)"""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return False
+            if status: session['status'] = status
+            if progress is not None: session['progress'] = progress
+            if message: session['message'] = message
+            if result: session['result'] = result
+            session['updated_at'] = datetime.now()
+            self._touched[session_id] = time.monotonic()
+            self._sessions.move_to_end(session_id)
+
+            event = session_event(session_id, session)
+            for q in self._subscribers.get(session_id, []):
+                self._offer(q, event)
+        return True
+
+    def subscribe(self, session_id: str) -> Optional[queue.Queue]:
+        """세션 이벤트 큐 등록 (세션이 없으면 None)"""
+        with self._lock:
+            if session_id not in self._sessions:
+                return None
+            q = queue.Queue(maxsize=self.queue_size)
+            self._subscribers.setdefault(session_id, []).append(q)
+            return q
+
+    def unsubscribe(self, session_id: str, q: queue.Queue):
+        with self._lock:
+            subscribers = self._subscribers.get(session_id)
+            if subscribers and q in subscribers:
+                subscribers.remove(q)
+                if not subscribers:
+                    del self._subscribers[session_id]
+
+    def evict_expired(self) -> int:
+        with self._lock:
+            return self._evict_locked()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'sessions': len(self._sessions),
+                'subscribers': sum(len(s) for s in self._subscribers.values()),
+                'max_sessions': self.max_sessions,
+                'ttl_seconds': self.ttl_seconds
+            }
+
+    @staticmethod
+    def _offer(q: queue.Queue, event):
+        # 느린 구독자는 가장 오래된 이벤트를 버림 (진행률은 최신 값만 의미 있음)
+        while True:
+            try:
+                q.put_nowait(event)
+                return
+            except queue.Full:
+                try:
+                    q.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def _remove_locked(self, session_id: str):
+        self._sessions.pop(session_id, None)
+        self._touched.pop(session_id, None)
+        for q in self._subscribers.pop(session_id, []):
+            self._offer(q, None)
+        self._notify_locked()
+
+    def _notify_locked(self):
+        if self.size_observer:
+            self.size_observer(len(self._sessions))
+
+    def _evict_locked(self) -> int:
+        now = time.monotonic()
+        removed = 0
+        # 마지막 갱신 순으로 정렬되어 있으므로 앞에서부터 확인
+        for session_id in list(self._sessions):
+            expired = now - self._touched[session_id] > self.ttl_seconds
+            if not expired and len(self._sessions) < self.max_sessions:
+                break
+            self._remove_locked(session_id)
+            removed += 1
+        if removed:
+            logger.info(f"🧹 만료된 오디오 처리 세션 {removed}개 정리")
+        return removed
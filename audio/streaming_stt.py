@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+EX-GPT 실시간 스트리밍 음성 인식
+- PCM(s16le/f32le) 또는 Opus 프레임 입력
+- VAD 기반 롤링 버퍼, 일정 간격 중간 결과(partial)와 휴지 구간 확정 결과(final)
+- 모든 세션이 하나의 모델과 추론 스레드 풀을 공유
+"""
+
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, List, Optional
+
+import numpy as np
+
+from audio.vad import EnergyVAD
+
+logger = logging.getLogger(__name__)
+
+TARGET_SAMPLE_RATE = 16000
+SUPPORTED_ENCODINGS = ('pcm_s16le', 'pcm_f32le', 'opus')
+
+
+@dataclass
+class StreamingConfig:
+    """스트리밍 인식 설정"""
+    partial_interval_ms: int = 500
+    pause_ms: int = 700
+    max_segment_seconds: float = 15.0
+    min_speech_ms: int = 250
+    pre_roll_ms: int = 200
+    frame_ms: int = 30
+
+
+class StreamingTranscriber:
+    """세션 간 공유되는 인식기
+
+    ``transcribe_fn(samples, final)``은 16kHz float32 모노 배열을 받아 텍스트를
+    반환해야 합니다. 추론은 고정 크기 스레드 풀에서 실행되므로 동시 세션이
+    많아도 모델은 하나만 메모리에 올라갑니다.
+    """
+
+    def __init__(self, transcribe_fn: Callable[[np.ndarray, bool], str], max_workers: int = 2,
+                 sessions_observer: Optional[Callable[[int], None]] = None):
+        self.transcribe_fn = transcribe_fn
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="STT-Stream")
+        self.active_sessions = 0
+        # 세션 수가 바뀔 때마다 호출 (메트릭 기록용)
+        self.sessions_observer = sessions_observer
+        self._lock = threading.Lock()
+
+    def submit(self, samples: np.ndarray, final: bool) -> Future:
+        return self.executor.submit(self.transcribe_fn, samples, final)
+
+    def open_session(self, **kwargs) -> 'StreamingSession':
+        # 생성 실패(지원하지 않는 인코딩, opuslib 없음)는 세션 수에 포함하지 않음
+        session = StreamingSession(self, **kwargs)
+        with self._lock:
+            self.active_sessions += 1
+            self._notify_locked()
+        return session
+
+    def close_session(self):
+        with self._lock:
+            self.active_sessions = max(0, self.active_sessions - 1)
+            self._notify_locked()
+
+    def _notify_locked(self):
+        if self.sessions_observer:
+            self.sessions_observer(self.active_sessions)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False)
+
+
+class StreamingSession:
+    """단일 클라이언트 스트림 상태 (롤링 버퍼 + VAD)"""
+
+    def __init__(self, transcriber: StreamingTranscriber, sample_rate: int = TARGET_SAMPLE_RATE,
+                 encoding: str = 'pcm_s16le', config: Optional[StreamingConfig] = None):
+        if encoding not in SUPPORTED_ENCODINGS:
+            raise ValueError(f"지원하지 않는 인코딩: {encoding}")
+
+        self.transcriber = transcriber
+        self.sample_rate = sample_rate
+        self.encoding = encoding
+        self.config = config or StreamingConfig()
+        self.vad = EnergyVAD(sr=TARGET_SAMPLE_RATE, frame_ms=self.config.frame_ms)
+
+        self._decoder = self._create_opus_decoder() if encoding == 'opus' else None
+        self._frame_size = self.vad.frame_size
+        self._residual = np.zeros(0, dtype=np.float32)
+        self._pre_roll: Deque[np.ndarray] = deque(
+            maxlen=max(1, self.config.pre_roll_ms // self.config.frame_ms))
+
+        self._segment: List[np.ndarray] = []
+        self._segment_samples = 0  # 현재 세그먼트 길이 (프레임마다 다시 합산하지 않도록 누적)
+        self._segment_start = 0.0
+        self._segment_id = 0
+        self._in_speech = False
+        self._speech_ms = 0
+        self._silence_ms = 0
+        self._since_partial_ms = 0
+        self._samples_seen = 0
+
+        self._partial: Optional[Future] = None
+        self._partial_segment_id = -1
+        self._finals: Deque[Dict] = deque()
+        self._closed = False
+
+    # ------------------------------------------------------------------
+    # 입력 디코딩
+    # ------------------------------------------------------------------
+    def _create_opus_decoder(self):
+        try:
+            import opuslib
+        except ImportError:
+            raise ValueError("Opus 입력에는 opuslib 패키지가 필요합니다")
+        return opuslib.Decoder(self.sample_rate, 1)
+
+    def _decode(self, data: bytes) -> np.ndarray:
+        if self.encoding == 'pcm_f32le':
+            samples = np.frombuffer(data, dtype='<f4').astype(np.float32)
+        elif self.encoding == 'opus':
+            pcm = self._decoder.decode(data, int(self.sample_rate * 0.12))
+            samples = np.frombuffer(pcm, dtype='<i2').astype(np.float32) / 32768.0
+        else:
+            samples = np.frombuffer(data, dtype='<i2').astype(np.float32) / 32768.0
+
+        if self.sample_rate != TARGET_SAMPLE_RATE and len(samples):
+            n_out = int(round(len(samples) * TARGET_SAMPLE_RATE / self.sample_rate))
+            x_old = np.arange(len(samples)) / self.sample_rate
+            x_new = np.arange(n_out) / TARGET_SAMPLE_RATE
+            samples = np.interp(x_new, x_old, samples).astype(np.float32)
+        return samples
+
+    # ------------------------------------------------------------------
+    # 세그먼트 관리
+    # ------------------------------------------------------------------
+    def _segment_audio(self) -> np.ndarray:
+        return np.concatenate(self._segment) if self._segment else np.zeros(0, dtype=np.float32)
+
+    def _finalize_segment(self):
+        audio = self._segment_audio()
+        if self._speech_ms >= self.config.min_speech_ms and len(audio):
+            self._finals.append({
+                'segment_id': self._segment_id,
+                'start': round(self._segment_start, 2),
+                'end': round(self._segment_start + len(audio) / TARGET_SAMPLE_RATE, 2),
+                'future': self.transcriber.submit(audio, True),
+            })
+        self._segment = []
+        self._segment_samples = 0
+        self._segment_id += 1
+        self._in_speech = False
+        self._speech_ms = 0
+        self._silence_ms = 0
+        self._since_partial_ms = 0
+
+    def _maybe_request_partial(self):
+        if self._since_partial_ms < self.config.partial_interval_ms:
+            return
+        if self._partial is not None and not self._partial.done():
+            # 이전 중간 결과가 아직 처리 중이면 건너뜀 (백로그 방지)
+            return
+        self._since_partial_ms = 0
+        self._partial = self.transcriber.submit(self._segment_audio(), False)
+        self._partial_segment_id = self._segment_id
+
+    def _process_frame(self, frame: np.ndarray):
+        frame_ms = self.config.frame_ms
+        frame_start = self._samples_seen / TARGET_SAMPLE_RATE
+        self._samples_seen += len(frame)
+
+        if self.vad.is_speech(frame):
+            if not self._in_speech:
+                self._in_speech = True
+                self._segment = list(self._pre_roll)
+                self._segment_samples = sum(len(f) for f in self._segment)
+                self._segment_start = frame_start - len(self._pre_roll) * frame_ms / 1000
+                self._pre_roll.clear()
+            self._segment.append(frame)
+            self._segment_samples += len(frame)
+            self._speech_ms += frame_ms
+            self._silence_ms = 0
+            self._since_partial_ms += frame_ms
+            self._maybe_request_partial()
+        elif self._in_speech:
+            self._segment.append(frame)
+            self._segment_samples += len(frame)
+            self._silence_ms += frame_ms
+            self._since_partial_ms += frame_ms
+            if self._silence_ms >= self.config.pause_ms:
+                self._finalize_segment()
+        else:
+            self._pre_roll.append(frame)
+
+        if self._in_speech:
+            segment_seconds = self._segment_samples / TARGET_SAMPLE_RATE
+            if segment_seconds >= self.config.max_segment_seconds:
+                self._finalize_segment()
+
+    # ------------------------------------------------------------------
+    # 공개 API
+    # ------------------------------------------------------------------
+    def feed(self, data: bytes) -> List[Dict]:
+        """오디오 프레임 입력 후 준비된 이벤트 반환 (논블로킹)"""
+        samples = np.concatenate([self._residual, self._decode(data)])
+        n_frames = len(samples) // self._frame_size
+        for i in range(n_frames):
+            self._process_frame(samples[i * self._frame_size:(i + 1) * self._frame_size])
+        self._residual = samples[n_frames * self._frame_size:]
+        return self.poll()
+
+    def poll(self, wait: bool = False) -> List[Dict]:
+        """완료된 partial/final 이벤트 수집"""
+        events = []
+
+        while self._finals and (wait or self._finals[0]['future'].done()):
+            item = self._finals.popleft()
+            try:
+                text = (item['future'].result() or '').strip()
+            except Exception as e:
+                logger.error(f"스트리밍 STT 확정 인식 오류: {e}")
+                text = ''
+            if text:
+                events.append({'type': 'final', 'segment_id': item['segment_id'],
+                               'start': item['start'], 'end': item['end'], 'text': text})
+
+        partial = self._partial
+        if partial is not None and partial.done():
+            self._partial = None
+            # 이미 확정된 세그먼트의 중간 결과는 버림
+            if self._partial_segment_id == self._segment_id:
+                try:
+                    text = (partial.result() or '').strip()
+                except Exception as e:
+                    logger.warning(f"스트리밍 STT 중간 인식 오류: {e}")
+                    text = ''
+                if text:
+                    events.append({'type': 'partial', 'segment_id': self._segment_id, 'text': text})
+
+        return events
+
+    def finish(self) -> List[Dict]:
+        """스트림 종료: 남은 음성을 확정하고 모든 결과를 기다려 반환"""
+        if self._closed:
+            return []
+        self._closed = True
+        if self._in_speech:
+            self._finalize_segment()
+        self._partial = None
+        events = self.poll(wait=True)
+        self.transcriber.close_session()
+        return events
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+EX-GPT STT 엔진 레지스트리
+- 엔진별 특성 선언 (오프라인 여부, 디바이스, 최대 처리 길이)
+- 오디오 길이와 엔진별 대기열 깊이, 실측 RTF(real-time factor)로 엔진 선택
+- 실패 시 다음 엔진으로 자동 전환 (기본적으로 오프라인 엔진만 사용)
+"""
+
+import json
+import logging
+import subprocess
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from audio.model_loader import LazyModel
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class STTSegment:
+    """타임스탬프가 있는 인식 구간"""
+    start: float
+    end: float
+    text: str
+
+
+@dataclass
+class STTResult:
+    """STT 결과"""
+    text: str
+    engine: str
+    audio_seconds: float
+    elapsed_seconds: float
+    segments: List[STTSegment] = field(default_factory=list)
+    # 결과를 만든 엔진+모델 식별자 (전사 캐시 키에 사용, 라우터가 채움)
+    model: str = ''
+
+    @property
+    def rtf(self) -> float:
+        return self.elapsed_seconds / self.audio_seconds if self.audio_seconds > 0 else 0.0
+
+
+def probe_duration(audio_path: str) -> Optional[float]:
+    """오디오 길이(초) - 헤더만 읽음, 알 수 없으면 None
+
+    soundfile/wave로 읽지 못하는 형식(m4a, mp3 등)은 ffprobe로 확인합니다.
+    """
+    try:
+        import soundfile as sf
+        return float(sf.info(audio_path).duration)
+    except Exception:
+        pass
+    try:
+        import wave
+        with wave.open(audio_path, 'rb') as wav:
+            return wav.getnframes() / float(wav.getframerate())
+    except Exception:
+        pass
+    try:
+        output = subprocess.run(
+            ['ffprobe', '-v', 'error', '-show_entries', 'format=duration', '-of', 'json', audio_path],
+            capture_output=True, timeout=30, check=True
+        ).stdout
+        return float(json.loads(output)['format']['duration'])
+    except Exception as e:
+        logger.warning(f"⚠️ 오디오 길이 확인 실패 ({audio_path}): {e}")
+        return None
+
+
+class STTEngine(ABC):
+    """STT 엔진 기본 클래스
+
+    하위 클래스는 ``name``, 특성값과 ``transcribe``를 정의합니다.
+    ``expected_rtf``는 실측값이 쌓이기 전 선택에 사용하는 초기 추정치입니다.
+    """
+
+    name = 'base'
+    offline = True
+    device = 'cpu'
+    max_duration: Optional[float] = None
+    expected_rtf = 1.0
+
+    def is_available(self) -> bool:
+        return True
+
+    @property
+    def cache_name(self) -> str:
+        """같은 오디오라도 엔진·모델이 다르면 결과가 다르므로 캐시를 구분하는 이름"""
+        return self.name
+
+    @abstractmethod
+    def transcribe(self, audio_path: str, duration: Optional[float]) -> STTResult:
+        """오디오 인식 (duration은 길이를 알 수 없으면 None)"""
+
+
+class FasterWhisperEngine(STTEngine):
+    """faster-whisper (CTranslate2) 엔진 - 긴 오디오, 타임스탬프 지원"""
+
+    name = 'faster-whisper'
+    expected_rtf = 0.15
+
+    def __init__(self, model: LazyModel, device: str = 'cpu', options: Optional[Dict] = None,
+                 model_size: str = ''):
+        self.model = model
+        self.device = device
+        self.options = options or {}
+        self.model_size = model_size
+        if device == 'cpu':
+            self.expected_rtf = 0.5
+
+    @property
+    def cache_name(self) -> str:
+        return f"{self.name}:{self.model_size}"
+
+    def transcribe(self, audio_path: str, duration: Optional[float]) -> STTResult:
+        started = time.time()
+        with self.model.use() as model:
+            segments, info = model.transcribe(audio_path, **self.options)
+            # 세그먼트는 제너레이터이므로 모델 사용 구간 안에서 소비
+            parsed = [STTSegment(round(s.start, 2), round(s.end, 2), s.text.strip()) for s in segments]
+
+        return STTResult(
+            text=" ".join(s.text for s in parsed if s.text).strip(),
+            engine=self.name,
+            audio_seconds=duration or getattr(info, 'duration', 0.0),
+            elapsed_seconds=time.time() - started,
+            segments=parsed
+        )
+
+
+class TransformersWhisperEngine(STTEngine):
+    """Hugging Face Transformers Whisper 엔진 - 30초 이하 짧은 오디오용"""
+
+    name = 'transformers-whisper'
+    max_duration = 30.0
+    expected_rtf = 0.3
+
+    def __init__(self, model_id: str = 'openai/whisper-medium', device: str = 'cpu',
+                 idle_timeout: float = 900.0):
+        self.model_id = model_id
+        self.device = device
+        self.model = LazyModel(self.name, self._load, idle_timeout=idle_timeout)
+        if device == 'cpu':
+            self.expected_rtf = 1.0
+
+    @property
+    def cache_name(self) -> str:
+        return f"{self.name}:{self.model_id}"
+
+    def _load(self):
+        from transformers import WhisperForConditionalGeneration, WhisperProcessor
+        processor = WhisperProcessor.from_pretrained(self.model_id)
+        model = WhisperForConditionalGeneration.from_pretrained(self.model_id).to(self.device)
+        model.eval()
+        return processor, model
+
+    def transcribe(self, audio_path: str, duration: Optional[float]) -> STTResult:
+        import librosa
+        import torch
+
+        started = time.time()
+        audio, _ = librosa.load(audio_path, sr=16000)
+
+        with self.model.use() as (processor, model):
+            input_features = processor(audio, sampling_rate=16000, return_tensors="pt").input_features
+            input_features = input_features.to(self.device)
+            forced_decoder_ids = processor.get_decoder_prompt_ids(language="korean", task="transcribe")
+
+            with torch.no_grad():
+                predicted_ids = model.generate(
+                    input_features,
+                    forced_decoder_ids=forced_decoder_ids,
+                    max_length=448,
+                    do_sample=False
+                )
+            text = processor.batch_decode(predicted_ids, skip_special_tokens=True)[0].strip()
+
+        audio_seconds = duration or len(audio) / 16000
+        return STTResult(
+            text=text,
+            engine=self.name,
+            audio_seconds=audio_seconds,
+            elapsed_seconds=time.time() - started,
+            segments=[STTSegment(0.0, round(audio_seconds, 2), text)] if text else []
+        )
+
+
+class SpeechRecognitionEngine(STTEngine):
+    """SpeechRecognition (Google 웹 API) - 온라인 전용, 기본 비활성"""
+
+    name = 'speech-recognition-google'
+    offline = False
+    max_duration = 60.0
+    expected_rtf = 0.5
+
+    def __init__(self):
+        import speech_recognition as sr
+        self._sr = sr
+        self.recognizer = sr.Recognizer()
+
+    def transcribe(self, audio_path: str, duration: Optional[float]) -> STTResult:
+        started = time.time()
+        with self._sr.AudioFile(audio_path) as source:
+            audio_data = self.recognizer.record(source)
+        text = self.recognizer.recognize_google(audio_data, language='ko-KR')
+
+        return STTResult(
+            text=text.strip(),
+            engine=self.name,
+            audio_seconds=duration,
+            elapsed_seconds=time.time() - started,
+            segments=[STTSegment(0.0, round(duration, 2), text.strip())] if text else []
+        )
+
+
+class STTRouter:
+    """지연 시간 기반 STT 엔진 선택 및 폴백
+
+    예상 완료 시간 = (대기열 깊이 + 1) × 오디오 길이 × 엔진 RTF
+    가 가장 작은 엔진부터 시도하고, 실패하면 다음 엔진으로 넘어갑니다.
+    """
+
+    def __init__(self, allow_online: bool = False, rtf_alpha: float = 0.3):
+        self.allow_online = allow_online
+        self.rtf_alpha = rtf_alpha
+        self.engines: Dict[str, STTEngine] = {}
+        self._stats: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def register(self, engine: STTEngine):
+        self.engines[engine.name] = engine
+        self._stats[engine.name] = {
+            'rtf': None, 'in_flight': 0, 'successes': 0, 'failures': 0, 'last_error': None
+        }
+        logger.info(f"🎤 STT 엔진 등록: {engine.name} (device={engine.device}, offline={engine.offline})")
+
+    def _estimated_seconds(self, engine: STTEngine, duration: Optional[float]) -> float:
+        stats = self._stats[engine.name]
+        rtf = stats['rtf'] if stats['rtf'] is not None else engine.expected_rtf
+        return (stats['in_flight'] + 1) * max(duration or 0.0, 1.0) * rtf
+
+    def candidates(self, duration: Optional[float]) -> List[STTEngine]:
+        """사용 가능한 엔진을 예상 완료 시간 순으로 반환
+
+        길이를 알 수 없으면(None) 최대 처리 길이가 있는 엔진은 제외합니다.
+        """
+        with self._lock:
+            eligible = [
+                engine for engine in self.engines.values()
+                if (engine.offline or self.allow_online)
+                and (engine.max_duration is None or (duration is not None and duration <= engine.max_duration))
+                and engine.is_available()
+            ]
+            return sorted(eligible, key=lambda engine: self._estimated_seconds(engine, duration))
+
+    def transcribe(self, audio_path: str, duration: Optional[float] = None) -> STTResult:
+        """최적 엔진으로 인식, 실패 시 다음 후보로 폴백"""
+        if duration is None:
+            duration = probe_duration(audio_path)
+
+        candidates = self.candidates(duration)
+        if not candidates:
+            length = f"{duration:.1f}초" if duration is not None else "길이를 알 수 없는"
+            raise RuntimeError(f"{length} 오디오를 처리할 수 있는 STT 엔진이 없습니다")
+
+        errors = []
+        for engine in candidates:
+            stats = self._stats[engine.name]
+            with self._lock:
+                stats['in_flight'] += 1
+            try:
+                result = engine.transcribe(audio_path, duration)
+                if not result.text:
+                    raise RuntimeError("빈 인식 결과")
+            except Exception as e:
+                logger.warning(f"⚠️ STT 엔진 {engine.name} 실패, 다음 엔진 시도: {e}")
+                errors.append(f"{engine.name}: {e}")
+                with self._lock:
+                    stats['failures'] += 1
+                    stats['last_error'] = str(e)
+                continue
+            finally:
+                with self._lock:
+                    stats['in_flight'] -= 1
+
+            result.model = result.model or engine.cache_name
+            with self._lock:
+                stats['successes'] += 1
+                if result.audio_seconds > 0:
+                    previous = stats['rtf']
+                    stats['rtf'] = result.rtf if previous is None else (
+                        self.rtf_alpha * result.rtf + (1 - self.rtf_alpha) * previous)
+
+            logger.info(f"✅ STT 완료 ({engine.name}): {result.audio_seconds:.1f}초 오디오, "
+                        f"RTF {result.rtf:.2f}")
+            return result
+
+        raise RuntimeError("모든 STT 엔진 실패 - " + "; ".join(errors))
+
+    def status(self) -> Dict:
+        with self._lock:
+            return {
+                name: {
+                    'device': engine.device,
+                    'offline': engine.offline,
+                    'max_duration': engine.max_duration,
+                    'enabled': engine.offline or self.allow_online,
+                    'rtf': round(self._stats[name]['rtf'], 3) if self._stats[name]['rtf'] is not None else None,
+                    'in_flight': self._stats[name]['in_flight'],
+                    'successes': self._stats[name]['successes'],
+                    'failures': self._stats[name]['failures'],
+                    'last_error': self._stats[name]['last_error']
+                }
+                for name, engine in self.engines.items()
+            }
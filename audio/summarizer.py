@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+EX-GPT 긴 전사문 계층 요약 (map-reduce)
+- 문장 경계 기준으로 토큰 예산에 맞게 청크 분할 (내용 기반 경계라 일부 수정 시 나머지 청크 유지)
+- 청크 요약을 스레드 풀로 동시 호출 (map)
+- 부분 요약이 예산을 넘으면 같은 방식으로 다시 묶어 요약 (reduce)
+- 청크별 요약 결과 LRU 캐시
+- 실패한 청크는 재시도하고, 그래도 실패하면 결과에 누락 청크 수를 표시 (partial)
+"""
+
+import contextvars
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MAP_PROMPT = """다음은 긴 음성 전사 내용의 일부입니다. 이 부분의 핵심 내용을 3문장 이내로 요약해주세요.
+중요한 수치, 이름, 결정 사항, 액션 아이템은 빠뜨리지 마세요.
+
+전사 일부:
+{text}
+
+요약:"""
+
+COMBINE_PROMPT = """다음은 긴 음성 전사를 구간별로 요약한 내용입니다. 중복을 제거하고 핵심만 남겨 하나로 합쳐주세요.
+
+구간별 요약:
+{text}
+
+통합 요약:"""
+
+_HANGUL = re.compile(r'[가-힣]')
+_SENTENCE_END = re.compile(r'(?<=[.!?。])\s+|\n+')
+
+
+def estimate_tokens(text: str) -> int:
+    """토큰 수 추정 (한글은 글자당 약 1토큰, 그 외는 약 4글자당 1토큰)"""
+    hangul = len(_HANGUL.findall(text))
+    return hangul + (len(text) - hangul + 3) // 4
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """추정 토큰 수가 max_tokens 이하가 되는 가장 긴 앞부분 (estimate_tokens와 같은 기준)"""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if estimate_tokens(text[:middle]) <= max_tokens:
+            low = middle
+        else:
+            high = middle - 1
+    return text[:low]
+
+
+def split_sentences(text: str) -> List[str]:
+    return [s.strip() for s in _SENTENCE_END.split(text) if s and s.strip()]
+
+
+def chunk_text(text: str, max_tokens: int, boundary_divisor: int = 4) -> List[str]:
+    """토큰 예산 기준 청크 분할
+
+    최소 크기(예산의 절반)를 넘긴 뒤에는 문장 해시로 경계를 정하므로,
+    앞부분이 수정되어도 뒤쪽 청크 경계가 다시 맞춰져 캐시를 재사용할 수 있습니다.
+    """
+    min_tokens = max_tokens // 2
+    chunks: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+
+    for sentence in split_sentences(text):
+        tokens = estimate_tokens(sentence)
+        if current and current_tokens + tokens > max_tokens:
+            chunks.append(" ".join(current))
+            current, current_tokens = [], 0
+
+        if tokens > max_tokens:
+            # 문장 하나가 예산보다 길면 글자 단위로 자름
+            step = max(1, len(sentence) * max_tokens // tokens)
+            chunks.extend(sentence[i:i + step] for i in range(0, len(sentence), step))
+            continue
+
+        current.append(sentence)
+        current_tokens += tokens
+        digest = hashlib.md5(sentence.encode('utf-8')).digest()
+        if current_tokens >= min_tokens and digest[0] % boundary_divisor == 0:
+            chunks.append(" ".join(current))
+            current, current_tokens = [], 0
+
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+@dataclass
+class SummaryResult:
+    """요약 결과 (failed_chunks > 0이면 전사 일부가 요약에서 빠짐)"""
+    text: str
+    chunks: int = 0
+    failed_chunks: int = 0
+
+    @property
+    def partial(self) -> bool:
+        return self.failed_chunks > 0
+
+    def info(self) -> Dict:
+        return {'partial': self.partial, 'chunks': self.chunks, 'failed_chunks': self.failed_chunks}
+
+
+class MapReduceSummarizer:
+    """LLM 호출 함수를 감싼 계층 요약기
+
+    사용 예:
+        summarizer = MapReduceSummarizer(query_ollama_fast, max_chunk_tokens=600)
+        result = summarizer.summarize(transcript, final_prompt="...{text}...")
+        result.text, result.partial
+    """
+
+    def __init__(self, llm_fn: Callable[[str], Optional[str]], max_chunk_tokens: int = 600,
+                 max_workers: int = 4, cache_size: int = 1024, namespace: str = '',
+                 cache_observer: Optional[Callable[[bool], None]] = None,
+                 chunk_retries: int = 2, retry_delay: float = 0.5):
+        self.llm_fn = llm_fn
+        self.max_chunk_tokens = max_chunk_tokens
+        self.chunk_retries = chunk_retries
+        self.retry_delay = retry_delay
+        self.max_workers = max_workers
+        self.cache_size = cache_size
+        self.namespace = namespace
+        self.cache_observer = cache_observer
+
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='summarize')
+        self.cache_hits = 0
+        self.llm_calls = 0
+
+    def _cache_key(self, prompt_template: str, chunk: str) -> str:
+        raw = f"{self.namespace}\0{prompt_template}\0{chunk}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _call_llm(self, prompt: str, label: str) -> Optional[str]:
+        """LLM 호출 (빈 응답이나 예외는 chunk_retries회까지 재시도)"""
+        for attempt in range(self.chunk_retries + 1):
+            if attempt:
+                time.sleep(self.retry_delay * attempt)
+            with self._lock:
+                self.llm_calls += 1
+            try:
+                result = self.llm_fn(prompt)
+            except Exception as e:
+                logger.warning(f"{label} 오류 ({attempt + 1}/{self.chunk_retries + 1}회): {e}")
+                result = None
+            if result:
+                return result
+        return None
+
+    def _summarize_chunk(self, prompt_template: str, chunk: str) -> Optional[str]:
+        key = self._cache_key(prompt_template, chunk)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+        if self.cache_observer:
+            self.cache_observer(cached is not None)
+        if cached is not None:
+            return cached
+
+        result = self._call_llm(prompt_template.format(text=chunk), '청크 요약')
+        if not result:
+            return None
+
+        with self._lock:
+            self._cache[key] = result
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+    def _map(self, prompt_template: str, chunks: List[str]) -> Tuple[List[str], int]:
+        """청크별 요약 (부분 요약 목록, 재시도 후에도 실패한 청크 수)"""
+        # 호출 스레드의 컨텍스트(요청 추적 등)를 작업마다 복사해 전달
+        context = contextvars.copy_context()
+        results = list(self._executor.map(
+            lambda c: context.copy().run(self._summarize_chunk, prompt_template, c), chunks))
+        failed = sum(1 for r in results if not r)
+        if failed:
+            logger.warning(f"⚠️ 청크 요약 {failed}/{len(chunks)}개 실패 - 해당 구간은 요약에서 빠짐")
+        return [r for r in results if r], failed
+
+    def reduce_to_budget(self, text: str, max_rounds: int = 4) -> Optional[SummaryResult]:
+        """텍스트를 청크 예산 이하가 될 때까지 map-reduce로 압축"""
+        prompt = MAP_PROMPT
+        result = SummaryResult(text)
+        for round_no in range(max_rounds):
+            if estimate_tokens(result.text) <= self.max_chunk_tokens:
+                return result
+            chunks = chunk_text(result.text, self.max_chunk_tokens)
+            partials, failed = self._map(prompt, chunks)
+            if not partials:
+                return None
+            logger.info(f"📚 요약 {round_no + 1}단계: {len(chunks)}개 청크 → {len(partials)}개 부분 요약")
+            result.text = "\n".join(partials)
+            result.chunks += len(chunks)
+            result.failed_chunks += failed
+            prompt = COMBINE_PROMPT
+        # 라운드 한도 초과 시 토큰 예산만큼 자름
+        result.text = truncate_to_tokens(result.text, self.max_chunk_tokens)
+        return result
+
+    def summarize(self, text: str, final_prompt: str) -> Optional[SummaryResult]:
+        """final_prompt의 {text} 자리에 (필요하면 압축된) 전사문을 넣어 최종 호출"""
+        condensed = self.reduce_to_budget(text)
+        if not condensed or not condensed.text:
+            return None
+        summary = self._call_llm(final_prompt.format(text=condensed.text), '최종 요약')
+        if not summary:
+            return None
+        condensed.text = summary
+        return condensed
+
+    def stats(self):
+        with self._lock:
+            return {
+                'cached_chunks': len(self._cache),
+                'cache_hits': self.cache_hits,
+                'llm_calls': self.llm_calls
+            }
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+EX-GPT 전사 결과 캐시
+- 오디오 내용 해시 + 모델 + 인식 옵션으로 키 생성 (content-addressed)
+- 디스크 저장, 전체 크기 제한 초과 시 오래 사용하지 않은 항목부터 제거
+- 같은 녹음으로 transcribe → summarize → analyze 시 STT 재실행 방지
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TranscriptCache:
+    """디스크 기반 전사 결과 캐시 (LRU 크기 제한)"""
+
+    def __init__(self, cache_dir: str = 'data/transcript_cache', max_bytes: int = 1024 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._total_bytes = sum(
+            entry.stat().st_size for entry in os.scandir(cache_dir)
+            if entry.name.endswith('.json')
+        )
+
+    @staticmethod
+    def audio_digest(audio_path: str, buffer_size: int = 1024 * 1024) -> str:
+        """오디오 파일 원본 바이트의 SHA-256"""
+        digest = hashlib.sha256()
+        with open(audio_path, 'rb') as f:
+            for block in iter(lambda: f.read(buffer_size), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    @staticmethod
+    def make_key(audio_digest: str, model: str, options: Optional[Dict] = None) -> str:
+        """오디오 해시 + 모델 + 옵션으로 캐시 키 생성"""
+        material = json.dumps(
+            {'audio': audio_digest, 'model': model, 'options': options or {}},
+            sort_keys=True, ensure_ascii=False, default=str
+        )
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Dict]:
+        """캐시 조회 (적중 시 최근 사용 시각 갱신)"""
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            os.utime(path, None)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return entry
+
+    def put(self, key: str, text: str, metadata: Optional[Dict] = None):
+        """전사 결과 저장 (원자적 교체)"""
+        entry = {'text': text, 'created_at': time.time(), **(metadata or {})}
+        data = json.dumps(entry, ensure_ascii=False).encode('utf-8')
+        path = self._path(key)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+
+        try:
+            previous = os.path.getsize(path) if os.path.exists(path) else 0
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f"전사 캐시 저장 실패: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return
+
+        with self._lock:
+            self._total_bytes += len(data) - previous
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """최근 사용 시각이 오래된 항목부터 제거 (락 보유 상태에서 호출)"""
+        entries = sorted(
+            (entry for entry in os.scandir(self.cache_dir) if entry.name.endswith('.json')),
+            key=lambda entry: entry.stat().st_mtime
+        )
+        target = int(self.max_bytes * 0.9)
+        removed = 0
+
+        for entry in entries:
+            if self._total_bytes <= target:
+                break
+            try:
+                size = entry.stat().st_size
+                os.remove(entry.path)
+                self._total_bytes -= size
+                removed += 1
+            except OSError:
+                continue
+
+        logger.info(f"🧹 전사 캐시 정리: {removed}개 항목 제거")
+
+    def stats(self) -> Dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total, 3) if total else 0.0,
+                'size_mb': round(self._total_bytes / 1024 ** 2, 2),
+                'max_mb': round(self.max_bytes / 1024 ** 2, 2)
+            }
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+EX-GPT 음성 구간 검출 (VAD)
+- 프레임 에너지 기반, 노이즈 바닥 자동 추적
+- 스트리밍(프레임 단위)과 전체 신호 분할 모두 지원
+"""
+
+from typing import List, Tuple
+
+import numpy as np
+
+
+class EnergyVAD:
+    """적응형 에너지 기반 VAD
+
+    노이즈 바닥(noise floor)을 조용한 프레임으로 추적하고, 그보다
+    ``margin_db`` 이상 큰 프레임을 음성으로 판단합니다.
+    """
+
+    def __init__(self, sr: int = 16000, frame_ms: int = 30, margin_db: float = 10.0,
+                 min_energy_db: float = -55.0, floor_adapt: float = 0.005):
+        self.sr = sr
+        self.frame_ms = frame_ms
+        self.frame_size = int(sr * frame_ms / 1000)
+        self.margin_db = margin_db
+        self.min_energy_db = min_energy_db
+        self.floor_adapt = floor_adapt
+        self.noise_floor_db = None
+
+    @staticmethod
+    def frame_energy_db(frame: np.ndarray) -> float:
+        rms = float(np.sqrt(np.mean(np.square(frame, dtype=np.float64)))) if len(frame) else 0.0
+        return 20 * np.log10(rms + 1e-10)
+
+    def is_speech(self, frame: np.ndarray) -> bool:
+        """프레임 하나의 음성 여부 판단 (노이즈 바닥 갱신 포함)"""
+        energy_db = self.frame_energy_db(frame)
+
+        if self.noise_floor_db is None:
+            self.noise_floor_db = energy_db
+        elif energy_db < self.noise_floor_db:
+            # 더 조용한 프레임이면 바로 내려감
+            self.noise_floor_db = energy_db
+        else:
+            # 올라가는 방향은 천천히 (음성에 끌려가지 않도록)
+            self.noise_floor_db += self.floor_adapt * (energy_db - self.noise_floor_db)
+
+        return energy_db > max(self.noise_floor_db + self.margin_db, self.min_energy_db)
+
+
+def detect_speech_segments(samples: np.ndarray, sr: int = 16000, frame_ms: int = 30,
+                           min_silence_ms: int = 500, min_speech_ms: int = 250,
+                           pad_ms: int = 100) -> List[Tuple[float, float]]:
+    """전체 신호에서 음성 구간 목록 (시작초, 끝초) 반환"""
+    samples = np.asarray(samples, dtype=np.float32).reshape(-1)
+    frame_size = int(sr * frame_ms / 1000)
+    n_frames = len(samples) // frame_size
+    if n_frames == 0:
+        return []
+
+    frames = samples[:n_frames * frame_size].reshape(n_frames, frame_size)
+    energy_db = 20 * np.log10(np.sqrt(np.mean(np.square(frames, dtype=np.float64), axis=1)) + 1e-10)
+
+    # 하위 10% 에너지를 노이즈 바닥으로 사용
+    noise_floor = np.percentile(energy_db, 10)
+    speech = energy_db > max(noise_floor + 10.0, -55.0)
+
+    segments = []
+    start = None
+    silence = 0
+    min_silence_frames = max(1, min_silence_ms // frame_ms)
+
+    for i, is_speech in enumerate(speech):
+        if is_speech:
+            if start is None:
+                start = i
+            silence = 0
+        elif start is not None:
+            silence += 1
+            if silence >= min_silence_frames:
+                segments.append((start, i - silence + 1))
+                start, silence = None, 0
+    if start is not None:
+        segments.append((start, n_frames - silence))
+
+    frame_sec = frame_ms / 1000
+    pad = pad_ms / 1000
+    duration = len(samples) / sr
+    return [
+        (max(0.0, s * frame_sec - pad), min(duration, e * frame_sec + pad))
+        for s, e in segments
+        if (e - s) * frame_ms >= min_speech_ms
+    ]
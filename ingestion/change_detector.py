@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+EX-GPT 파일 변경 감지
+- 먼저 stat(크기, mtime_ns, inode)만 비교하고, 다를 때만 내용 해시 계산
+- 해시는 큰 버퍼(readinto) 또는 큰 파일은 mmap으로 한 번만 계산해 파이프라인 전체에서 재사용
+- 내용은 같고 stat만 바뀐 경우(복사, touch)는 변경 없음으로 보고 서명만 갱신
+"""
+
+import hashlib
+import mmap
+import os
+from typing import Dict, Optional
+
+HASH_BUFFER_SIZE = 1024 * 1024
+MMAP_THRESHOLD = 64 * 1024 * 1024
+
+
+def hash_file(file_path: str, buffer_size: int = HASH_BUFFER_SIZE, mmap_threshold: int = MMAP_THRESHOLD) -> str:
+    """파일 MD5 (기존 메타데이터의 해시와 호환)"""
+    h = hashlib.md5()
+    with open(file_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size >= mmap_threshold:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                h.update(mapped)
+            return h.hexdigest()
+
+        buffer = bytearray(buffer_size)
+        view = memoryview(buffer)
+        while True:
+            read = f.readinto(buffer)
+            if not read:
+                break
+            h.update(view[:read])
+    return h.hexdigest()
+
+
+class FileCheck:
+    """파일 하나의 변경 판정 결과"""
+
+    __slots__ = ('path', 'changed', 'file_hash', 'size', 'mtime_ns', 'inode', 'hashed', 'signature_changed')
+
+    def __init__(self, path: str, changed: bool, file_hash: Optional[str], stat: os.stat_result,
+                 hashed: bool, signature_changed: bool):
+        self.path = path
+        self.changed = changed
+        self.file_hash = file_hash
+        self.size = stat.st_size
+        self.mtime_ns = stat.st_mtime_ns
+        self.inode = stat.st_ino
+        # 이번 판정에서 내용 해시를 계산했는지
+        self.hashed = hashed
+        # 내용은 같지만 stat 서명만 바뀌어 메타데이터 갱신이 필요한지
+        self.signature_changed = signature_changed
+
+    def signature(self) -> Dict[str, int]:
+        return {'file_size': self.size, 'mtime_ns': self.mtime_ns, 'inode': self.inode}
+
+
+def check_file(file_path: str, record: Optional[Dict], force_hash: bool = False) -> FileCheck:
+    """저장된 메타데이터(record)와 비교한 변경 여부
+
+    record는 {'hash', 'file_size', 'mtime_ns', 'inode'} 형식이며 없으면 새 파일입니다.
+    """
+    stat = os.stat(file_path)
+    if record and not force_hash and record.get('hash') and \
+            record.get('file_size') == stat.st_size and \
+            record.get('mtime_ns') == stat.st_mtime_ns and \
+            record.get('inode') == stat.st_ino:
+        return FileCheck(file_path, False, record['hash'], stat, hashed=False, signature_changed=False)
+
+    file_hash = hash_file(file_path)
+    if record and record.get('hash') == file_hash:
+        return FileCheck(file_path, False, file_hash, stat, hashed=True, signature_changed=True)
+    return FileCheck(file_path, True, file_hash, stat, hashed=True, signature_changed=False)
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+EX-GPT 수집용 임베딩 배처
+- 여러 파일의 청크를 모아 고정 크기 배치로 임베딩 (작은 파일도 배치를 꽉 채움)
+- 일정 개수(window)를 모은 뒤 길이순 정렬해 배치를 구성 → 패딩 최소화
+- 결과 벡터를 원래 파일·순서로 되돌려 파일 단위로 완료 통지 (임베딩 실패 시 해당 파일만 실패)
+- 한 번의 임베딩 호출은 항상 batch_size 이하라 파일 크기와 무관하게 메모리 상한 유지
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (owner, 벡터 목록 또는 None, 실패 시 예외)
+Completed = List[Tuple[Any, Optional[List[List[float]]], Optional[Exception]]]
+
+
+class _Owner:
+    __slots__ = ('owner', 'vectors', 'remaining')
+
+    def __init__(self, owner: Any, size: int):
+        self.owner = owner
+        self.vectors: List[Optional[List[float]]] = [None] * size
+        self.remaining = size
+
+
+class EmbeddingBatcher:
+    """파일 간 임베딩 배치 구성기
+
+    사용 예:
+        batcher = EmbeddingBatcher(model.embed_texts, batch_size=64)
+        for owner, vectors, error in batcher.add(job, texts):
+            ...  # 모든 청크 임베딩이 끝난(또는 실패한) 파일
+        for owner, vectors, error in batcher.flush():
+            ...
+    """
+
+    def __init__(self, embed_fn: Callable[[List[str]], List[List[float]]], batch_size: int = 64,
+                 window_batches: int = 8):
+        self.embed_fn = embed_fn
+        self.batch_size = max(1, batch_size)
+        self.window = self.batch_size * max(1, window_batches)
+
+        self._pending: List[Tuple[int, int, str]] = []
+        self._owners: Dict[int, _Owner] = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+        self.batches = 0
+        self.chunks = 0
+        self.busy_seconds = 0.0
+        self._text_chars = 0
+        self._padded_chars = 0
+
+    @property
+    def pending_chunks(self) -> int:
+        return len(self._pending)
+
+    @property
+    def pending_owners(self) -> int:
+        return len(self._owners)
+
+    def add(self, owner: Any, texts: List[str]) -> Completed:
+        """파일 하나의 청크 추가 → 처리가 끝난 (owner, vectors, error) 목록"""
+        with self._lock:
+            owner_id = self._next_id
+            self._next_id += 1
+            if not texts:
+                return [(owner, [], None)]
+            self._owners[owner_id] = _Owner(owner, len(texts))
+            self._pending.extend((owner_id, i, text) for i, text in enumerate(texts))
+
+            completed = []
+            while len(self._pending) >= self.window:
+                completed.extend(self._drain(full_batches_only=True))
+            return completed
+
+    def flush(self) -> Completed:
+        """남은 청크를 모두 임베딩 (입력이 끊겼거나 끝났을 때)"""
+        with self._lock:
+            return self._drain(full_batches_only=False)
+
+    def _drain(self, full_batches_only: bool) -> Completed:
+        if not self._pending:
+            return []
+        # 길이순 정렬 후 연속 구간을 배치로 → 배치 내 길이가 비슷해 패딩이 적음
+        items = sorted(self._pending, key=lambda item: len(item[2]))
+        cut = len(items) - len(items) % self.batch_size if full_batches_only else len(items)
+        if cut == 0:
+            return []
+        self._pending = items[cut:]
+
+        completed = []
+        for start in range(0, cut, self.batch_size):
+            # 앞선 배치에서 실패한 파일의 청크는 제외
+            batch = [item for item in items[start:start + self.batch_size] if item[0] in self._owners]
+            if not batch:
+                continue
+            try:
+                vectors = self._embed([text for _, _, text in batch])
+            except Exception as e:
+                logger.error(f"❌ 임베딩 배치 실패 ({len(batch)}개 청크): {e}")
+                failed = {owner_id for owner_id, _, _ in batch}
+                self._pending = [item for item in self._pending if item[0] not in failed]
+                for owner_id in failed:
+                    completed.append((self._owners.pop(owner_id).owner, None, e))
+                continue
+
+            for (owner_id, index, _), vector in zip(batch, vectors):
+                entry = self._owners[owner_id]
+                entry.vectors[index] = vector
+                entry.remaining -= 1
+                if entry.remaining == 0:
+                    del self._owners[owner_id]
+                    completed.append((entry.owner, entry.vectors, None))
+        return completed
+
+    def _embed(self, texts: List[str]) -> List[List[float]]:
+        started = time.monotonic()
+        vectors = self.embed_fn(texts)
+        self.busy_seconds += time.monotonic() - started
+        self.batches += 1
+        self.chunks += len(texts)
+        lengths = [len(text) for text in texts]
+        self._text_chars += sum(lengths)
+        self._padded_chars += max(lengths) * len(lengths)
+        return vectors
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'batches': self.batches,
+            'chunks': self.chunks,
+            'avg_batch_size': round(self.chunks / self.batches, 1) if self.batches else 0.0,
+            # 배치 내 최장 길이 기준 패딩 대비 실제 텍스트 비율 (글자 수 근사, 1.0이 최적)
+            'padding_efficiency': round(self._text_chars / self._padded_chars, 3) if self._padded_chars else 1.0,
+            'busy_seconds': round(self.busy_seconds, 3)
+        }
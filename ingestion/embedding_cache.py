@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+EX-GPT 임베딩 디스크 캐시
+- (모델 이름 + 청크 텍스트) 해시 → float32 벡터
+- 벡터는 고정 크기 memmap 배열 파일에, 키 → 슬롯 색인은 JSON으로 저장
+- 슬롯마다 키를 함께 기록하고 조회 시 확인 (색인이 어긋나도 다른 텍스트의 벡터를 반환하지 않음)
+- 용량을 넘으면 가장 오래 사용하지 않은 슬롯을 재사용 (LRU)
+- 디렉토리당 한 프로세스만 기록 (fcntl 잠금), 나머지 프로세스는 읽기 전용으로 사용
+- 파일 간 공통 문단, 재수집(force_update) 시 임베딩 재계산을 피함
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 2
+KEY_BYTES = 16
+EMPTY_KEY = np.void(bytes(KEY_BYTES))
+
+
+class EmbeddingCache:
+    """memmap 기반 임베딩 캐시
+
+    사용 예:
+        cache = EmbeddingCache('data/embedding_cache', dim=384, model_name='paraphrase-multilingual-MiniLM-L12-v2')
+        vectors = cache.get_many(texts)          # 없는 항목은 None
+        cache.put_many(missing_texts, new_vectors)
+        cache.flush()
+
+    같은 디렉토리를 다른 프로세스가 이미 쓰고 있으면 read_only로 열려
+    조회만 하고 저장은 건너뜁니다.
+    """
+
+    def __init__(self, directory: str, dim: int, model_name: str, capacity: int = 200000,
+                 flush_every: int = 5000):
+        self.directory = directory
+        self.dim = dim
+        self.model_name = model_name
+        self.capacity = max(1, capacity)
+        self.flush_every = flush_every
+        os.makedirs(directory, exist_ok=True)
+
+        self.vectors_path = os.path.join(directory, 'vectors.f32')
+        self.index_path = os.path.join(directory, 'index.json')
+        self.read_only = False
+        self._lock_file = None
+        self._rows = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._index: "OrderedDict[str, int]" = OrderedDict()  # 오래된 사용 → 최근 사용 순
+        self._free: List[int] = []
+        self._dirty = 0
+
+        self.hits = 0
+        self.misses = 0
+        self._acquire_directory()
+        self._open()
+
+    # ---- 저장 파일 ----
+    def _acquire_directory(self):
+        """디렉토리 배타 잠금 (다른 프로세스가 잡고 있으면 읽기 전용)"""
+        if fcntl is None:
+            logger.warning("⚠️ fcntl 사용 불가 - 임베딩 캐시 디렉토리를 한 프로세스만 사용하도록 설정하세요")
+            return
+        self._lock_file = open(os.path.join(self.directory, 'cache.lock'), 'a+')
+        try:
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            self._lock_file.close()
+            self._lock_file = None
+            self.read_only = True
+            logger.info(f"🗃️ 임베딩 캐시를 다른 프로세스가 사용 중 - 읽기 전용으로 엽니다 ({self.directory})")
+
+    def _row_dtype(self) -> np.dtype:
+        # 슬롯 = (키, 벡터) - 키와 벡터가 같은 행에 있어 슬롯 재사용 중 중단되어도 확인 가능
+        return np.dtype([('key', f'V{KEY_BYTES}'), ('vector', '<f4', (self.dim,))])
+
+    def _open(self):
+        header = None
+        if os.path.exists(self.index_path) and os.path.exists(self.vectors_path):
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    header = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"임베딩 캐시 색인 로드 실패, 초기화: {e}")
+
+        expected = {'version': INDEX_VERSION, 'model': self.model_name, 'dim': self.dim, 'capacity': self.capacity}
+        if header and all(header.get(key) == value for key, value in expected.items()):
+            self._rows = np.memmap(self.vectors_path, dtype=self._row_dtype(), mode='r' if self.read_only else 'r+',
+                                   shape=(self.capacity,))
+            # 마지막 flush 이후 재사용된 슬롯(비정상 종료)은 키가 달라 제외
+            self._index = OrderedDict((key, slot) for key, slot in header.get('entries', [])
+                                      if self._slot_holds(slot, key))
+        elif self.read_only:
+            # 기록 중인 프로세스의 파일은 건드리지 않음
+            self._index = OrderedDict()
+        else:
+            if header:
+                logger.info("임베딩 캐시 설정(모델/차원/용량/형식)이 바뀌어 새로 만듭니다")
+            self._rows = np.memmap(self.vectors_path, dtype=self._row_dtype(), mode='w+', shape=(self.capacity,))
+            self._index = OrderedDict()
+
+        used = set(self._index.values())
+        self._free = [slot for slot in range(self.capacity - 1, -1, -1) if slot not in used]
+        logger.info(f"🗃️ 임베딩 캐시: {len(self._index)}/{self.capacity}개 ({self.directory})")
+
+    def _slot_holds(self, slot: int, key: str) -> bool:
+        return 0 <= slot < self.capacity and self._rows['key'][slot].tobytes() == bytes.fromhex(key)
+
+    def flush(self):
+        """벡터와 색인을 디스크에 기록"""
+        if self.read_only:
+            return
+        with self._flush_lock:
+            self._flush()
+
+    def close(self):
+        """기록 후 디렉토리 잠금 해제"""
+        self.flush()
+        if self._lock_file is not None:
+            self._lock_file.close()  # 파일을 닫으면 flock도 해제
+            self._lock_file = None
+
+    def _flush(self):
+        with self._lock:
+            self._rows.flush()
+            payload = {
+                'version': INDEX_VERSION,
+                'model': self.model_name,
+                'dim': self.dim,
+                'capacity': self.capacity,
+                'entries': list(self._index.items())
+            }
+            self._dirty = 0
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f)
+        os.replace(tmp_path, self.index_path)
+
+    # ---- 조회 / 저장 ----
+    def key(self, text: str) -> str:
+        return hashlib.blake2b(f"{self.model_name}\0{text}".encode('utf-8'), digest_size=KEY_BYTES).hexdigest()
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        results: List[Optional[np.ndarray]] = []
+        with self._lock:
+            for text in texts:
+                key = self.key(text)
+                slot = self._index.get(key)
+                if slot is not None and not self._slot_holds(slot, key):
+                    # 읽기 전용으로 연 뒤 기록 프로세스가 슬롯을 재사용함
+                    del self._index[key]
+                    slot = None
+                if slot is None:
+                    self.misses += 1
+                    results.append(None)
+                else:
+                    self._index.move_to_end(key)
+                    self.hits += 1
+                    results.append(np.array(self._rows['vector'][slot]))
+        return results
+
+    def put_many(self, texts: Sequence[str], vectors) -> None:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.ndim != 2 or vectors.shape[1] != self.dim:
+            raise ValueError(f"벡터 차원 불일치: {vectors.shape}, 기대값 (n, {self.dim})")
+        if self.read_only:
+            return
+
+        with self._lock:
+            for text, vector in zip(texts, vectors):
+                key = self.key(text)
+                slot = self._index.get(key)
+                if slot is None:
+                    if self._free:
+                        slot = self._free.pop()
+                    else:
+                        # 가장 오래 사용하지 않은 항목의 슬롯 재사용
+                        _, slot = self._index.popitem(last=False)
+                self._index[key] = slot
+                self._index.move_to_end(key)
+                # 키를 비운 뒤 벡터를 쓰고 마지막에 키 기록 (도중에 중단되면 빈 슬롯으로 보임)
+                self._rows['key'][slot] = EMPTY_KEY
+                self._rows['vector'][slot] = vector
+                self._rows['key'][slot] = np.void(bytes.fromhex(key))
+                self._dirty += 1
+            should_flush = self._dirty >= self.flush_every
+        if should_flush:
+            self.flush()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'entries': len(self._index),
+                'capacity': self.capacity,
+                'read_only': self.read_only
+            }
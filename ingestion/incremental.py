@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+EX-GPT 청크 단위 증분 색인
+- 청크 내용 해시로 결정적 포인트 ID(uuid5) 생성 → 같은 청크는 항상 같은 ID (재실행해도 멱등)
+- 이전 색인의 포인트 ID와 비교해 새 청크만 임베딩·업서트, 사라진 청크만 삭제
+- 남은 청크는 위치 정보(페이지, 순번 등)만 갱신
+"""
+
+import hashlib
+import uuid
+from typing import Dict, Iterable, Iterator, List, Optional
+
+# 포인트 ID 네임스페이스 (변경하면 모든 문서가 재색인됨)
+POINT_NAMESPACE = uuid.UUID('8c0b5e4a-2f3d-5a61-b7e9-4d2c1a0f9e37')
+
+
+def chunk_hash(chunk: Dict) -> str:
+    """청크 내용 해시 (형식·시트가 다르면 다른 청크로 취급)"""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(str(chunk.get('type', '')).encode('utf-8'))
+    h.update(b'\0')
+    h.update(str(chunk.get('sheet') or '').encode('utf-8'))
+    h.update(b'\0')
+    h.update(chunk['content'].encode('utf-8'))
+    return h.hexdigest()
+
+
+def point_id(source_key: str, digest: str, occurrence: int) -> str:
+    return str(uuid.uuid5(POINT_NAMESPACE, f"{source_key}\0{digest}\0{occurrence}"))
+
+
+def assign_point_ids(source_key: str, chunks: List[Dict]) -> List[str]:
+    """청크별 결정적 포인트 ID (같은 파일 안의 동일 청크는 등장 순번으로 구분)"""
+    seen: Dict[str, int] = {}
+    ids = []
+    for chunk in chunks:
+        digest = chunk.get('hash') or chunk_hash(chunk)
+        occurrence = seen.get(digest, 0)
+        seen[digest] = occurrence + 1
+        ids.append(point_id(source_key, digest, occurrence))
+    return ids
+
+
+def batched(chunks: Iterable[Dict], size: int) -> Iterator[List[Dict]]:
+    """청크 스트림을 size개씩 묶음"""
+    batch = []
+    for chunk in chunks:
+        batch.append(chunk)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class ChunkPlan:
+    """파일 하나(또는 스트리밍 배치 하나)의 증분 갱신 계획
+
+    인덱스는 배치 안의 위치이고, 파일 안의 순번은 offset + 인덱스입니다.
+    """
+
+    __slots__ = ('point_ids', 'new_indices', 'kept_indices', 'removed_ids', 'full_replace', 'offset')
+
+    def __init__(self, point_ids: List[str], new_indices: List[int], kept_indices: List[int],
+                 removed_ids: List[str], full_replace: bool, offset: int = 0):
+        self.point_ids = point_ids
+        self.new_indices = new_indices
+        self.kept_indices = kept_indices
+        self.removed_ids = removed_ids
+        # 이전 색인이 결정적 ID를 쓰지 않았으면 (구버전 데이터) 파일 단위로 교체
+        self.full_replace = full_replace
+        self.offset = offset
+
+    @property
+    def unchanged(self) -> bool:
+        return not self.new_indices and not self.removed_ids and not self.full_replace
+
+    def digest(self) -> str:
+        """업서트할 포인트 ID 목록의 요약값 (업서트 체크포인트 키에 사용)
+
+        같은 파일 내용이라도 force_update 등으로 업서트 대상이 달라지면 값이 달라지므로,
+        이전 실행에서 완료한 배치 번호를 다른 포인트 목록에 잘못 적용하지 않습니다.
+        """
+        joined = '\n'.join(self.point_ids[i] for i in self.new_indices)
+        return hashlib.sha1(joined.encode('utf-8')).hexdigest()[:16]
+
+    def summary(self) -> Dict[str, int]:
+        return {
+            'chunks_added': len(self.new_indices),
+            'chunks_kept': len(self.kept_indices),
+            'chunks_removed': len(self.removed_ids)
+        }
+
+
+class StreamingPlanner:
+    """청크를 배치 단위로 받아 증분 계획 - 파일 전체 청크를 메모리에 두지 않음
+
+    파일 끝까지 유지하는 것은 포인트 ID와 청크 해시뿐입니다.
+
+    사용 예:
+        planner = StreamingPlanner('/docs/a.pdf', previous_ids)
+        for batch in batches:
+            plan = planner.add(batch)      # plan.new_indices만 임베딩
+        removed_ids = planner.finish()
+    """
+
+    def __init__(self, source_key: str, previous_ids: Optional[Iterable[str]], reembed: bool = False):
+        self.source_key = source_key
+        self.previous = None if previous_ids is None else set(previous_ids)
+        self.reembed = reembed
+        self.point_ids: List[str] = []
+        self.hashes: List[str] = []
+        self.added = 0
+        self.kept = 0
+        self._seen: Dict[str, int] = {}
+
+    @property
+    def full_replace(self) -> bool:
+        return self.previous is None
+
+    def add(self, chunks: List[Dict]) -> ChunkPlan:
+        offset = len(self.point_ids)
+        point_ids, new_indices, kept_indices = [], [], []
+        for i, chunk in enumerate(chunks):
+            digest = chunk.get('hash') or chunk_hash(chunk)
+            occurrence = self._seen.get(digest, 0)
+            self._seen[digest] = occurrence + 1
+            chunk_id = point_id(self.source_key, digest, occurrence)
+            point_ids.append(chunk_id)
+            self.hashes.append(digest)
+            if self.previous is None or self.reembed or chunk_id not in self.previous:
+                new_indices.append(i)
+            else:
+                kept_indices.append(i)
+        self.point_ids.extend(point_ids)
+        self.added += len(new_indices)
+        self.kept += len(kept_indices)
+        return ChunkPlan(point_ids, new_indices, kept_indices, [], self.full_replace, offset)
+
+    def finish(self) -> List[str]:
+        """이전 색인에만 있던(사라진) 포인트 ID"""
+        if self.previous is None:
+            return []
+        return sorted(self.previous - set(self.point_ids))
+
+
+def plan_update(source_key: str, chunks: List[Dict], previous_ids: Optional[Iterable[str]],
+                reembed: bool = False) -> ChunkPlan:
+    """새 청크 목록과 이전 포인트 ID 목록 비교
+
+    reembed면 모든 청크를 다시 임베딩하되(같은 ID로 덮어씀) 사라진 청크만 삭제합니다.
+    """
+    planner = StreamingPlanner(source_key, previous_ids, reembed)
+    plan = planner.add(chunks)
+    plan.removed_ids = planner.finish()
+    return plan
+
+
+def position_payload(chunk: Dict, index: int, total: Optional[int]) -> Dict:
+    """위치에 따라 바뀌는 페이로드 (내용이 같은 청크는 임베딩 없이 이 값만 갱신)
+
+    스트리밍 중에는 전체 청크 수를 모르므로 total이 None이고, 파일 끝에서 따로 채웁니다.
+    """
+    return {
+        'chunk_id': index,
+        'total_chunks': total,
+        'page': chunk.get('page'),
+        'paragraph': chunk.get('paragraph'),
+        'row': chunk.get('row')
+    }
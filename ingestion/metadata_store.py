@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+EX-GPT 지식 베이스 메타데이터 저장소 (SQLite, WAL)
+- 전체 경로 기준 파일 행 + 청크별(포인트 ID, 내용 해시) 행
+- 파일 하나의 갱신은 하나의 트랜잭션 안에서 처리, 여러 파일을 모아 한 번에 커밋
+  (batch_size개 또는 max_batch_seconds 경과 시 - 다른 프로세스의 쓰기를 오래 막지 않도록)
+- 기존 knowledge_metadata.json(파일명 기준)은 최초 한 번 가져오고,
+  같은 이름의 파일이 처음 다시 처리될 때 전체 경로 행으로 옮김
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    filename TEXT NOT NULL,
+    hash TEXT,
+    file_size INTEGER,
+    mtime_ns INTEGER,
+    inode INTEGER,
+    file_ext TEXT,
+    chunks INTEGER NOT NULL DEFAULT 0,
+    upload_time TEXT,
+    legacy INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_files_filename ON files (filename);
+
+CREATE TABLE IF NOT EXISTS chunks (
+    path TEXT NOT NULL,
+    chunk_index INTEGER NOT NULL,
+    point_id TEXT NOT NULL,
+    chunk_hash TEXT,
+    PRIMARY KEY (path, chunk_index)
+);
+
+CREATE TABLE IF NOT EXISTS store_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+FILE_COLUMNS = ('path', 'filename', 'hash', 'file_size', 'mtime_ns', 'inode', 'file_ext', 'chunks',
+                'upload_time', 'legacy')
+
+
+class MetadataStore:
+    """파일/청크 메타데이터 저장소
+
+    사용 예:
+        store = MetadataStore('data/knowledge_metadata.db')
+        store.migrate_from_json('knowledge_metadata.json')
+        record = store.get('/docs/규정.pdf')
+        store.put('/docs/규정.pdf', {...}, point_ids, chunk_hashes)
+        store.commit()
+    """
+
+    def __init__(self, db_path: str = 'data/knowledge_metadata.db', batch_size: int = 50,
+                 max_batch_seconds: float = 1.0):
+        self.db_path = db_path
+        self.batch_size = max(1, batch_size)
+        self.max_batch_seconds = max_batch_seconds
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._pending = 0
+        self._commit_timer: Optional[threading.Timer] = None
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(SCHEMA)
+
+    # ---- 트랜잭션 ----
+    def _begin_locked(self):
+        if not self._conn.in_transaction:
+            self._conn.execute('BEGIN IMMEDIATE')
+            # 쓰기 잠금을 잡은 뒤 쓰기가 더 없어도 max_batch_seconds 안에 커밋
+            self._commit_timer = threading.Timer(self.max_batch_seconds, self._commit_expired)
+            self._commit_timer.daemon = True
+            self._commit_timer.start()
+
+    def _commit_expired(self):
+        with self._lock:
+            try:
+                self._commit_locked()
+            except sqlite3.Error as e:
+                logger.warning(f"메타데이터 자동 커밋 실패: {e}")
+
+    def _wrote_locked(self):
+        self._pending += 1
+        if self._pending >= self.batch_size:
+            self._commit_locked()
+
+    def _commit_locked(self):
+        self._cancel_timer_locked()
+        if self._conn.in_transaction:
+            self._conn.execute('COMMIT')
+        self._pending = 0
+
+    def _cancel_timer_locked(self):
+        if self._commit_timer is not None:
+            self._commit_timer.cancel()
+            self._commit_timer = None
+
+    def commit(self):
+        """모아둔 변경 사항 커밋"""
+        with self._lock:
+            self._commit_locked()
+
+    def close(self):
+        with self._lock:
+            self._commit_locked()
+            self._conn.close()
+
+    # ---- 조회 ----
+    def _row_to_record(self, row) -> Dict:
+        record = dict(zip(FILE_COLUMNS, row))
+        record['legacy'] = bool(record['legacy'])
+        return record
+
+    def get(self, path: str, with_chunks: bool = True) -> Optional[Dict]:
+        """경로의 메타데이터 (없으면 같은 파일명의 이전 형식 행, 그것도 없으면 None)
+
+        with_chunks면 'point_ids'(청크 순서)를 포함합니다. 이전 형식 행은 포인트 ID가 없습니다.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(FILE_COLUMNS)} FROM files WHERE path = ?", (path,)).fetchone()
+            if row is None:
+                row = self._conn.execute(
+                    f"SELECT {', '.join(FILE_COLUMNS)} FROM files WHERE filename = ? AND legacy = 1",
+                    (os.path.basename(path),)).fetchone()
+            if row is None:
+                return None
+            record = self._row_to_record(row)
+            if with_chunks and not record['legacy']:
+                record['point_ids'] = [point_id for (point_id,) in self._conn.execute(
+                    "SELECT point_id FROM chunks WHERE path = ? ORDER BY chunk_index", (path,))]
+            return record
+
+    def __contains__(self, path: str) -> bool:
+        return self.get(path, with_chunks=False) is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    def paths(self, prefix: Optional[str] = None) -> List[str]:
+        """색인된 파일 경로 (prefix로 시작하는 것만, 이전 형식 행 제외)"""
+        with self._lock:
+            if prefix is None:
+                rows = self._conn.execute("SELECT path FROM files WHERE legacy = 0 ORDER BY path")
+            else:
+                rows = self._conn.execute(
+                    "SELECT path FROM files WHERE legacy = 0 AND substr(path, 1, ?) = ? ORDER BY path",
+                    (len(prefix), prefix))
+            return [path for (path,) in rows.fetchall()]
+
+    def all_files(self) -> Dict[str, Dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(FILE_COLUMNS)} FROM files ORDER BY path").fetchall()
+        return {row[0]: self._row_to_record(row) for row in rows}
+
+    # ---- 갱신 ----
+    def put(self, path: str, record: Dict, point_ids: List[str], chunk_hashes: Iterable[Optional[str]]):
+        """파일 행과 청크 행을 함께 교체 (같은 파일명의 이전 형식 행은 삭제)"""
+        filename = os.path.basename(path)
+        with self._lock:
+            self._begin_locked()
+            try:
+                self._conn.execute("DELETE FROM files WHERE filename = ? AND legacy = 1 AND path != ?",
+                                   (filename, path))
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO files (path, filename, hash, file_size, mtime_ns, inode, "
+                    "file_ext, chunks, upload_time, legacy) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 0)",
+                    (path, filename, record.get('hash'), record.get('file_size'), record.get('mtime_ns'),
+                     record.get('inode'), record.get('file_ext'), len(point_ids), record.get('upload_time')))
+                self._conn.execute("DELETE FROM chunks WHERE path = ?", (path,))
+                self._conn.executemany(
+                    "INSERT INTO chunks (path, chunk_index, point_id, chunk_hash) VALUES (?, ?, ?, ?)",
+                    [(path, i, point_id, digest)
+                     for i, (point_id, digest) in enumerate(zip(point_ids, chunk_hashes))])
+            except sqlite3.Error:
+                # 이 파일의 변경만이 아니라 아직 커밋하지 않은 배치 전체를 되돌림 (다음 실행에서 재처리)
+                self._conn.execute('ROLLBACK')
+                self._cancel_timer_locked()
+                self._pending = 0
+                raise
+            self._wrote_locked()
+
+    def update_signature(self, path: str, signature: Dict):
+        """내용은 같고 stat만 바뀐 파일의 서명 갱신"""
+        with self._lock:
+            self._begin_locked()
+            self._conn.execute(
+                "UPDATE files SET file_size = ?, mtime_ns = ?, inode = ? WHERE path = ?",
+                (signature.get('file_size'), signature.get('mtime_ns'), signature.get('inode'), path))
+            self._wrote_locked()
+
+    def delete(self, path: str):
+        with self._lock:
+            self._begin_locked()
+            self._conn.execute("DELETE FROM files WHERE path = ?", (path,))
+            self._conn.execute("DELETE FROM chunks WHERE path = ?", (path,))
+            self._wrote_locked()
+
+    # ---- 이전 형식 가져오기 ----
+    def migrate_from_json(self, json_path: str) -> int:
+        """knowledge_metadata.json(파일명 → 메타데이터)을 한 번만 가져옴"""
+        with self._lock:
+            done = self._conn.execute(
+                "SELECT value FROM store_meta WHERE key = 'json_migrated'").fetchone()
+        if done or not os.path.exists(json_path):
+            return 0
+
+        try:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                legacy = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"메타데이터 JSON 가져오기 실패: {e}")
+            return 0
+
+        with self._lock:
+            self._commit_locked()
+            with self._conn:
+                self._conn.execute('BEGIN IMMEDIATE')
+                for filename, record in legacy.items():
+                    self._conn.execute(
+                        "INSERT OR IGNORE INTO files (path, filename, hash, file_size, mtime_ns, inode, "
+                        "file_ext, chunks, upload_time, legacy) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 1)",
+                        (filename, filename, record.get('hash'), record.get('file_size'), record.get('mtime_ns'),
+                         record.get('inode'), record.get('file_ext'), record.get('chunks', 0),
+                         record.get('upload_time')))
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO store_meta (key, value) VALUES ('json_migrated', ?)", (json_path,))
+        logger.info(f"📦 메타데이터 JSON 가져오기 완료: {len(legacy)}개 파일 ({json_path})")
+        return len(legacy)
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+EX-GPT 문서 파서 (PDF, HWP, Excel, Word, TXT)
+- 파일 형식별로 청크를 하나씩 생성하는 스트리밍 파서
+- 임베딩 모델·벡터 DB 없이 import 가능 (파싱 작업 프로세스에서 가볍게 로드)
+- 파싱 라이브러리가 없으면 해당 형식만 파싱 오류로 처리
+"""
+
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+try:
+    import fitz  # PyMuPDF (더 좋은 PDF 파싱)
+except ImportError:
+    fitz = None
+
+try:
+    import PyPDF2
+except ImportError:
+    PyPDF2 = None
+
+try:
+    import docx
+    import mammoth  # Word 문서 고급 파싱
+except ImportError:
+    docx = mammoth = None
+
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
+
+try:
+    import olefile  # HWP 파일용
+except ImportError:
+    olefile = None
+
+from ingestion.pdf_parallel import default_workers as default_pdf_workers, iter_pdf_parallel, should_parallelize
+
+logger = logging.getLogger(__name__)
+
+
+class DocumentParser:
+    """다양한 문서 형식 파싱 클래스"""
+    
+    def __init__(self, pdf_workers: Optional[int] = None):
+        # 대용량 PDF 페이지 범위 병렬 파싱 작업자 수 (0/1이면 사용 안 함, 기본: PDF_PARSE_WORKERS 또는 CPU 코어 수)
+        self.pdf_workers = default_pdf_workers() if pdf_workers is None else pdf_workers
+        self.supported_formats = {
+            '.pdf': self.parse_pdf,
+            '.docx': self.parse_docx,
+            '.doc': self.parse_doc,
+            '.xlsx': self.parse_excel,
+            '.xls': self.parse_excel,
+            '.hwp': self.parse_hwp,
+            '.txt': self.parse_txt
+        }
+    
+    def parse_pdf(self, file_path: str) -> Iterator[Dict]:
+        """PDF 파일 파싱 (페이지 단위로 생성)"""
+        last_page = 0
+        try:
+            # PyMuPDF 사용 (더 정확한 파싱)
+            doc = fitz.open(file_path)
+            page_count = len(doc)
+            if should_parallelize(page_count, self.pdf_workers):
+                # 큰 문서는 페이지 범위를 여러 프로세스에서 추출 (결과는 페이지 순서대로)
+                doc.close()
+                for chunk in iter_pdf_parallel(file_path, page_count, self.pdf_workers):
+                    yield chunk
+                    last_page = chunk['page']
+                return
+            try:
+                for page_num in range(len(doc)):
+                    page = doc.load_page(page_num)
+                    text = page.get_text()
+                    
+                    if text.strip():
+                        yield {
+                            'content': text.strip(),
+                            'page': page_num + 1,
+                            'type': 'pdf_page'
+                        }
+                    last_page = page_num + 1
+            finally:
+                doc.close()
+            
+        except Exception as e:
+            logger.error(f"PDF 파싱 오류 ({file_path}): {e}")
+            # 폴백: PyPDF2 사용 (이미 생성한 페이지 다음부터)
+            try:
+                with open(file_path, 'rb') as file:
+                    pdf_reader = PyPDF2.PdfReader(file)
+                    for page_num, page in enumerate(pdf_reader.pages):
+                        if page_num < last_page:
+                            continue
+                        text = page.extract_text()
+                        if text.strip():
+                            yield {
+                                'content': text.strip(),
+                                'page': page_num + 1,
+                                'type': 'pdf_page'
+                            }
+            except Exception as e2:
+                logger.error(f"PDF 폴백 파싱도 실패: {e2}")
+    
+    def parse_docx(self, file_path: str) -> Iterator[Dict]:
+        """DOCX 파일 파싱"""
+        try:
+            # mammoth 사용 (더 정확한 파싱)
+            with open(file_path, "rb") as docx_file:
+                result = mammoth.extract_raw_text(docx_file)
+                text = result.value
+            
+        except Exception as e:
+            logger.error(f"DOCX mammoth 파싱 오류, docx 라이브러리 시도: {e}")
+            # 폴백: python-docx 사용
+            try:
+                doc = docx.Document(file_path)
+                for i, para in enumerate(doc.paragraphs):
+                    if para.text.strip() and len(para.text.strip()) > 50:
+                        yield {
+                            'content': para.text.strip(),
+                            'paragraph': i + 1,
+                            'type': 'docx_paragraph'
+                        }
+            except Exception as e2:
+                logger.error(f"DOCX 폴백 파싱도 실패: {e2}")
+            return
+        
+        if text.strip():
+            # 문단별로 분할
+            paragraphs = [p.strip() for p in text.split('\n') if p.strip()]
+            for i, para in enumerate(paragraphs):
+                if len(para) > 50:  # 의미있는 문단만
+                    yield {
+                        'content': para,
+                        'paragraph': i + 1,
+                        'type': 'docx_paragraph'
+                    }
+    
+    def parse_doc(self, file_path: str) -> Iterator[Dict]:
+        """DOC 파일 파싱 (제한적)"""
+        # DOC 파일은 복잡하므로 기본적인 처리만
+        logger.warning(f"DOC 파일은 제한적으로 지원됩니다: {file_path}")
+        yield {'content': f'DOC 파일 {file_path}가 업로드되었습니다. 정확한 파싱을 위해 DOCX로 변환해주세요.', 'type': 'doc_notice'}
+    
+    def parse_excel(self, file_path: str) -> Iterator[Dict]:
+        """Excel 파일 파싱 (읽기 전용 모드로 행 단위 생성)"""
+        done = set()
+        try:
+            workbook = openpyxl.load_workbook(file_path, read_only=True)
+            try:
+                for sheet_name in workbook.sheetnames:
+                    rows = workbook[sheet_name].iter_rows(max_row=999)
+                    
+                    # 헤더와 데이터 추출
+                    header_row = next(rows, None)
+                    if not header_row or len(header_row) <= 1:
+                        continue
+                    headers = [str(cell.value) if cell.value else f"Column_{col}"
+                               for col, cell in enumerate(header_row, 1)]
+                    
+                    # 각 행을 텍스트로 변환 (최대 1000행)
+                    for row, cells in enumerate(rows, 2):
+                        row_data = [str(cell.value) if cell.value else "" for cell in cells]
+                        
+                        if any(row_data):  # 빈 행이 아닌 경우
+                            content = " | ".join([f"{h}: {v}" for h, v in zip(headers, row_data) if v])
+                            done.add((sheet_name, row))
+                            yield {
+                                'content': content,
+                                'sheet': sheet_name,
+                                'row': row,
+                                'type': 'excel_row'
+                            }
+            finally:
+                workbook.close()
+            
+        except Exception as e:
+            logger.error(f"Excel 파싱 오류: {e}")
+            # 폴백: pandas 사용 (이미 생성한 행은 건너뜀)
+            try:
+                import pandas as pd
+                excel_file = pd.ExcelFile(file_path)
+                for sheet_name in excel_file.sheet_names:
+                    df = pd.read_excel(file_path, sheet_name=sheet_name)
+                    for index, row in df.iterrows():
+                        if (sheet_name, index + 2) in done:
+                            continue
+                        content = " | ".join([f"{col}: {val}" for col, val in row.items() if pd.notna(val)])
+                        if content:
+                            yield {
+                                'content': content,
+                                'sheet': sheet_name,
+                                'row': index + 2,
+                                'type': 'excel_row'
+                            }
+            except Exception as e2:
+                logger.error(f"Excel 폴백 파싱도 실패: {e2}")
+    
+    def parse_hwp(self, file_path: str) -> Iterator[Dict]:
+        """HWP 파일 파싱"""
+        text = None
+        try:
+            # olefile을 사용한 기본적인 HWP 파싱
+            f = olefile.OleFileIO(file_path)
+            
+            # HWP 파일 구조에서 텍스트 추출 시도
+            if f.exists('PrvText'):
+                encoded_text = f.openstream('PrvText').read()
+                # 다양한 인코딩 시도
+                for encoding in ['utf-16', 'cp949', 'euc-kr']:
+                    try:
+                        decoded = encoded_text.decode(encoding)
+                        if decoded and len(decoded) > 10:
+                            text = decoded
+                            break
+                    except UnicodeDecodeError:
+                        continue
+            
+            f.close()
+            
+        except Exception as e:
+            logger.error(f"HWP 파싱 오류: {e}")
+            yield {
+                'content': f'HWP 파일 {os.path.basename(file_path)}가 업로드되었습니다. 정확한 파싱을 위해 다른 형식으로 변환을 권장합니다.',
+                'type': 'hwp_notice'
+            }
+            return
+        
+        if text:
+            # 문단별로 분할
+            paragraphs = [p.strip() for p in text.split('\n') if p.strip()]
+            for i, para in enumerate(paragraphs):
+                if len(para) > 20:
+                    yield {
+                        'content': para,
+                        'paragraph': i + 1,
+                        'type': 'hwp_paragraph'
+                    }
+    
+    def parse_txt(self, file_path: str) -> Iterator[Dict]:
+        """TXT 파일 파싱 (빈 줄로 구분된 문단 단위로 읽으며 생성)"""
+        try:
+            # 다양한 인코딩 시도 - 디코딩 오류는 내용을 내보내기 전에 확인
+            for encoding in ['utf-8', 'cp949', 'euc-kr', 'latin-1']:
+                try:
+                    with open(file_path, 'r', encoding=encoding) as f:
+                        while f.read(1024 * 1024):
+                            pass
+                    break
+                except UnicodeDecodeError:
+                    continue
+            
+            with open(file_path, 'r', encoding=encoding) as f:
+                for i, para in enumerate(self._iter_paragraphs(f)):
+                    if len(para) > 20:
+                        yield {
+                            'content': para,
+                            'paragraph': i + 1,
+                            'type': 'txt_paragraph'
+                        }
+                    
+        except Exception as e:
+            logger.error(f"TXT 파싱 오류: {e}")
+    
+    @staticmethod
+    def _iter_paragraphs(lines: Iterable[str]) -> Iterator[str]:
+        """빈 줄('\\n\\n')로 구분된 문단 (공백만 있는 문단은 제외)"""
+        buffer = []
+        for line in lines:
+            if line in ('\n', '\r\n') and buffer and buffer[-1].endswith('\n'):
+                para = ''.join(buffer).strip()
+                buffer = []
+                if para:
+                    yield para
+                continue
+            buffer.append(line)
+        para = ''.join(buffer).strip()
+        if para:
+            yield para
+    
+    def iter_file(self, file_path: str) -> Iterator[Dict]:
+        """파일 확장자에 따라 적절한 파서 선택 (청크를 하나씩 생성)"""
+        file_ext = Path(file_path).suffix.lower()
+        
+        if file_ext in self.supported_formats:
+            logger.info(f"파싱 시작: {file_path} ({file_ext})")
+            count = 0
+            for chunk in self.supported_formats[file_ext](file_path):
+                count += 1
+                yield chunk
+            logger.info(f"파싱 완료: {count}개 청크 생성")
+        else:
+            logger.warning(f"지원하지 않는 파일 형식: {file_ext}")
+    
+    def parse_file(self, file_path: str) -> List[Dict]:
+        """파일 전체 청크 목록 (프로세스 풀 파싱처럼 한 번에 넘겨야 할 때)"""
+        return list(self.iter_file(file_path))
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+EX-GPT 대용량 PDF 페이지 범위 병렬 파싱
+- 페이지를 범위로 나눠 프로세스 풀에서 추출 (작업 프로세스가 각자 fitz로 문서를 엶)
+- 결과는 페이지 순서대로 생성하고, 동시에 처리 중인 범위 수를 제한해 메모리 사용량 유지
+- 페이지 수가 기준(PDF_PARALLEL_MIN_PAGES)보다 적은 문서는 한 프로세스에서 처리
+"""
+
+import logging
+import math
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import fitz  # PyMuPDF
+    FITZ_AVAILABLE = True
+except ImportError:
+    fitz = None
+    FITZ_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# 이 페이지 수 이상이면 병렬 파싱 (프로세스 시작·문서 열기 비용보다 이득이 큰 지점)
+PARALLEL_MIN_PAGES = int(os.getenv('PDF_PARALLEL_MIN_PAGES', '200'))
+# 범위 하나의 최소 페이지 수 (너무 잘게 나누면 작업 프로세스마다 문서를 여는 비용이 커짐)
+MIN_PAGES_PER_RANGE = 25
+
+PageRange = Tuple[int, int]
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def default_workers() -> int:
+    return int(os.getenv('PDF_PARSE_WORKERS', str(os.cpu_count() or 1)))
+
+
+def should_parallelize(page_count: int, workers: int, min_pages: Optional[int] = None) -> bool:
+    min_pages = PARALLEL_MIN_PAGES if min_pages is None else min_pages
+    return FITZ_AVAILABLE and workers > 1 and page_count >= min_pages
+
+
+def page_ranges(page_count: int, workers: int, min_pages_per_range: int = MIN_PAGES_PER_RANGE) -> List[PageRange]:
+    """[start, stop) 페이지 범위 목록
+
+    스캔 페이지·도면처럼 페이지마다 비용이 달라도 고르게 나뉘도록 작업자당 4개 정도로 쪼갭니다.
+    """
+    if page_count <= 0:
+        return []
+    size = max(min_pages_per_range, math.ceil(page_count / (max(1, workers) * 4)))
+    return [(start, min(start + size, page_count)) for start in range(0, page_count, size)]
+
+
+def extract_range(file_path: str, start: int, stop: int) -> List[Dict]:
+    """작업 함수: 페이지 범위의 텍스트 청크 (DocumentParser.parse_pdf와 같은 형식)"""
+    chunks = []
+    doc = fitz.open(file_path)
+    try:
+        for page_num in range(start, stop):
+            text = doc.load_page(page_num).get_text()
+            if text.strip():
+                chunks.append({
+                    'content': text.strip(),
+                    'page': page_num + 1,
+                    'type': 'pdf_page'
+                })
+    finally:
+        doc.close()
+    return chunks
+
+
+def iter_ranges(file_path: str, ranges: Sequence[PageRange], executor: Executor, max_in_flight: int,
+                extract: Callable[[str, int, int], List[Dict]] = extract_range) -> Iterator[Dict]:
+    """범위를 executor로 추출하고 페이지 순서대로 청크 생성 (동시에 max_in_flight개까지)"""
+    pending = deque()
+    remaining = iter(ranges)
+    try:
+        for page_range in remaining:
+            pending.append(executor.submit(extract, file_path, *page_range))
+            if len(pending) >= max_in_flight:
+                break
+        while pending:
+            chunks = pending.popleft().result()
+            next_range = next(remaining, None)
+            if next_range is not None:
+                pending.append(executor.submit(extract, file_path, *next_range))
+            yield from chunks
+    finally:
+        # 소비자가 중간에 멈추거나 오류가 나면 남은 범위는 취소
+        for future in pending:
+            future.cancel()
+
+
+def get_pool(workers: int) -> ProcessPoolExecutor:
+    """PDF 파싱용 프로세스 풀 (파일마다 새로 띄우지 않도록 재사용)"""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            _pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context(os.getenv('INGEST_MP_START', 'spawn'))
+            )
+            _pool_workers = workers
+            logger.info(f"📄 PDF 병렬 파싱 프로세스 풀 시작: {workers}개")
+        return _pool
+
+
+def shutdown_pool():
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True)
+        _pool = None
+        _pool_workers = 0
+
+
+def iter_pdf_parallel(file_path: str, page_count: int, workers: Optional[int] = None,
+                      executor: Optional[Executor] = None) -> Iterator[Dict]:
+    """대용량 PDF를 페이지 범위로 나눠 병렬 추출, 페이지 순서대로 청크 생성"""
+    workers = default_workers() if workers is None else workers
+    ranges = page_ranges(page_count, workers)
+    logger.info(f"📄 PDF 병렬 파싱: {page_count}페이지, {len(ranges)}개 범위, 작업자 {workers}개 ({file_path})")
+    yield from iter_ranges(file_path, ranges, executor or get_pool(workers), max_in_flight=workers * 2)
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+EX-GPT 문서 수집 파이프라인
+- 파싱(CPU 위주)은 프로세스 풀, 임베딩은 파일 간 길이순 배치, 업서트는 동시성 제한 스레드
+- 단계 사이를 제한된 큐로 연결해 뒤 단계가 밀리면 앞 단계가 대기 (backpressure)
+- 단계별 처리량(파일/청크 수, 작업 시간)과 진행 상황 보고
+"""
+
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from ingestion.embedding_batcher import EmbeddingBatcher
+from ingestion.incremental import chunk_hash
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+# 파싱 작업 프로세스마다 한 번만 생성
+_worker_parser = None
+
+
+def parse_document(file_path: str) -> Dict[str, Any]:
+    """프로세스 풀 작업 함수: 파일 하나를 파싱해 청크 목록 반환"""
+    global _worker_parser
+    if _worker_parser is None:
+        # 파서 모듈만 로드 (knowledge_manager의 임베딩 모델·벡터 DB 라이브러리는 불필요)
+        # 파일 단위로 이미 병렬이므로 PDF 페이지 병렬 파싱은 끔 (프로세스 중첩 방지)
+        from ingestion.parsers import DocumentParser
+        _worker_parser = DocumentParser(pdf_workers=0)
+    chunks = _worker_parser.parse_file(file_path)
+    # 증분 색인용 청크 해시도 작업 프로세스에서 계산
+    for chunk in chunks:
+        chunk['hash'] = chunk_hash(chunk)
+    return {'chunks': chunks}
+
+
+def split_streamed(paths: List[str], sizes: Dict[str, int], min_bytes: int) -> Tuple[List[str], List[str]]:
+    """(파이프라인으로 처리할 파일, 스트리밍으로 처리할 큰 파일) - 각각 입력 순서 유지
+
+    min_bytes 이상인 파일은 전체 청크 목록을 작업 프로세스에서 주고받지 않도록
+    호출 프로세스에서 배치 단위로 스트리밍합니다.
+    """
+    pipelined = [path for path in paths if sizes[path] < min_bytes]
+    streamed = [path for path in paths if sizes[path] >= min_bytes]
+    return pipelined, streamed
+
+
+def merge_progress(progress: Dict[str, Any], extra_files: int, completed: int, failed: int) -> Dict[str, Any]:
+    """파이프라인 진행 상황에 파이프라인 밖에서 처리하는 파일 수를 더함"""
+    progress = dict(progress)
+    progress['total_files'] += extra_files
+    progress['completed_files'] += completed
+    progress['failed_files'] += failed
+    done = progress['completed_files'] + progress['failed_files']
+    progress['percent'] = round(done / progress['total_files'] * 100, 1) if progress['total_files'] else 100.0
+    return progress
+
+
+class StageStats:
+    """단계별 처리량 집계 (스레드 안전)"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.files = 0
+        self.chunks = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, files: int, chunks: int, seconds: float, error: bool = False):
+        with self._lock:
+            self.files += files
+            self.chunks += chunks
+            self.busy_seconds += seconds
+            if error:
+                self.errors += 1
+
+    def snapshot(self, wall_seconds: float) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'files': self.files,
+                'chunks': self.chunks,
+                'errors': self.errors,
+                'busy_seconds': round(self.busy_seconds, 3),
+                # 작업 시간 합 기준 (작업자 하나의 처리 속도)
+                'chunks_per_busy_second': round(self.chunks / self.busy_seconds, 1) if self.busy_seconds else 0.0,
+                # 전체 실행 시간 기준 (단계 전체 처리량)
+                'chunks_per_second': round(self.chunks / wall_seconds, 1) if wall_seconds else 0.0,
+                'files_per_second': round(self.files / wall_seconds, 2) if wall_seconds else 0.0
+            }
+
+
+class FileJob:
+    """파이프라인을 따라 이동하는 파일 하나"""
+
+    __slots__ = ('path', 'filename', 'chunks', 'embed_indices', 'embeddings', 'extra', 'result', 'error')
+
+    def __init__(self, path: str):
+        self.path = path
+        self.filename = os.path.basename(path)
+        self.chunks: List[Dict] = []
+        self.embed_indices: List[int] = []  # 임베딩할 청크 (embeddings와 같은 순서)
+        self.embeddings: List[List[float]] = []
+        self.extra: Dict[str, Any] = {}
+        self.result: Optional[Dict] = None
+        self.error: Optional[str] = None
+
+
+class IngestionPipeline:
+    """파싱 → 임베딩 → 업서트 파이프라인
+
+    Args:
+        parse_fn: 프로세스 풀에서 실행할 최상위 함수 (path → {'chunks': [...], ...})
+        embed_fn: 텍스트 목록 → 벡터 목록
+        store_fn: FileJob → 결과 dict ({'success', 'chunks_added', ...})
+        plan_fn: FileJob → 임베딩이 필요한 청크 번호 목록 (없으면 전체, 증분 색인에서 사용)
+        parse_workers: 파싱 프로세스 수 (0이면 프로세스 풀 없이 스레드에서 파싱)
+        embed_batch_size: 임베딩 호출당 청크 수 (여러 파일의 청크를 모아 채움)
+        embed_flush_seconds: 새 파일이 이 시간 동안 없으면 덜 찬 배치도 임베딩
+        store_workers: 동시 업서트 수
+        queue_size: 단계 사이 대기 가능한 파일 수 (backpressure 기준)
+        progress_callback: 파일 하나가 끝날 때마다 progress() 결과로 호출
+
+    사용 예:
+        pipeline = IngestionPipeline(parse_document, km.embed_texts, km.store_parsed_file)
+        summary = pipeline.run(paths)
+    """
+
+    def __init__(self, parse_fn: Callable[[str], Dict], embed_fn: Callable[[List[str]], List[List[float]]],
+                 store_fn: Callable[[FileJob], Dict], plan_fn: Optional[Callable[[FileJob], List[int]]] = None,
+                 parse_workers: Optional[int] = None,
+                 embed_batch_size: int = 64, embed_flush_seconds: float = 0.2,
+                 store_workers: int = 4, queue_size: int = 8,
+                 progress_callback: Optional[Callable[[Dict], None]] = None,
+                 mp_context: Optional[str] = None):
+        self.parse_fn = parse_fn
+        self.embed_fn = embed_fn
+        self.store_fn = store_fn
+        self.plan_fn = plan_fn
+        self.parse_workers = (os.cpu_count() or 1) if parse_workers is None else parse_workers
+        self.embed_batch_size = embed_batch_size
+        self.embed_flush_seconds = embed_flush_seconds
+        self.store_workers = max(1, store_workers)
+        self.queue_size = max(1, queue_size)
+        self.progress_callback = progress_callback
+        # spawn: 요청 스레드/CUDA 상태를 복제하지 않도록 기본값으로 사용
+        self.mp_context = mp_context or os.getenv('INGEST_MP_START', 'spawn')
+
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.total_files = 0
+        self.completed_files = 0
+        self.failed_files = 0
+        self.results: List[FileJob] = []
+        self.started_at = time.monotonic()
+        self.stages = {name: StageStats(name) for name in ('parse', 'embed', 'store')}
+        self.batcher = EmbeddingBatcher(self.embed_fn, batch_size=self.embed_batch_size)
+
+    def progress(self) -> Dict[str, Any]:
+        with self._lock:
+            done = self.completed_files + self.failed_files
+            elapsed = time.monotonic() - self.started_at
+            return {
+                'total_files': self.total_files,
+                'completed_files': self.completed_files,
+                'failed_files': self.failed_files,
+                'percent': round(done / self.total_files * 100, 1) if self.total_files else 100.0,
+                'elapsed_seconds': round(elapsed, 2),
+                'stages': {name: stats.snapshot(elapsed) for name, stats in self.stages.items()},
+                'embedding_batches': self.batcher.stats()
+            }
+
+    def _finish(self, job: FileJob):
+        with self._lock:
+            if job.error is None and job.result and job.result.get('success', False):
+                self.completed_files += 1
+            else:
+                self.failed_files += 1
+            self.results.append(job)
+        if self.progress_callback:
+            try:
+                self.progress_callback(self.progress())
+            except Exception as e:
+                logger.warning(f"진행 상황 콜백 오류: {e}")
+
+    def _fail(self, job: FileJob, stage: str, error: BaseException):
+        job.error = f"{stage}: {error}"
+        job.result = {'success': False, 'message': f'파일 {job.filename} 처리 중 오류: {error}', 'chunks_added': 0}
+        logger.error(f"❌ {stage} 단계 실패 ({job.filename}): {error}")
+        self._finish(job)
+
+    # ---- 단계 1: 파싱 ----
+    def _parse_executor(self):
+        if self.parse_workers <= 0:
+            return ThreadPoolExecutor(max_workers=1, thread_name_prefix='ingest-parse')
+        return ProcessPoolExecutor(max_workers=self.parse_workers,
+                                   mp_context=multiprocessing.get_context(self.mp_context))
+
+    def _feed(self, executor, paths: List[str], parsed: "queue.Queue", slots: threading.Semaphore):
+        """파싱 작업 제출 - 동시에 떠 있는 파일 수를 slots로 제한"""
+        futures = []
+        try:
+            for path in paths:
+                slots.acquire()
+                submitted = time.monotonic()
+                future = executor.submit(self.parse_fn, path)
+                future.add_done_callback(
+                    lambda f, path=path, submitted=submitted: parsed.put((path, f, time.monotonic() - submitted)))
+                futures.append(future)
+            wait(futures)
+        finally:
+            parsed.put(_DONE)
+
+    # ---- 단계 2: 임베딩 ----
+    def _embedded(self, completed, to_store: "queue.Queue"):
+        for job, vectors, error in completed:
+            if error is not None:
+                self.stages['embed'].record(1, 0, 0.0, error=True)
+                self._fail(job, 'embed', error)
+                continue
+            job.embeddings = vectors
+            self.stages['embed'].record(1, len(vectors), 0.0)
+            # 저장 대기열이 가득 차면 여기서 대기 → 파싱 슬롯도 반환되지 않아 제출이 멈춤
+            to_store.put(job)
+
+    def _batch(self, to_store: "queue.Queue", job: Optional[FileJob] = None):
+        started = time.monotonic()
+        if job is None:
+            completed = self.batcher.flush()
+        else:
+            completed = self.batcher.add(job, [job.chunks[i]['content'] for i in job.embed_indices])
+        self.stages['embed'].record(0, 0, time.monotonic() - started)
+        self._embedded(completed, to_store)
+
+    def _embed_loop(self, parsed: "queue.Queue", slots: threading.Semaphore, to_store: "queue.Queue"):
+        try:
+            while True:
+                try:
+                    item = parsed.get(timeout=self.embed_flush_seconds)
+                except queue.Empty:
+                    # 입력이 잠시 끊기면 모아둔 청크를 먼저 처리
+                    if self.batcher.pending_chunks:
+                        self._batch(to_store)
+                    continue
+                if item is _DONE:
+                    self._batch(to_store)
+                    break
+                path, future, seconds = item
+                slots.release()
+
+                job = FileJob(path)
+                try:
+                    output = future.result()
+                except Exception as e:
+                    self.stages['parse'].record(1, 0, seconds, error=True)
+                    self._fail(job, 'parse', e)
+                    continue
+
+                job.chunks = output.pop('chunks', [])
+                job.extra = output
+                self.stages['parse'].record(1, len(job.chunks), seconds)
+
+                try:
+                    job.embed_indices = self.plan_fn(job) if self.plan_fn else list(range(len(job.chunks)))
+                except Exception as e:
+                    self._fail(job, 'plan', e)
+                    continue
+                self._batch(to_store, job)
+        finally:
+            for _ in range(self.store_workers):
+                to_store.put(_DONE)
+
+    # ---- 단계 3: 업서트 ----
+    def _store_loop(self, to_store: "queue.Queue"):
+        while True:
+            job = to_store.get()
+            if job is _DONE:
+                break
+            started = time.monotonic()
+            try:
+                job.result = self.store_fn(job)
+            except Exception as e:
+                self.stages['store'].record(1, 0, time.monotonic() - started, error=True)
+                self._fail(job, 'store', e)
+                continue
+            self.stages['store'].record(1, job.result.get('chunks_added', 0), time.monotonic() - started)
+            self._finish(job)
+
+    def run(self, paths: Iterable[str]) -> Dict[str, Any]:
+        """모든 파일을 처리하고 요약 반환 (호출 스레드에서 완료까지 대기)"""
+        paths = list(paths)
+        self._reset()
+        self.total_files = len(paths)
+
+        parsed: "queue.Queue" = queue.Queue()
+        to_store: "queue.Queue" = queue.Queue(maxsize=self.queue_size)
+        slots = threading.Semaphore(self.queue_size + max(self.parse_workers, 1))
+
+        with self._parse_executor() as executor:
+            threads = [threading.Thread(target=self._feed, args=(executor, paths, parsed, slots),
+                                        name='ingest-feed', daemon=True),
+                       threading.Thread(target=self._embed_loop, args=(parsed, slots, to_store),
+                                        name='ingest-embed', daemon=True)]
+            threads += [threading.Thread(target=self._store_loop, args=(to_store,),
+                                         name=f'ingest-store-{i}', daemon=True)
+                        for i in range(self.store_workers)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        summary = self.progress()
+        logger.info(f"📥 수집 완료: {summary['completed_files']}/{summary['total_files']}개 파일, "
+                    f"{summary['elapsed_seconds']}초 "
+                    f"(파싱 {summary['stages']['parse']['chunks_per_second']}, "
+                    f"임베딩 {summary['stages']['embed']['chunks_per_second']}, "
+                    f"저장 {summary['stages']['store']['chunks_per_second']} 청크/초)")
+        return summary
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+EX-GPT Qdrant 배치 업서트
+- 포인트를 고정 크기 배치로 나눠 여러 배치를 동시에 전송 (wait=False)
+- 마지막 배치는 나머지가 모두 접수된 뒤 wait=True로 보내 일관성 장벽으로 사용
+- 일시적 오류(연결/타임아웃/429/5xx)는 지수 백오프로 재시도
+- 완료된 배치 번호를 체크포인트에 기록해 재시도 시 이어서 전송
+"""
+
+import json
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class UpsertError(Exception):
+    """재시도 후에도 실패한 배치가 있음 (체크포인트는 유지)"""
+
+    def __init__(self, message: str, completed_batches: int = 0, total_batches: int = 0):
+        super().__init__(message)
+        self.completed_batches = completed_batches
+        self.total_batches = total_batches
+
+
+def is_transient(error: BaseException) -> bool:
+    """재시도할 가치가 있는 오류인지 판단"""
+    status = getattr(error, 'status_code', None)
+    if status is not None:
+        return status == 429 or status >= 500
+    if isinstance(error, (ConnectionError, TimeoutError, OSError)):
+        return True
+    # qdrant_client / httpx / grpc 예외는 선택 의존성이라 이름으로 판별
+    name = type(error).__name__
+    return name in ('ResponseHandlingException', 'ConnectError', 'ReadTimeout', 'WriteTimeout',
+                    'ConnectTimeout', 'RemoteProtocolError', 'PoolTimeout', '_InactiveRpcError')
+
+
+class UpsertCheckpoint:
+    """파일별 완료 배치 번호 기록 (path를 지정하면 JSON으로 저장)"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._done: Dict[str, Set[int]] = {}
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self._done = {key: set(batches) for key, batches in json.load(f).items()}
+            except (OSError, ValueError) as e:
+                logger.warning(f"업서트 체크포인트 로드 실패: {e}")
+
+    def completed(self, key: str) -> Set[int]:
+        with self._lock:
+            return set(self._done.get(key, ()))
+
+    def mark(self, key: str, batch_index: int):
+        with self._lock:
+            self._done.setdefault(key, set()).add(batch_index)
+            self._save_locked()
+
+    def clear(self, key: str):
+        with self._lock:
+            if self._done.pop(key, None) is not None:
+                self._save_locked()
+
+    def clear_prefix(self, prefix: str):
+        """prefix로 시작하는 키 모두 삭제 (파일 하나의 배치·계획별 키 정리)"""
+        with self._lock:
+            keys = [key for key in self._done if key.startswith(prefix)]
+            for key in keys:
+                del self._done[key]
+            if keys:
+                self._save_locked()
+
+    def _save_locked(self):
+        if not self.path:
+            return
+        try:
+            with open(f"{self.path}.tmp", 'w', encoding='utf-8') as f:
+                json.dump({key: sorted(batches) for key, batches in self._done.items()}, f)
+            os.replace(f"{self.path}.tmp", self.path)
+        except OSError as e:
+            logger.warning(f"업서트 체크포인트 저장 실패: {e}")
+
+
+class BatchUpserter:
+    """배치 병렬 업서트
+
+    사용 예:
+        upserter = BatchUpserter(client, 'documents', batch_size=256, max_in_flight=4)
+        upserter.upsert(points, key=f"{filename}:{file_hash}")
+    """
+
+    def __init__(self, client, collection_name: str, batch_size: int = 256, max_in_flight: int = 4,
+                 max_retries: int = 5, backoff_seconds: float = 0.5, max_backoff_seconds: float = 30.0,
+                 checkpoint: Optional[UpsertCheckpoint] = None):
+        self.client = client
+        self.collection_name = collection_name
+        self.batch_size = max(1, batch_size)
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.checkpoint = checkpoint or UpsertCheckpoint()
+        # 여러 파일이 동시에 업서트해도 전체 동시 요청 수는 max_in_flight 이하
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_in_flight), thread_name_prefix='qdrant-upsert')
+        self._lock = threading.Lock()
+        self.retries = 0
+        self.batches_sent = 0
+
+    def _send(self, batch: List[Any], wait_for_result: bool):
+        attempt = 0
+        while True:
+            try:
+                self.client.upsert(collection_name=self.collection_name, points=batch, wait=wait_for_result)
+                with self._lock:
+                    self.batches_sent += 1
+                return
+            except Exception as e:
+                if attempt >= self.max_retries or not is_transient(e):
+                    raise
+                delay = min(self.max_backoff_seconds, self.backoff_seconds * (2 ** attempt))
+                delay *= random.uniform(0.5, 1.0)
+                attempt += 1
+                with self._lock:
+                    self.retries += 1
+                logger.warning(f"⚠️ 업서트 재시도 {attempt}/{self.max_retries} ({delay:.1f}초 후): {e}")
+                time.sleep(delay)
+
+    def _send_and_mark(self, key: str, index: int, batch: List[Any], wait_for_result: bool):
+        self._send(batch, wait_for_result)
+        self.checkpoint.mark(key, index)
+
+    def upsert(self, points: List[Any], key: str) -> Dict[str, int]:
+        """points를 배치로 나눠 업서트. key(파일+내용 해시)별로 완료 배치를 건너뜀"""
+        batches = [points[i:i + self.batch_size] for i in range(0, len(points), self.batch_size)]
+        done = self.checkpoint.completed(key)
+        todo = [i for i in range(len(batches)) if i not in done]
+        if not todo:
+            return {'batches': len(batches), 'sent': 0, 'resumed': len(done)}
+
+        # 마지막 배치는 장벽용으로 남겨둠
+        barrier, parallel = todo[-1], todo[:-1]
+        futures = {self._executor.submit(self._send_and_mark, key, i, batches[i], False): i for i in parallel}
+        wait(futures)
+        failed = [futures[f] for f in futures if f.exception() is not None]
+        if failed:
+            error = next(f.exception() for f in futures if f.exception() is not None)
+            completed = len(batches) - len(failed) - 1
+            raise UpsertError(f"배치 {len(failed)}/{len(batches)}개 업서트 실패: {error}",
+                              completed_batches=completed, total_batches=len(batches))
+
+        # 앞선 배치가 모두 접수된 뒤 wait=True → 반환 시점에 이 파일의 포인트가 모두 반영됨
+        try:
+            self._executor.submit(self._send_and_mark, key, barrier, batches[barrier], True).result()
+        except Exception as e:
+            raise UpsertError(f"마지막 배치 업서트 실패: {e}", completed_batches=len(batches) - 1,
+                              total_batches=len(batches)) from e
+        return {'batches': len(batches), 'sent': len(todo), 'resumed': len(done)}
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'batches_sent': self.batches_sent, 'retries': self.retries}
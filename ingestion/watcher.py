@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+EX-GPT 지식 베이스 디렉토리 감시
+- watchdog(inotify 등)이 있으면 파일 시스템 이벤트, 없으면 주기적 stat 폴링
+- 짧은 시간에 몰리는 이벤트(저장 중 여러 번 쓰기, 복사)는 디바운스해 한 번만 처리
+- 변경/삭제된 경로만 모아 콜백(on_batch)에 전달 → 증분 색인
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    FileSystemEventHandler = object
+    Observer = None
+    WATCHDOG_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+CHANGED = 'changed'
+DELETED = 'deleted'
+
+
+def is_ignored(path: str) -> bool:
+    """편집기/오피스 임시 파일, 숨김 파일"""
+    name = os.path.basename(path)
+    return name.startswith(('.', '~$')) or name.endswith(('.tmp', '.swp', '.part', '~'))
+
+
+class ChangeDebouncer:
+    """경로별 마지막 이벤트만 남기고, 조용해진 지 quiet_seconds가 지난 경로를 내보냄
+
+    계속 쓰기가 이어지는 파일도 처음 이벤트 후 max_delay_seconds가 지나면 내보냅니다.
+    """
+
+    def __init__(self, quiet_seconds: float = 2.0, max_delay_seconds: float = 30.0):
+        self.quiet_seconds = quiet_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self._pending: Dict[str, Tuple[str, float, float]] = {}  # 경로 → (종류, 첫 이벤트, 마지막 이벤트)
+        self._lock = threading.Lock()
+
+    def add(self, path: str, kind: str, now: Optional[float] = None):
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            previous = self._pending.get(path)
+            first = previous[1] if previous else now
+            self._pending[path] = (kind, first, now)
+
+    def due(self, now: Optional[float] = None) -> Tuple[List[str], List[str]]:
+        """처리할 (변경 경로, 삭제 경로)"""
+        now = time.monotonic() if now is None else now
+        changed, deleted = [], []
+        with self._lock:
+            for path, (kind, first, last) in list(self._pending.items()):
+                if now - last >= self.quiet_seconds or now - first >= self.max_delay_seconds:
+                    del self._pending[path]
+                    (deleted if kind == DELETED else changed).append(path)
+        return sorted(changed), sorted(deleted)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+
+class PollingScanner:
+    """watchdog이 없을 때 쓰는 stat 스냅샷 비교"""
+
+    def __init__(self, directories: Iterable[str], accept: Callable[[str], bool]):
+        self.directories = list(directories)
+        self.accept = accept
+        self._snapshot: Dict[str, Tuple[int, int, int]] = self._walk()
+
+    def _walk(self) -> Dict[str, Tuple[int, int, int]]:
+        snapshot = {}
+        for directory in self.directories:
+            for root, dirs, files in os.walk(directory):
+                for name in files:
+                    path = os.path.join(root, name)
+                    if not self.accept(path):
+                        continue
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue  # 스캔 도중 삭제됨
+                    snapshot[path] = (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+        return snapshot
+
+    def scan(self) -> List[Tuple[str, str]]:
+        current = self._walk()
+        events = [(path, CHANGED) for path, signature in current.items()
+                  if self._snapshot.get(path) != signature]
+        events.extend((path, DELETED) for path in self._snapshot if path not in current)
+        self._snapshot = current
+        return events
+
+
+class _EventHandler(FileSystemEventHandler):
+    """watchdog 이벤트 → 디바운서"""
+
+    def __init__(self, watcher: 'DirectoryWatcher'):
+        super().__init__()
+        self.watcher = watcher
+
+    def on_created(self, event):
+        self.watcher.notify(event.src_path, CHANGED, event.is_directory)
+
+    def on_modified(self, event):
+        if not event.is_directory:
+            self.watcher.notify(event.src_path, CHANGED, False)
+
+    def on_deleted(self, event):
+        self.watcher.notify(event.src_path, DELETED, event.is_directory)
+
+    def on_moved(self, event):
+        self.watcher.notify(event.src_path, DELETED, event.is_directory)
+        self.watcher.notify(event.dest_path, CHANGED, event.is_directory)
+
+
+class DirectoryWatcher:
+    """디렉토리 감시 후 디바운스된 변경을 on_batch(changed, deleted)로 전달
+
+    디렉토리 자체가 생성·이동·삭제되면 그 디렉토리 경로가 전달됩니다 (하위 파일 처리는 콜백 몫).
+
+    사용 예:
+        watcher = DirectoryWatcher(['/data/docs'], km.process_changes, extensions={'.pdf', '.txt'})
+        watcher.start()
+    """
+
+    def __init__(self, directories: Iterable[str], on_batch: Callable[[List[str], List[str]], None],
+                 extensions: Optional[Set[str]] = None, debounce_seconds: float = 2.0,
+                 max_delay_seconds: float = 30.0, poll_interval: float = 5.0,
+                 use_watchdog: Optional[bool] = None, initial_sync: Optional[Callable[[], None]] = None):
+        self.directories = [os.path.abspath(directory) for directory in directories]
+        self.on_batch = on_batch
+        self.extensions = {ext.lower() for ext in extensions} if extensions else None
+        self.poll_interval = poll_interval
+        self.use_watchdog = WATCHDOG_AVAILABLE if use_watchdog is None else (use_watchdog and WATCHDOG_AVAILABLE)
+        self.initial_sync = initial_sync
+        self.debouncer = ChangeDebouncer(debounce_seconds, max_delay_seconds)
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._observer = None
+        self._scanner: Optional[PollingScanner] = None
+        self.batches = 0
+        self.errors = 0
+
+    def accept(self, path: str) -> bool:
+        if is_ignored(path):
+            return False
+        return self.extensions is None or os.path.splitext(path)[1].lower() in self.extensions
+
+    def notify(self, path: str, kind: str, is_directory: bool = False):
+        if is_directory or self.accept(path):
+            self.debouncer.add(os.path.abspath(path), kind)
+
+    @property
+    def mode(self) -> str:
+        return 'watchdog' if self.use_watchdog else 'polling'
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        if self.use_watchdog:
+            self._observer = Observer()
+            handler = _EventHandler(self)
+            for directory in self.directories:
+                self._observer.schedule(handler, directory, recursive=True)
+            self._observer.start()
+        else:
+            self._scanner = PollingScanner(self.directories, self.accept)
+        self._thread = threading.Thread(target=self._run, name='knowledge-watcher', daemon=True)
+        self._thread.start()
+        logger.info(f"👀 디렉토리 감시 시작 ({self.mode}): {', '.join(self.directories)}")
+
+    def stop(self, timeout: float = 10.0):
+        self._stop.set()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join(timeout)
+            self._observer = None
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def poll_once(self):
+        """폴링 모드 한 번 스캔 (테스트, 수동 호출용)"""
+        if self._scanner is None:
+            self._scanner = PollingScanner(self.directories, self.accept)
+            return
+        for path, kind in self._scanner.scan():
+            self.debouncer.add(path, kind)
+
+    def dispatch_due(self, now: Optional[float] = None) -> bool:
+        """디바운스가 끝난 변경을 콜백으로 처리. 처리한 것이 있으면 True"""
+        changed, deleted = self.debouncer.due(now)
+        if not changed and not deleted:
+            return False
+        try:
+            self.on_batch(changed, deleted)
+            self.batches += 1
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"감시 변경 처리 오류 (변경 {len(changed)}, 삭제 {len(deleted)}): {e}")
+        return True
+
+    def _run(self):
+        if self.initial_sync is not None:
+            try:
+                self.initial_sync()
+            except Exception as e:
+                logger.error(f"감시 시작 동기화 오류: {e}")
+
+        tick = min(0.5, self.debouncer.quiet_seconds / 2 or 0.5)
+        next_poll = time.monotonic() + self.poll_interval
+        while not self._stop.wait(tick):
+            if not self.use_watchdog and time.monotonic() >= next_poll:
+                self.poll_once()
+                next_poll = time.monotonic() + self.poll_interval
+            self.dispatch_due()
+
+    def status(self) -> Dict:
+        return {
+            'mode': self.mode,
+            'directories': self.directories,
+            'running': bool(self._thread and self._thread.is_alive()),
+            'pending': len(self.debouncer),
+            'batches': self.batches,
+            'errors': self.errors
+        }
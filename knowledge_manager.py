@@ -10,32 +10,23 @@ EX-GPT 지식 관리 시스템
 """
 
 import os
-import hashlib
 import json
 import logging
 from datetime import datetime
 from pathlib import Path
-import uuid
 import mimetypes
 
-# 문서 파싱 라이브러리
-import PyPDF2
-import fitz  # PyMuPDF (더 좋은 PDF 파싱)
-import docx
-import openpyxl
-import pandas as pd
-import olefile  # HWP 파일용
-import mammoth  # Word 문서 고급 파싱
-
 # 벡터 DB 및 임베딩
 from qdrant_client import QdrantClient
-from qdrant_client.models import VectorParams, Distance, PointStruct
+from qdrant_client.models import (
+    VectorParams, Distance, PointStruct, PointIdsList, SetPayload, SetPayloadOperation
+)
 import sentence_transformers
 from sentence_transformers import SentenceTransformer
 
 # 텍스트 처리
 import re
-from typing import List, Dict, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
 
@@ -43,267 +34,81 @@ from concurrent.futures import ThreadPoolExecutor
 from flask import Blueprint, request, jsonify, render_template_string, send_from_directory
 from werkzeug.utils import secure_filename
 
+from ingestion.incremental import ChunkPlan, StreamingPlanner, batched, chunk_hash, plan_update, position_payload
+from ingestion.change_detector import FileCheck, check_file as detect_change, hash_file
+from ingestion.metadata_store import MetadataStore
+from ingestion.parsers import DocumentParser
+
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class DocumentParser:
-    """다양한 문서 형식 파싱 클래스"""
-    
-    def __init__(self):
-        self.supported_formats = {
-            '.pdf': self.parse_pdf,
-            '.docx': self.parse_docx,
-            '.doc': self.parse_doc,
-            '.xlsx': self.parse_excel,
-            '.xls': self.parse_excel,
-            '.hwp': self.parse_hwp,
-            '.txt': self.parse_txt
-        }
-    
-    def parse_pdf(self, file_path: str) -> List[Dict]:
-        """PDF 파일 파싱"""
-        chunks = []
-        try:
-            # PyMuPDF 사용 (더 정확한 파싱)
-            doc = fitz.open(file_path)
-            for page_num in range(len(doc)):
-                page = doc.load_page(page_num)
-                text = page.get_text()
-                
-                if text.strip():
-                    chunks.append({
-                        'content': text.strip(),
-                        'page': page_num + 1,
-                        'type': 'pdf_page'
-                    })
-            doc.close()
-            
-        except Exception as e:
-            logger.error(f"PDF 파싱 오류 ({file_path}): {e}")
-            # 폴백: PyPDF2 사용
-            try:
-                with open(file_path, 'rb') as file:
-                    pdf_reader = PyPDF2.PdfReader(file)
-                    for page_num, page in enumerate(pdf_reader.pages):
-                        text = page.extract_text()
-                        if text.strip():
-                            chunks.append({
-                                'content': text.strip(),
-                                'page': page_num + 1,
-                                'type': 'pdf_page'
-                            })
-            except Exception as e2:
-                logger.error(f"PDF 폴백 파싱도 실패: {e2}")
-        
-        return chunks
-    
-    def parse_docx(self, file_path: str) -> List[Dict]:
-        """DOCX 파일 파싱"""
-        chunks = []
-        try:
-            # mammoth 사용 (더 정확한 파싱)
-            with open(file_path, "rb") as docx_file:
-                result = mammoth.extract_raw_text(docx_file)
-                text = result.value
-                
-                if text.strip():
-                    # 문단별로 분할
-                    paragraphs = [p.strip() for p in text.split('\n') if p.strip()]
-                    for i, para in enumerate(paragraphs):
-                        if len(para) > 50:  # 의미있는 문단만
-                            chunks.append({
-                                'content': para,
-                                'paragraph': i + 1,
-                                'type': 'docx_paragraph'
-                            })
-                
-        except Exception as e:
-            logger.error(f"DOCX mammoth 파싱 오류, docx 라이브러리 시도: {e}")
-            # 폴백: python-docx 사용
-            try:
-                doc = docx.Document(file_path)
-                for i, para in enumerate(doc.paragraphs):
-                    if para.text.strip() and len(para.text.strip()) > 50:
-                        chunks.append({
-                            'content': para.text.strip(),
-                            'paragraph': i + 1,
-                            'type': 'docx_paragraph'
-                        })
-            except Exception as e2:
-                logger.error(f"DOCX 폴백 파싱도 실패: {e2}")
-        
-        return chunks
-    
-    def parse_doc(self, file_path: str) -> List[Dict]:
-        """DOC 파일 파싱 (제한적)"""
-        # DOC 파일은 복잡하므로 기본적인 처리만
-        logger.warning(f"DOC 파일은 제한적으로 지원됩니다: {file_path}")
-        return [{'content': f'DOC 파일 {file_path}가 업로드되었습니다. 정확한 파싱을 위해 DOCX로 변환해주세요.', 'type': 'doc_notice'}]
-    
-    def parse_excel(self, file_path: str) -> List[Dict]:
-        """Excel 파일 파싱"""
-        chunks = []
-        try:
-            # openpyxl과 pandas 둘 다 사용
-            workbook = openpyxl.load_workbook(file_path)
-            
-            for sheet_name in workbook.sheetnames:
-                sheet = workbook[sheet_name]
-                
-                # 데이터 범위 찾기
-                max_row = sheet.max_row
-                max_col = sheet.max_column
-                
-                if max_row > 1 and max_col > 1:
-                    # 헤더와 데이터 추출
-                    headers = []
-                    for col in range(1, max_col + 1):
-                        header = sheet.cell(row=1, column=col).value
-                        headers.append(str(header) if header else f"Column_{col}")
-                    
-                    # 각 행을 텍스트로 변환
-                    for row in range(2, min(max_row + 1, 1000)):  # 최대 1000행
-                        row_data = []
-                        for col in range(1, max_col + 1):
-                            cell_value = sheet.cell(row=row, column=col).value
-                            row_data.append(str(cell_value) if cell_value else "")
-                        
-                        if any(row_data):  # 빈 행이 아닌 경우
-                            content = " | ".join([f"{h}: {v}" for h, v in zip(headers, row_data) if v])
-                            chunks.append({
-                                'content': content,
-                                'sheet': sheet_name,
-                                'row': row,
-                                'type': 'excel_row'
-                            })
-            
-            workbook.close()
-            
-        except Exception as e:
-            logger.error(f"Excel 파싱 오류: {e}")
-            # 폴백: pandas 사용
-            try:
-                excel_file = pd.ExcelFile(file_path)
-                for sheet_name in excel_file.sheet_names:
-                    df = pd.read_excel(file_path, sheet_name=sheet_name)
-                    for index, row in df.iterrows():
-                        content = " | ".join([f"{col}: {val}" for col, val in row.items() if pd.notna(val)])
-                        if content:
-                            chunks.append({
-                                'content': content,
-                                'sheet': sheet_name,
-                                'row': index + 2,
-                                'type': 'excel_row'
-                            })
-            except Exception as e2:
-                logger.error(f"Excel 폴백 파싱도 실패: {e2}")
-        
-        return chunks
-    
-    def parse_hwp(self, file_path: str) -> List[Dict]:
-        """HWP 파일 파싱"""
-        chunks = []
-        try:
-            # olefile을 사용한 기본적인 HWP 파싱
-            f = olefile.OleFileIO(file_path)
-            
-            # HWP 파일 구조에서 텍스트 추출 시도
-            if f.exists('PrvText'):
-                encoded_text = f.openstream('PrvText').read()
-                try:
-                    # 다양한 인코딩 시도
-                    for encoding in ['utf-16', 'cp949', 'euc-kr']:
-                        try:
-                            text = encoded_text.decode(encoding)
-                            if text and len(text) > 10:
-                                # 문단별로 분할
-                                paragraphs = [p.strip() for p in text.split('\n') if p.strip()]
-                                for i, para in enumerate(paragraphs):
-                                    if len(para) > 20:
-                                        chunks.append({
-                                            'content': para,
-                                            'paragraph': i + 1,
-                                            'type': 'hwp_paragraph'
-                                        })
-                                break
-                        except UnicodeDecodeError:
-                            continue
-                except Exception as e:
-                    logger.error(f"HWP 텍스트 디코딩 오류: {e}")
-            
-            f.close()
-            
-        except Exception as e:
-            logger.error(f"HWP 파싱 오류: {e}")
-            chunks.append({
-                'content': f'HWP 파일 {os.path.basename(file_path)}가 업로드되었습니다. 정확한 파싱을 위해 다른 형식으로 변환을 권장합니다.',
-                'type': 'hwp_notice'
-            })
-        
-        return chunks
-    
-    def parse_txt(self, file_path: str) -> List[Dict]:
-        """TXT 파일 파싱"""
-        chunks = []
-        try:
-            # 다양한 인코딩 시도
-            for encoding in ['utf-8', 'cp949', 'euc-kr', 'latin-1']:
-                try:
-                    with open(file_path, 'r', encoding=encoding) as f:
-                        content = f.read()
-                    
-                    if content.strip():
-                        # 문단별로 분할
-                        paragraphs = [p.strip() for p in content.split('\n\n') if p.strip()]
-                        for i, para in enumerate(paragraphs):
-                            if len(para) > 20:
-                                chunks.append({
-                                    'content': para,
-                                    'paragraph': i + 1,
-                                    'type': 'txt_paragraph'
-                                })
-                    break
-                    
-                except UnicodeDecodeError:
-                    continue
-                    
-        except Exception as e:
-            logger.error(f"TXT 파싱 오류: {e}")
-        
-        return chunks
-    
-    def parse_file(self, file_path: str) -> List[Dict]:
-        """파일 확장자에 따라 적절한 파서 선택"""
-        file_ext = Path(file_path).suffix.lower()
-        
-        if file_ext in self.supported_formats:
-            logger.info(f"파싱 시작: {file_path} ({file_ext})")
-            chunks = self.supported_formats[file_ext](file_path)
-            logger.info(f"파싱 완료: {len(chunks)}개 청크 생성")
-            return chunks
-        else:
-            logger.warning(f"지원하지 않는 파일 형식: {file_ext}")
-            return []
+class EmbeddingError(Exception):
+    """임베딩 모델 인코딩 실패 (해당 파일만 실패 처리, 0 벡터로 색인하지 않음)"""
+
 
 class KnowledgeManager:
     """지식 베이스 관리 클래스"""
     
+    SUPPORTED_EXTENSIONS = {'.pdf', '.docx', '.doc', '.xlsx', '.xls', '.hwp', '.txt'}
+    
     def __init__(self, qdrant_host="localhost", qdrant_port=6333, collection_name="documents"):
         self.qdrant_client = QdrantClient(host=qdrant_host, port=qdrant_port)
         self.collection_name = collection_name
         self.parser = DocumentParser()
         
         # 임베딩 모델 초기화
-        self.embedding_model = SentenceTransformer('paraphrase-multilingual-MiniLM-L12-v2')
+        self.embedding_model_name = 'paraphrase-multilingual-MiniLM-L12-v2'
+        self.embedding_model = SentenceTransformer(self.embedding_model_name)
         self.vector_size = 384  # MiniLM-L12-v2의 벡터 크기
+        # 임베딩 호출당 청크 수 (디렉토리 처리 시 여러 파일의 청크를 모아 채움)
+        self.embed_batch_size = int(os.getenv('INGEST_EMBED_BATCH', '64'))
+        # 단일 파일 처리 시 한 번에 메모리에 두는 청크 수
+        self.stream_batch_size = int(os.getenv('INGEST_STREAM_BATCH', '256'))
+        # 이 크기 이상인 파일은 디렉토리 처리에서도 파이프라인 대신 배치 단위 스트리밍으로 처리
+        # (파이프라인은 파일 하나의 전체 청크와 임베딩을 함께 보관)
+        self.stream_min_bytes = int(float(os.getenv('INGEST_STREAM_MIN_MB', '20')) * 1024 * 1024)
+        # 변경된 파일이 이 수 이하면 파싱 프로세스 풀 없이 스레드에서 파싱 (감시 모드의 작은 배치)
+        self.inprocess_parse_max_files = int(os.getenv('INGEST_INPROCESS_MAX_FILES', '4'))
         
-        # 메타데이터 저장 파일
+        # 임베딩 디스크 캐시 (EMBEDDING_CACHE_DIR를 빈 값으로 두면 사용 안 함)
+        self.embedding_cache = None
+        cache_dir = os.getenv('EMBEDDING_CACHE_DIR', 'data/embedding_cache')
+        if cache_dir:
+            from ingestion.embedding_cache import EmbeddingCache
+            try:
+                self.embedding_cache = EmbeddingCache(
+                    cache_dir, self.vector_size, self.embedding_model_name,
+                    capacity=int(os.getenv('EMBEDDING_CACHE_MAX', '200000'))
+                )
+            except (OSError, ValueError) as e:
+                logger.warning(f"임베딩 캐시를 사용할 수 없습니다: {e}")
+        
+        # 메타데이터 저장소 (전체 경로 기준, 기존 JSON 파일은 최초 한 번 가져옴)
         self.metadata_file = "knowledge_metadata.json"
-        self.file_hashes = self.load_metadata()
+        self.metadata = MetadataStore(
+            os.getenv('KNOWLEDGE_METADATA_DB', 'data/knowledge_metadata.db'),
+            batch_size=int(os.getenv('KNOWLEDGE_METADATA_BATCH', '50')),
+            max_batch_seconds=float(os.getenv('KNOWLEDGE_METADATA_BATCH_SECONDS', '1.0'))
+        )
+        self.load_metadata()
         
         # 컬렉션 초기화
         self.ensure_collection_exists()
+        
+        # 배치 병렬 업서트 (실패 시 완료된 배치부터 이어서 재시도)
+        from ingestion.upserter import BatchUpserter, UpsertCheckpoint
+        self.upserter = BatchUpserter(
+            self.qdrant_client,
+            self.collection_name,
+            batch_size=int(os.getenv('INGEST_UPSERT_BATCH', '256')),
+            max_in_flight=int(os.getenv('INGEST_UPSERT_PARALLEL', '4')),
+            max_retries=int(os.getenv('INGEST_UPSERT_RETRIES', '5')),
+            checkpoint=UpsertCheckpoint(os.getenv('INGEST_CHECKPOINT_PATH', 'knowledge_upsert_checkpoint.json'))
+        )
+        
+        # 디렉토리 감시 (start_watching)
+        self.watcher = None
     
     def ensure_collection_exists(self):
         """Qdrant 컬렉션이 존재하는지 확인하고 없으면 생성"""
@@ -330,60 +135,83 @@ class KnowledgeManager:
             logger.error(f"컬렉션 확인/생성 오류: {e}")
             raise
     
-    def load_metadata(self) -> Dict:
-        """메타데이터 파일 로드"""
+    def load_metadata(self) -> int:
+        """이전 형식 메타데이터 파일(knowledge_metadata.json) 가져오기 - 이미 가져왔으면 아무것도 하지 않음"""
         try:
-            if os.path.exists(self.metadata_file):
-                with open(self.metadata_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+            return self.metadata.migrate_from_json(self.metadata_file)
         except Exception as e:
             logger.error(f"메타데이터 로드 오류: {e}")
-        return {}
+        return 0
     
     def save_metadata(self):
-        """메타데이터 파일 저장"""
+        """모아둔 메타데이터 변경 사항 커밋"""
         try:
-            with open(self.metadata_file, 'w', encoding='utf-8') as f:
-                json.dump(self.file_hashes, f, indent=2, ensure_ascii=False)
+            self.metadata.commit()
         except Exception as e:
             logger.error(f"메타데이터 저장 오류: {e}")
     
+    @staticmethod
+    def source_key(file_path: str) -> str:
+        """메타데이터·포인트 ID 기준 키 (전체 경로 - 다른 폴더의 같은 이름 파일을 구분)"""
+        return os.path.abspath(file_path)
+    
     def get_file_hash(self, file_path: str) -> str:
         """파일의 MD5 해시 계산"""
-        hash_md5 = hashlib.md5()
         try:
-            with open(file_path, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hash_md5.update(chunk)
+            return hash_file(file_path)
         except Exception as e:
             logger.error(f"파일 해시 계산 오류: {e}")
             return ""
-        return hash_md5.hexdigest()
+    
+    def check_file(self, file_path: str) -> FileCheck:
+        """stat 우선 변경 감지 - stat이 같으면 해시를 계산하지 않음
+        
+        내용은 같고 stat만 바뀐 파일은 메타데이터의 stat 서명을 갱신합니다 (저장은 호출자가 수행).
+        """
+        record = self.metadata.get(self.source_key(file_path), with_chunks=False)
+        check = detect_change(file_path, record)
+        if check.signature_changed:
+            self.metadata.update_signature(record['path'], check.signature())
+        return check
     
     def is_file_updated(self, file_path: str) -> bool:
         """파일이 업데이트되었는지 확인"""
-        current_hash = self.get_file_hash(file_path)
-        filename = os.path.basename(file_path)
-        
-        if filename in self.file_hashes:
-            return self.file_hashes[filename]['hash'] != current_hash
-        return True  # 새 파일
+        return self.check_file(file_path).changed
     
     def embed_texts(self, texts: List[str]) -> List[List[float]]:
-        """텍스트 목록을 벡터로 임베딩"""
+        """텍스트 목록을 벡터로 임베딩 (캐시에 있는 텍스트는 인코딩 생략)
+        
+        인코딩에 실패하면 EmbeddingError - 검색되지 않는 0 벡터가 색인되고 파일이 최신으로 기록되는 것을 막음
+        """
         try:
-            embeddings = self.embedding_model.encode(texts)
-            return embeddings.tolist()
+            if self.embedding_cache is None:
+                return self.embedding_model.encode(texts, batch_size=self.embed_batch_size).tolist()
+            
+            embeddings = self.embedding_cache.get_many(texts)
+            missing = [i for i, vector in enumerate(embeddings) if vector is None]
+            if missing:
+                missing_texts = [texts[i] for i in missing]
+                encoded = self.embedding_model.encode(missing_texts, batch_size=self.embed_batch_size)
+                self.embedding_cache.put_many(missing_texts, encoded)
+                for i, vector in zip(missing, encoded):
+                    embeddings[i] = vector
+            return [vector.tolist() for vector in embeddings]
         except Exception as e:
             logger.error(f"임베딩 생성 오류: {e}")
-            return [[0.0] * self.vector_size] * len(texts)
+            raise EmbeddingError(f"임베딩 생성 실패 ({len(texts)}개 텍스트): {e}") from e
     
     def process_file(self, file_path: str, force_update: bool = False) -> Dict:
-        """파일 처리 및 벡터 DB 저장"""
+        """파일 처리 및 벡터 DB 저장
+        
+        파서가 생성하는 청크를 stream_batch_size개씩 임베딩·업서트하므로 메모리 사용량이 문서 길이와 무관합니다.
+        """
         filename = os.path.basename(file_path)
         
-        # 파일 업데이트 확인
-        if not force_update and not self.is_file_updated(file_path):
+        # 파일 업데이트 확인 (해시는 여기서 한 번만 계산해 저장 단계까지 사용)
+        file_check = self.check_file(file_path)
+        if not force_update and not file_check.changed:
+            if file_check.signature_changed:
+                self.save_metadata()
             logger.info(f"파일 '{filename}'은 변경되지 않았습니다. 건너뜀.")
             return {
                 'success': True,
@@ -392,100 +220,269 @@ class KnowledgeManager:
                 'skipped': True
             }
         
+        result = self.stream_file(file_path, file_check, force_update)
+        if result['success']:
+            self.save_metadata()
+        if self.embedding_cache is not None:
+            self.embedding_cache.flush()
+        return result
+    
+    def stream_file(self, file_path: str, file_check: FileCheck, force_update: bool = False) -> Dict:
+        """파서 출력을 stream_chunks로 처리 (오류는 실패 결과로 반환)"""
         try:
-            # 기존 파일 데이터 삭제 (증분 업데이트)
-            self.delete_file_from_db(filename)
-            
-            # 파일 파싱
-            chunks = self.parser.parse_file(file_path)
-            
-            if not chunks:
-                return {
-                    'success': False,
-                    'message': f'파일 {filename}에서 텍스트를 추출할 수 없습니다.',
-                    'chunks_added': 0
-                }
-            
-            # 임베딩 생성
-            texts = [chunk['content'] for chunk in chunks]
-            embeddings = self.embed_texts(texts)
-            
-            # Qdrant에 저장할 포인트 생성
-            points = []
-            current_time = datetime.now().isoformat()
-            file_hash = self.get_file_hash(file_path)
-            
-            for i, (chunk, embedding) in enumerate(zip(chunks, embeddings)):
-                point = PointStruct(
-                    id=str(uuid.uuid4()),
-                    vector=embedding,
-                    payload={
-                        'filename': filename,
-                        'content': chunk['content'],
-                        'file_hash': file_hash,
-                        'chunk_id': i,
-                        'total_chunks': len(chunks),
-                        'chunk_type': chunk.get('type', 'unknown'),
-                        'page': chunk.get('page'),
-                        'paragraph': chunk.get('paragraph'),
-                        'sheet': chunk.get('sheet'),
-                        'row': chunk.get('row'),
-                        'upload_time': current_time,
-                        'file_size': os.path.getsize(file_path),
-                        'file_ext': Path(file_path).suffix.lower()
-                    }
-                )
-                points.append(point)
-            
-            # Qdrant에 업서트
-            self.qdrant_client.upsert(
-                collection_name=self.collection_name,
-                points=points
-            )
-            
-            # 메타데이터 업데이트
-            self.file_hashes[filename] = {
-                'hash': file_hash,
-                'upload_time': current_time,
-                'chunks': len(chunks),
-                'file_size': os.path.getsize(file_path),
-                'file_ext': Path(file_path).suffix.lower()
+            return self.stream_chunks(file_path, self.parser.iter_file(file_path), file_check, force_update)
+        except Exception as e:
+            logger.error(f"파일 처리 오류 ({os.path.basename(file_path)}): {e}")
+            return {
+                'success': False,
+                'message': f'파일 {os.path.basename(file_path)} 처리 중 오류: {str(e)}',
+                'chunks_added': 0
             }
-            self.save_metadata()
-            
-            logger.info(f"파일 '{filename}' 처리 완료: {len(chunks)}개 청크")
-            
+    
+    def stream_chunks(self, file_path: str, chunks: Iterable[Dict], file_check: FileCheck,
+                      force_update: bool = False) -> Dict:
+        """청크 스트림을 배치 단위로 계획 → 새 청크만 임베딩 → 업서트
+        
+        파일 끝까지 유지하는 것은 포인트 ID와 청크 해시뿐이고, 전체 청크 수(total_chunks)는 마지막에 채웁니다.
+        """
+        filename = os.path.basename(file_path)
+        planner = self.chunk_planner(file_path, force_update)
+        current_time = datetime.now().isoformat()
+        
+        batches = batched(chunks, self.stream_batch_size)
+        batch = next(batches, None)
+        if batch is None:
             return {
-                'success': True,
-                'message': f'파일 {filename}이 성공적으로 처리되었습니다.',
-                'chunks_added': len(chunks),
-                'skipped': False
+                'success': False,
+                'message': f'파일 {filename}에서 텍스트를 추출할 수 없습니다.',
+                'chunks_added': 0
             }
-            
-        except Exception as e:
-            logger.error(f"파일 처리 오류 ({filename}): {e}")
+        
+        # 다음 배치를 미리 읽어 마지막 배치인지 확인 (마지막 배치는 전체 청크 수를 바로 기록)
+        batch_count = 0
+        streamed_ids = 0
+        while batch is not None:
+            following = next(batches, None)
+            plan = planner.add(batch)
+            upsert_key = self._upsert_key(file_path, file_check, batch_count, plan)
+            if batch_count == 0 and planner.full_replace:
+                self._replace_legacy(filename, upsert_key)
+            total = None if following is not None else plan.offset + len(batch)
+            texts = [batch[i]['content'] for i in plan.new_indices]
+            embeddings = self.embed_texts(texts) if texts else []
+            self._write_chunks(file_path, batch, embeddings, plan, file_check, upsert_key, total, current_time)
+            batch_count += 1
+            streamed_ids = plan.offset
+            batch = following
+        
+        if streamed_ids:
+            self.set_total_chunks(planner.point_ids[:streamed_ids], len(planner.point_ids))
+        removed_ids = planner.finish()
+        return self._finish_file(file_path, file_check, current_time, planner.point_ids, planner.hashes,
+                                 removed_ids, {'chunks_added': planner.added, 'chunks_kept': planner.kept,
+                                  'chunks_removed': len(removed_ids)})
+    
+    def _previous_ids(self, file_path: str) -> Optional[List[str]]:
+        metadata = self.metadata.get(self.source_key(file_path))
+        if metadata is None:
+            return []  # 새 파일
+        # 파일명 기준 이전 형식 메타데이터(포인트 ID 없음)는 None → 파일 단위 교체
+        return metadata.get('point_ids')
+    
+    def plan_chunks(self, file_path: str, chunks: List[Dict], force_update: bool = False) -> ChunkPlan:
+        """이전 색인과 비교한 청크 단위 갱신 계획 (force_update면 모든 청크 재임베딩)"""
+        return plan_update(self.source_key(file_path), chunks, self._previous_ids(file_path), reembed=force_update)
+    
+    def chunk_planner(self, file_path: str, force_update: bool = False) -> StreamingPlanner:
+        """plan_chunks의 스트리밍 버전 (청크를 배치로 나눠 계획)"""
+        return StreamingPlanner(self.source_key(file_path), self._previous_ids(file_path), reembed=force_update)
+    
+    def _cache_report(self, before: Dict) -> Dict:
+        """이번 실행 동안의 임베딩 캐시 적중 통계"""
+        after = self.embedding_cache.stats()
+        hits = after['hits'] - before['hits']
+        misses = after['misses'] - before['misses']
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / (hits + misses), 3) if hits + misses else 0.0,
+            'entries': after['entries'],
+            'capacity': after['capacity']
+        }
+    
+    def _plan_job(self, job, force_update: bool) -> List[int]:
+        job.extra['plan'] = self.plan_chunks(job.path, job.chunks, force_update)
+        return job.extra['plan'].new_indices
+    
+    def store_chunks(self, file_path: str, chunks: List[Dict], embeddings: List[List[float]],
+                     plan: Optional[ChunkPlan] = None, file_check: Optional[FileCheck] = None) -> Dict:
+        """파싱·임베딩이 끝난 청크를 벡터 DB에 반영하고 메타데이터 갱신 (파일 저장은 호출자가 수행)
+        
+        embeddings는 plan.new_indices 순서의 새 청크 벡터입니다.
+        """
+        filename = os.path.basename(file_path)
+        
+        if not chunks:
             return {
                 'success': False,
-                'message': f'파일 {filename} 처리 중 오류: {str(e)}',
+                'message': f'파일 {filename}에서 텍스트를 추출할 수 없습니다.',
                 'chunks_added': 0
             }
+        
+        if plan is None:
+            plan = self.plan_chunks(file_path, chunks)
+        if file_check is None:
+            file_check = detect_change(file_path, None)
+        
+        current_time = datetime.now().isoformat()
+        upsert_key = self._upsert_key(file_path, file_check, 0, plan)
+        if plan.full_replace:
+            self._replace_legacy(filename, upsert_key)
+        self._write_chunks(file_path, chunks, embeddings, plan, file_check, upsert_key, len(chunks), current_time)
+        return self._finish_file(file_path, file_check, current_time, plan.point_ids,
+                                 [chunk.get('hash') or chunk_hash(chunk) for chunk in chunks],
+                                 plan.removed_ids, plan.summary())
+    
+    def _upsert_key(self, file_path: str, file_check: FileCheck, batch_index: int, plan: ChunkPlan) -> str:
+        """업서트 체크포인트 키 - 파일 내용 해시 + 배치 번호 + 업서트할 포인트 ID 요약
+        
+        force_update 재시도처럼 같은 내용이라도 계획이 다르면 다른 키가 되어 이전 완료 배치를 건너뛰지 않습니다.
+        """
+        return f"{self.source_key(file_path)}:{file_check.file_hash}:{batch_index}:{plan.digest()}"
+    
+    def _replace_legacy(self, filename: str, first_upsert_key: str):
+        """이전 형식 데이터는 파일 단위로 삭제 - 같은 내용의 중단된 업서트를 이어가는 경우는 제외"""
+        if self.upserter.checkpoint.completed(first_upsert_key):
+            logger.info(f"파일 '{filename}' 업서트 이어서 진행")
+        else:
+            self.delete_file_from_db(filename, legacy_only=True)
+    
+    def _write_chunks(self, file_path: str, chunks: List[Dict], embeddings: List[List[float]], plan: ChunkPlan,
+                      file_check: FileCheck, upsert_key: str, total: Optional[int], current_time: str):
+        """새 청크 업서트 + 유지된 청크 위치 갱신 (chunks는 파일 전체 또는 plan.offset부터의 배치)"""
+        filename = os.path.basename(file_path)
+        file_hash = file_check.file_hash
+        file_size = file_check.size
+        file_ext = Path(file_path).suffix.lower()
+        
+        # Qdrant에 저장할 포인트 생성
+        points = []
+        for i, embedding in zip(plan.new_indices, embeddings):
+            chunk = chunks[i]
+            point = PointStruct(
+                id=plan.point_ids[i],
+                vector=embedding,
+                payload={
+                    'filename': filename,
+                    'source_path': self.source_key(file_path),
+                    'content': chunk['content'],
+                    'file_hash': file_hash,
+                    'chunk_type': chunk.get('type', 'unknown'),
+                    'sheet': chunk.get('sheet'),
+                    'upload_time': current_time,
+                    'file_size': file_size,
+                    'file_ext': file_ext,
+                    **position_payload(chunk, plan.offset + i, total)
+                }
+            )
+            points.append(point)
+        
+        # Qdrant에 배치 업서트 (실패 시 UpsertError, 체크포인트는 남겨 다음 시도에서 이어감)
+        if points:
+            self.upserter.upsert(points, upsert_key)
+        
+        # 내용이 그대로인 청크는 위치 정보만 갱신
+        if plan.kept_indices:
+            self.update_chunk_positions(chunks, plan, {'file_hash': file_hash, 'file_size': file_size}, total)
+    
+    def _finish_file(self, file_path: str, file_check: FileCheck, current_time: str, point_ids: List[str],
+                     chunk_hashes: List[str], removed_ids: List[str], summary: Dict[str, int]) -> Dict:
+        """사라진 청크 삭제, 체크포인트 정리, 메타데이터 갱신"""
+        filename = os.path.basename(file_path)
+        if removed_ids:
+            self.qdrant_client.delete(
+                collection_name=self.collection_name,
+                points_selector=PointIdsList(points=removed_ids)
+            )
+        # 이번 내용의 모든 배치·계획별 체크포인트 정리 (중단된 다른 계획의 키 포함)
+        self.upserter.checkpoint.clear_prefix(f"{self.source_key(file_path)}:{file_check.file_hash}:")
+        
+        # 메타데이터 업데이트 (파일 행 + 청크 행을 한 트랜잭션으로, 커밋은 호출자가 모아서 수행)
+        self.metadata.put(
+            self.source_key(file_path),
+            {
+                'hash': file_check.file_hash,
+                'upload_time': current_time,
+                'file_ext': Path(file_path).suffix.lower(),
+                **file_check.signature()
+            },
+            point_ids,
+            chunk_hashes
+        )
+        
+        logger.info(f"파일 '{filename}' 처리 완료: {len(point_ids)}개 청크 "
+                    f"(추가 {summary['chunks_added']}, 유지 {summary['chunks_kept']}, 삭제 {summary['chunks_removed']})")
+        
+        return {
+            'success': True,
+            'message': f'파일 {filename}이 성공적으로 처리되었습니다.',
+            'skipped': False,
+            **summary
+        }
+    
+    def update_chunk_positions(self, chunks: List[Dict], plan: ChunkPlan, extra_payload: Dict,
+                               total: Optional[int] = None):
+        """유지된 청크의 위치 페이로드 갱신 (벡터는 그대로, 요청 하나에 여러 포인트)"""
+        operations = [
+            SetPayloadOperation(set_payload=SetPayload(
+                payload={**position_payload(chunks[i], plan.offset + i, total), **extra_payload},
+                points=[plan.point_ids[i]]
+            ))
+            for i in plan.kept_indices
+        ]
+        batch_size = self.upserter.batch_size
+        for start in range(0, len(operations), batch_size):
+            self.qdrant_client.batch_update_points(
+                collection_name=self.collection_name,
+                update_operations=operations[start:start + batch_size]
+            )
     
-    def delete_file_from_db(self, filename: str):
-        """특정 파일의 모든 데이터를 DB에서 삭제"""
+    def set_total_chunks(self, point_ids: List[str], total: int):
+        """스트리밍 중 total_chunks 없이 기록한 포인트에 전체 청크 수 기록"""
+        batch_size = self.upserter.batch_size
+        operations = [
+            SetPayloadOperation(set_payload=SetPayload(
+                payload={'total_chunks': total},
+                points=point_ids[start:start + batch_size]
+            ))
+            for start in range(0, len(point_ids), batch_size)
+        ]
+        for start in range(0, len(operations), batch_size):
+            self.qdrant_client.batch_update_points(
+                collection_name=self.collection_name,
+                update_operations=operations[start:start + batch_size]
+            )
+    
+    def delete_file_from_db(self, filename: str, legacy_only: bool = False):
+        """특정 파일의 모든 데이터를 DB에서 삭제
+        
+        legacy_only면 source_path가 없는 이전 형식 포인트만 삭제합니다 (다른 폴더의 같은 이름 파일 보호).
+        """
         try:
             # 파일명으로 필터링하여 삭제
+            selector_filter = {
+                "must": [
+                    {
+                        "key": "filename",
+                        "match": {"value": filename}
+                    }
+                ]
+            }
+            if legacy_only:
+                selector_filter["must"].append({"is_empty": {"key": "source_path"}})
             self.qdrant_client.delete(
                 collection_name=self.collection_name,
-                points_selector={
-                    "filter": {
-                        "must": [
-                            {
-                                "key": "filename",
-                                "match": {"value": filename}
-                            }
-                        ]
-                    }
-                }
+                points_selector={"filter": selector_filter}
             )
             logger.info(f"파일 '{filename}'의 기존 데이터 삭제 완료")
         except Exception as e:
@@ -531,8 +528,9 @@ class KnowledgeManager:
             
             # 파일별 통계
             file_stats = {}
-            for filename, metadata in self.file_hashes.items():
-                file_stats[filename] = {
+            files = self.metadata.all_files()
+            for path, metadata in files.items():
+                file_stats[path] = {
                     'chunks': metadata['chunks'],
                     'upload_time': metadata['upload_time'],
                     'file_size': metadata['file_size'],
@@ -541,7 +539,7 @@ class KnowledgeManager:
             
             return {
                 'total_vectors': info.vectors_count,
-                'total_files': len(self.file_hashes),
+                'total_files': len(files),
                 'file_details': file_stats,
                 'collection_name': self.collection_name
             }
@@ -550,8 +548,29 @@ class KnowledgeManager:
             logger.error(f"통계 조회 오류: {e}")
             return {}
     
-    def process_directory(self, directory_path: str, force_update: bool = False) -> Dict:
-        """디렉토리 내 모든 지원 파일 처리"""
+    def process_directory(self, directory_path: str, force_update: bool = False,
+                          parse_workers: Optional[int] = None, progress_callback=None) -> Dict:
+        """디렉토리 내 모든 지원 파일 처리
+        
+        파싱은 프로세스 풀, 임베딩은 배치, 업서트는 동시 실행되는 파이프라인으로 처리합니다.
+        stream_min_bytes 이상인 파일은 파이프라인 대신 stream_chunks로 배치 단위 처리합니다.
+        """
+        file_paths = []
+        for root, dirs, files in os.walk(directory_path):
+            for file in files:
+                file_path = os.path.join(root, file)
+                if Path(file_path).suffix.lower() in self.SUPPORTED_EXTENSIONS:
+                    file_paths.append(file_path)
+        
+        results = self.process_files(file_paths, force_update, parse_workers, progress_callback)
+        logger.info(f"디렉토리 처리 완료: {results['processed_files']}/{results['total_files']} 파일")
+        return results
+    
+    def process_files(self, file_paths: List[str], force_update: bool = False,
+                      parse_workers: Optional[int] = None, progress_callback=None) -> Dict:
+        """파일 목록을 변경 감지 후 수집 파이프라인으로 처리 (변경 없는 파일은 건너뜀)"""
+        from ingestion.pipeline import IngestionPipeline, merge_progress, parse_document, split_streamed
+        
         results = {
             'total_files': 0,
             'processed_files': 0,
@@ -561,39 +580,193 @@ class KnowledgeManager:
             'details': []
         }
         
-        supported_extensions = {'.pdf', '.docx', '.doc', '.xlsx', '.xls', '.hwp', '.txt'}
-        
         try:
-            for root, dirs, files in os.walk(directory_path):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    file_ext = Path(file_path).suffix.lower()
-                    
-                    if file_ext in supported_extensions:
-                        results['total_files'] += 1
-                        
-                        result = self.process_file(file_path, force_update)
-                        results['details'].append({
-                            'filename': file,
-                            'result': result
-                        })
-                        
-                        if result['success']:
-                            if result.get('skipped', False):
-                                results['skipped_files'] += 1
-                            else:
-                                results['processed_files'] += 1
-                                results['total_chunks'] += result['chunks_added']
-                        else:
-                            results['failed_files'] += 1
+            pending = []
+            checks: Dict[str, FileCheck] = {}
+            for file_path in file_paths:
+                file = os.path.basename(file_path)
+                results['total_files'] += 1
+                
+                check = checks[file_path] = self.check_file(file_path)
+                if not force_update and not check.changed:
+                    results['skipped_files'] += 1
+                    results['details'].append({
+                        'filename': file,
+                        'result': {
+                            'success': True,
+                            'message': f'파일 {file}은 이미 최신 상태입니다.',
+                            'chunks_added': 0,
+                            'skipped': True
+                        }
+                    })
+                else:
+                    pending.append(file_path)
+            # 변경 감지 중 갱신한 서명은 파싱·임베딩 동안 쓰기 잠금을 잡고 있지 않도록 바로 커밋
+            self.metadata.commit()
+            
+            # 큰 파일은 이 프로세스에서 배치 단위로 스트리밍 (메모리 사용량이 문서 길이와 무관)
+            pending, streamed = split_streamed(pending, {path: checks[path].size for path in pending},
+                                               self.stream_min_bytes)
+            if streamed:
+                logger.info(f"📄 큰 파일 {len(streamed)}개는 스트리밍으로 처리 "
+                            f"({self.stream_min_bytes // (1024 * 1024)}MB 이상)")
+            streamed_done = {'completed_files': 0, 'failed_files': 0}
+            
+            def report(progress):
+                # 파이프라인 진행 상황에 스트리밍 처리한 파일 포함
+                if progress_callback is None:
+                    return
+                progress_callback(merge_progress(progress, len(streamed), streamed_done['completed_files'],
+                                                 streamed_done['failed_files']))
             
-            logger.info(f"디렉토리 처리 완료: {results['processed_files']}/{results['total_files']} 파일")
+            if parse_workers is None and os.getenv('INGEST_PARSE_WORKERS'):
+                parse_workers = int(os.getenv('INGEST_PARSE_WORKERS'))
+            if parse_workers is None and len(pending) <= self.inprocess_parse_max_files:
+                # 몇 개 안 되는 파일에 spawn 프로세스를 띄우는 비용이 파싱보다 큼
+                parse_workers = 0
+            
+            pipeline = IngestionPipeline(
+                parse_document,
+                self.embed_texts,
+                lambda job: self.store_chunks(job.path, job.chunks, job.embeddings, job.extra['plan'],
+                                              checks[job.path]),
+                plan_fn=lambda job: self._plan_job(job, force_update),
+                parse_workers=parse_workers,
+                embed_batch_size=self.embed_batch_size,
+                store_workers=int(os.getenv('INGEST_STORE_WORKERS', '4')),
+                progress_callback=report
+            )
+            cache_before = self.embedding_cache.stats() if self.embedding_cache is not None else None
+            summary = pipeline.run(pending)
+            self.save_metadata()
+            
+            file_results = [(job.filename, job.result) for job in pipeline.results]
+            for file_path in streamed:
+                result = self.stream_file(file_path, checks[file_path], force_update)
+                self.save_metadata()
+                streamed_done['completed_files' if result['success'] else 'failed_files'] += 1
+                file_results.append((os.path.basename(file_path), result))
+                report(pipeline.progress())
+            
+            for filename, result in file_results:
+                results['details'].append({
+                    'filename': filename,
+                    'result': result
+                })
+                if result and result['success']:
+                    results['processed_files'] += 1
+                    results['total_chunks'] += result['chunks_added']
+                else:
+                    results['failed_files'] += 1
+            
+            results['streamed_files'] = len(streamed)
+            # 스트리밍 처리한 파일까지 포함한 전체 시간
+            results['elapsed_seconds'] = pipeline.progress()['elapsed_seconds'] if streamed else summary['elapsed_seconds']
+            results['stages'] = summary['stages']
+            results['embedding_batches'] = summary['embedding_batches']
+            results['upserts'] = self.upserter.stats()
+            results['change_detection'] = {
+                'stat_only': sum(1 for check in checks.values() if not check.hashed),
+                'hashed': sum(1 for check in checks.values() if check.hashed)
+            }
+            if cache_before is not None:
+                self.embedding_cache.flush()
+                results['embedding_cache'] = self._cache_report(cache_before)
+                logger.info(f"🗃️ 임베딩 캐시: 적중 {results['embedding_cache']['hits']}, "
+                            f"미적중 {results['embedding_cache']['misses']} "
+                            f"(적중률 {results['embedding_cache']['hit_rate'] * 100:.1f}%)")
             
         except Exception as e:
-            logger.error(f"디렉토리 처리 오류: {e}")
+            logger.error(f"파일 일괄 처리 오류: {e}")
             results['error'] = str(e)
         
         return results
+    
+    def remove_file(self, file_path: str) -> bool:
+        """삭제된 파일의 포인트와 메타데이터 제거. 색인된 적 없는 파일이면 False"""
+        record = self.metadata.get(self.source_key(file_path))
+        if record is None:
+            return False
+        
+        if record['legacy']:
+            self.delete_file_from_db(record['filename'], legacy_only=True)
+        elif record.get('point_ids'):
+            self.qdrant_client.delete(
+                collection_name=self.collection_name,
+                points_selector=PointIdsList(points=record['point_ids'])
+            )
+        self.metadata.delete(record['path'])
+        logger.info(f"파일 '{record['filename']}' 삭제 반영: {record['chunks']}개 청크 제거")
+        return True
+    
+    def process_changes(self, changed: List[str], deleted: List[str]) -> Dict:
+        """감시자가 모은 변경만 증분 색인
+        
+        삭제된 디렉토리는 그 아래 색인된 파일을 모두 제거하고, 새로 생긴(옮겨온) 디렉토리는 하위 파일을 처리합니다.
+        """
+        removed = 0
+        for path in deleted:
+            key = self.source_key(path)
+            if os.path.exists(key):
+                continue  # 삭제 후 같은 경로에 다시 생김 → 변경으로 처리
+            if self.remove_file(key):
+                removed += 1
+            else:
+                for indexed in self.metadata.paths(prefix=key.rstrip(os.sep) + os.sep):
+                    removed += self.remove_file(indexed)
+        
+        file_paths = []
+        for path in changed + [path for path in deleted if os.path.exists(path)]:
+            if os.path.isdir(path):
+                for root, dirs, files in os.walk(path):
+                    file_paths.extend(os.path.join(root, file) for file in files
+                                      if Path(file).suffix.lower() in self.SUPPORTED_EXTENSIONS)
+            elif os.path.isfile(path) and Path(path).suffix.lower() in self.SUPPORTED_EXTENSIONS:
+                file_paths.append(path)
+        
+        results = self.process_files(sorted(set(file_paths))) if file_paths else {
+            'total_files': 0, 'processed_files': 0, 'skipped_files': 0, 'failed_files': 0, 'total_chunks': 0,
+            'details': []
+        }
+        self.save_metadata()
+        results['removed_files'] = removed
+        logger.info(f"👀 변경 반영: 처리 {results['processed_files']}, 건너뜀 {results['skipped_files']}, "
+                    f"실패 {results['failed_files']}, 삭제 {removed}")
+        return results
+    
+    def start_watching(self, directories: List[str], initial_sync: bool = True, **options):
+        """디렉토리 감시 시작 - 변경/삭제된 파일만 process_changes로 증분 색인
+        
+        initial_sync면 감시를 시작하며 각 디렉토리를 한 번 처리합니다 (stat이 같은 파일은 건너뜀).
+        """
+        from ingestion.watcher import DirectoryWatcher
+        
+        self.stop_watching()
+        sync = None
+        if initial_sync:
+            def sync():
+                for directory in directories:
+                    self.process_directory(directory)
+                    for path in self.metadata.paths(prefix=self.source_key(directory).rstrip(os.sep) + os.sep):
+                        if not os.path.exists(path):
+                            self.remove_file(path)
+                self.save_metadata()
+        self.watcher = DirectoryWatcher(
+            directories,
+            self.process_changes,
+            extensions=self.SUPPORTED_EXTENSIONS,
+            debounce_seconds=float(os.getenv('KNOWLEDGE_WATCH_DEBOUNCE', '2.0')),
+            poll_interval=float(os.getenv('KNOWLEDGE_WATCH_POLL_INTERVAL', '5.0')),
+            initial_sync=sync,
+            **options
+        )
+        self.watcher.start()
+        return self.watcher
+    
+    def stop_watching(self):
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.watcher = None
 
 # Flask Blueprint 생성
 knowledge_bp = Blueprint('knowledge', __name__)
@@ -607,6 +780,11 @@ def init_knowledge_manager():
     try:
         knowledge_manager = KnowledgeManager()
         logger.info("Knowledge Manager 초기화 완료")
+        
+        # KNOWLEDGE_WATCH_DIRS (os.pathsep 구분)에 지정한 디렉토리를 감시해 자동 증분 색인
+        watch_dirs = [d for d in os.getenv('KNOWLEDGE_WATCH_DIRS', '').split(os.pathsep) if d]
+        if watch_dirs:
+            knowledge_manager.start_watching(watch_dirs)
         return True
     except Exception as e:
         logger.error(f"Knowledge Manager 초기화 실패: {e}")
@@ -794,6 +972,7 @@ def admin_knowledge():
 # 사용 예시 및 CLI 도구
 if __name__ == "__main__":
     import argparse
+    import time
     
     parser = argparse.ArgumentParser(description='EX-GPT 지식 관리 시스템')
     parser.add_argument('--init', action='store_true', help='Qdrant 초기화')
@@ -802,6 +981,8 @@ if __name__ == "__main__":
     parser.add_argument('--search', type=str, help='검색 테스트')
     parser.add_argument('--stats', action='store_true', help='통계 보기')
     parser.add_argument('--force', action='store_true', help='강제 업데이트')
+    parser.add_argument('--workers', type=int, default=None, help='파싱 프로세스 수 (기본: CPU 코어 수)')
+    parser.add_argument('--watch', type=str, nargs='+', help='디렉토리 감시 후 변경 파일 자동 색인')
     
     args = parser.parse_args()
     
@@ -821,8 +1002,30 @@ if __name__ == "__main__":
         print(f"업로드 결과: {result}")
     
     elif args.process_dir:
-        result = km.process_directory(args.process_dir, args.force)
-        print(f"일괄 처리 결과: {result}")
+        def print_progress(progress):
+            print(f"  진행: {progress['completed_files'] + progress['failed_files']}/{progress['total_files']} "
+                  f"({progress['percent']}%), 경과 {progress['elapsed_seconds']}초")
+        
+        result = km.process_directory(args.process_dir, args.force, parse_workers=args.workers,
+                                      progress_callback=print_progress)
+        print(f"일괄 처리 결과: {result['processed_files']}/{result['total_files']} 처리, "
+              f"{result['skipped_files']} 건너뜀, {result['failed_files']} 실패, {result['total_chunks']}개 청크")
+        for stage, stats in result.get('stages', {}).items():
+            print(f"  {stage}: {stats['chunks_per_second']} 청크/초 (작업 {stats['busy_seconds']}초, 오류 {stats['errors']})")
+        if 'embedding_cache' in result:
+            cache = result['embedding_cache']
+            print(f"  임베딩 캐시: 적중 {cache['hits']}, 미적중 {cache['misses']} "
+                  f"(적중률 {cache['hit_rate'] * 100:.1f}%, {cache['entries']}/{cache['capacity']}개 저장)")
+    
+    elif args.watch:
+        watcher = km.start_watching(args.watch)
+        print(f"👀 감시 중 ({watcher.mode}): {', '.join(watcher.directories)} - Ctrl+C로 종료")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            km.stop_watching()
+            print(f"감시 종료: {watcher.status()['batches']}회 반영")
     
     elif args.search:
         results = km.search_documents(args.search)
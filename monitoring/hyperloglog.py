@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+EX-GPT HyperLogLog 고유 사용자 수 추정
+- 고정 메모리(2^p 바이트)로 고유 항목 수 추정 (p=12 → 4KB, 표준 오차 약 1.6%)
+- 레지스터 최대값 병합으로 여러 버킷/프로세스 결과 합산
+- 분 단위(1시간 보관) + 시간 단위(24시간 보관) 버킷으로 5분/1시간/24시간 슬라이딩 윈도우
+"""
+
+import base64
+import glob
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class HyperLogLog:
+    """HyperLogLog 스케치"""
+
+    def __init__(self, p: int = 12, registers: Optional[np.ndarray] = None):
+        if not 4 <= p <= 16:
+            raise ValueError("p는 4~16 사이여야 합니다")
+        self.p = p
+        self.m = 1 << p
+        self.registers = registers if registers is not None else np.zeros(self.m, dtype=np.uint8)
+
+    @staticmethod
+    def _hash(item) -> int:
+        data = item if isinstance(item, bytes) else str(item).encode('utf-8')
+        return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'big')
+
+    def add(self, item):
+        h = self._hash(item)
+        index = h >> (64 - self.p)
+        remaining = h & ((1 << (64 - self.p)) - 1)
+        # 남은 비트에서 첫 1의 위치 (모두 0이면 최대값)
+        rank = (64 - self.p) - remaining.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def update(self, items: Iterable):
+        for item in items:
+            self.add(item)
+
+    def count(self) -> int:
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m) if m >= 128 else {16: 0.673, 32: 0.697, 64: 0.709}[m]
+        estimate = alpha * m * m / np.sum(np.power(2.0, -self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            # 소규모 구간은 선형 카운팅
+            estimate = m * np.log(m / zeros)
+        return int(round(estimate))
+
+    def merge(self, other: 'HyperLogLog') -> 'HyperLogLog':
+        """레지스터별 최대값으로 병합 (제자리)"""
+        if other.p != self.p:
+            raise ValueError("정밀도(p)가 다른 스케치는 병합할 수 없습니다")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def copy(self) -> 'HyperLogLog':
+        return HyperLogLog(self.p, self.registers.copy())
+
+    def to_bytes(self) -> bytes:
+        return bytes([self.p]) + self.registers.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'HyperLogLog':
+        p = data[0]
+        return cls(p, np.frombuffer(data[1:], dtype=np.uint8).copy())
+
+
+class SlidingWindowDistinct:
+    """시간 창별 고유 항목 수
+
+    분 버킷은 60개, 시간 버킷은 24개만 유지하므로 트래픽과 무관하게
+    메모리는 (60 + 24) × 2^p 바이트로 고정됩니다.
+    shared_dir을 지정하면 각 프로세스가 add/count 시 자기 상태를 파일로 내보내고
+    (export_interval마다 최대 한 번) count 시 다른 프로세스 상태와 병합합니다 (gunicorn 다중 워커).
+    """
+
+    WINDOWS = {'5m': 300, '1h': 3600, '24h': 86400}
+
+    def __init__(self, p: int = 12, shared_dir: Optional[str] = None, export_interval: float = 30.0):
+        self.p = p
+        self.shared_dir = shared_dir
+        self.export_interval = export_interval
+        self._minutes: Dict[int, HyperLogLog] = {}
+        self._hours: Dict[int, HyperLogLog] = {}
+        self._lock = threading.Lock()
+        self._last_export = 0.0
+        if shared_dir:
+            os.makedirs(shared_dir, exist_ok=True)
+
+    def add(self, item, now: Optional[float] = None):
+        now = time.time() if now is None else now
+        minute, hour = int(now // 60), int(now // 3600)
+        with self._lock:
+            self._bucket(self._minutes, minute).add(item)
+            self._bucket(self._hours, hour).add(item)
+            self._prune(minute, hour)
+            # /metrics·통계 조회를 받지 않는 워커도 자기 사용자를 주기적으로 공유
+            snapshot = self._copy_locked() if self._export_due_locked(now) else None
+        if snapshot:
+            self._export(*snapshot)
+
+    def _bucket(self, buckets: Dict[int, HyperLogLog], key: int) -> HyperLogLog:
+        sketch = buckets.get(key)
+        if sketch is None:
+            sketch = buckets[key] = HyperLogLog(self.p)
+        return sketch
+
+    def _prune(self, minute: int, hour: int):
+        for key in [k for k in self._minutes if k <= minute - 60]:
+            del self._minutes[key]
+        for key in [k for k in self._hours if k <= hour - 24]:
+            del self._hours[key]
+
+    def _window_sketch(self, minutes: Dict[int, HyperLogLog], hours: Dict[int, HyperLogLog],
+                       seconds: int, now: float) -> HyperLogLog:
+        merged = HyperLogLog(self.p)
+        if seconds <= 3600:
+            first = int(now // 60) - seconds // 60 + 1
+            sketches = [s for k, s in minutes.items() if k >= first]
+        else:
+            first = int(now // 3600) - seconds // 3600 + 1
+            sketches = [s for k, s in hours.items() if k >= first]
+        for sketch in sketches:
+            merged.merge(sketch)
+        return merged
+
+    def counts(self, now: Optional[float] = None) -> Dict[str, int]:
+        """{'5m': n, '1h': n, '24h': n}"""
+        now = time.time() if now is None else now
+        with self._lock:
+            self._prune(int(now // 60), int(now // 3600))
+            minutes, hours = self._copy_locked()
+            export = self._export_due_locked(now)
+
+        if self.shared_dir:
+            if export:
+                self._export(minutes, hours)
+            self._merge_peers(minutes, hours, now)
+
+        return {name: self._window_sketch(minutes, hours, seconds, now).count()
+                for name, seconds in self.WINDOWS.items()}
+
+    # ---- 프로세스 간 공유 ----
+    def export_state(self, minutes=None, hours=None) -> Dict:
+        if minutes is None:
+            with self._lock:
+                minutes, hours = dict(self._minutes), dict(self._hours)
+        encode = lambda buckets: {str(k): base64.b64encode(s.to_bytes()).decode('ascii')
+                                  for k, s in buckets.items()}
+        return {'p': self.p, 'minutes': encode(minutes), 'hours': encode(hours)}
+
+    @staticmethod
+    def merge_state(state: Dict, minutes: Dict[int, HyperLogLog], hours: Dict[int, HyperLogLog]):
+        for target, key in ((minutes, 'minutes'), (hours, 'hours')):
+            for bucket, encoded in state.get(key, {}).items():
+                sketch = HyperLogLog.from_bytes(base64.b64decode(encoded))
+                existing = target.get(int(bucket))
+                if existing is None:
+                    target[int(bucket)] = sketch
+                else:
+                    existing.merge(sketch)
+
+    def _state_path(self, pid: int) -> str:
+        return os.path.join(self.shared_dir, f"active_users.{pid}.json")
+
+    def _copy_locked(self):
+        return ({k: s.copy() for k, s in self._minutes.items()},
+                {k: s.copy() for k, s in self._hours.items()})
+
+    def _export_due_locked(self, now: float) -> bool:
+        if not self.shared_dir or now - self._last_export < self.export_interval:
+            return False
+        self._last_export = now
+        return True
+
+    def _export(self, minutes, hours):
+        path = self._state_path(os.getpid())
+        try:
+            with open(f"{path}.tmp", 'w', encoding='utf-8') as f:
+                json.dump(self.export_state(minutes, hours), f)
+            os.replace(f"{path}.tmp", path)
+        except OSError as e:
+            logger.warning(f"활성 사용자 상태 저장 실패: {e}")
+
+    def _merge_peers(self, minutes, hours, now: float):
+        own = self._state_path(os.getpid())
+        for path in glob.glob(os.path.join(self.shared_dir, 'active_users.*.json')):
+            if path == own:
+                continue
+            try:
+                if now - os.path.getmtime(path) > 86400:
+                    os.remove(path)
+                    continue
+                with open(path, 'r', encoding='utf-8') as f:
+                    state = json.load(f)
+                if state.get('p') == self.p:
+                    self.merge_state(state, minutes, hours)
+            except (OSError, ValueError) as e:
+                logger.debug(f"활성 사용자 상태 병합 건너뜀 ({path}): {e}")
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+EX-GPT Prometheus 메트릭
+- 엔드포인트/모드별 요청 지연 히스토그램과 요청 수
+- 단계별(임베딩, 검색, LLM, 전처리, STT, 후처리) 소요 시간
+- 대기열 깊이, 캐시 적중/실패, STT 실시간 배율(RTF)
+- prometheus_client가 없으면 모든 메트릭은 아무 동작도 하지 않음
+
+gunicorn 등 다중 프로세스 실행 시 PROMETHEUS_MULTIPROC_DIR 환경변수를
+설정하고, 워커 종료 훅(child_exit)에서 mark_process_dead(worker.pid)를
+호출하세요.
+"""
+
+import functools
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Executor, Future
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+try:
+    from prometheus_client import (
+        CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+    )
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+    CONTENT_TYPE_LATEST = 'text/plain; version=0.0.4; charset=utf-8'
+    logger.warning("⚠️ prometheus_client 사용 불가 - 메트릭 수집 비활성화")
+
+MULTIPROC_DIR = os.getenv('PROMETHEUS_MULTIPROC_DIR') or os.getenv('prometheus_multiproc_dir')
+
+PROCESS_START_TIME = time.time()
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+RTF_BUCKETS = (0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 1.5, 2.0, 5.0)
+
+
+class _NoopMetric:
+    """prometheus_client가 없을 때 사용하는 빈 메트릭"""
+
+    def labels(self, *args, **kwargs):
+        return self
+
+    def inc(self, amount=1):
+        pass
+
+    def dec(self, amount=1):
+        pass
+
+    def set(self, value):
+        pass
+
+    def observe(self, value):
+        pass
+
+
+if PROMETHEUS_AVAILABLE:
+    REQUEST_LATENCY = Histogram(
+        'exgpt_request_duration_seconds', 'HTTP 요청 처리 시간',
+        ['endpoint', 'method', 'mode', 'status'], buckets=LATENCY_BUCKETS
+    )
+    REQUESTS_TOTAL = Counter(
+        'exgpt_requests_total', 'HTTP 요청 수', ['endpoint', 'method', 'mode', 'status']
+    )
+    STAGE_LATENCY = Histogram(
+        'exgpt_stage_duration_seconds', '처리 단계별 소요 시간', ['stage'], buckets=LATENCY_BUCKETS
+    )
+    STAGE_ERRORS = Counter('exgpt_stage_errors_total', '처리 단계 예외 수', ['stage'])
+    QUEUE_DEPTH = Gauge(
+        'exgpt_queue_depth', '대기열/진행 중 작업 수', ['queue'], multiprocess_mode='livesum'
+    )
+    CACHE_REQUESTS = Counter('exgpt_cache_requests_total', '캐시 조회 수', ['cache', 'result'])
+    STT_RTF = Histogram(
+        'exgpt_stt_real_time_factor', 'STT 처리 시간 / 오디오 길이', ['engine'], buckets=RTF_BUCKETS
+    )
+    STT_AUDIO_SECONDS = Counter('exgpt_stt_audio_seconds_total', '인식한 오디오 길이(초)', ['engine'])
+else:
+    REQUEST_LATENCY = REQUESTS_TOTAL = STAGE_LATENCY = STAGE_ERRORS = _NoopMetric()
+    QUEUE_DEPTH = CACHE_REQUESTS = STT_RTF = STT_AUDIO_SECONDS = _NoopMetric()
+
+
+def observe_request(endpoint: str, method: str, mode: str, status: int, seconds: float):
+    """요청 하나의 지연/결과 기록 (status는 HTTP 상태 코드)"""
+    labels = (endpoint, method, mode or '', str(status))
+    REQUEST_LATENCY.labels(*labels).observe(seconds)
+    REQUESTS_TOTAL.labels(*labels).inc()
+
+
+@contextmanager
+def stage_timer(stage: str):
+    """처리 단계 소요 시간 기록"""
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        STAGE_ERRORS.labels(stage).inc()
+        raise
+    finally:
+        STAGE_LATENCY.labels(stage).observe(time.perf_counter() - started)
+
+
+def timed_stage(stage: str):
+    """함수 전체를 한 단계로 기록하는 데코레이터"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage_timer(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def set_queue_depth(queue: str, depth: int):
+    QUEUE_DEPTH.labels(queue).set(depth)
+
+
+@contextmanager
+def track_queue(queue: str):
+    """구간에 들어오고 나갈 때 대기열 깊이 증감 (진행 중 작업 수)"""
+    gauge = QUEUE_DEPTH.labels(queue)
+    gauge.inc()
+    try:
+        yield
+    finally:
+        gauge.dec()
+
+
+def submit_tracked(executor: Executor, queue: str, fn, *args, **kwargs) -> Future:
+    """executor.submit + 실행을 기다리는 작업 수 기록 (실행 시작 또는 취소 시 감소)"""
+    gauge = QUEUE_DEPTH.labels(queue)
+    started = threading.Event()
+
+    def run():
+        started.set()
+        gauge.dec()
+        return fn(*args, **kwargs)
+
+    gauge.inc()
+    try:
+        future = executor.submit(run)
+    except Exception:
+        gauge.dec()
+        raise
+    future.add_done_callback(lambda f: None if started.is_set() else gauge.dec())
+    return future
+
+
+def record_cache(cache: str, hit: bool):
+    CACHE_REQUESTS.labels(cache, 'hit' if hit else 'miss').inc()
+
+
+def observe_stt(engine: str, rtf: float, audio_seconds: float):
+    if audio_seconds > 0:
+        STT_RTF.labels(engine).observe(rtf)
+        STT_AUDIO_SECONDS.labels(engine).inc(audio_seconds)
+
+
+def uptime_seconds() -> float:
+    return time.time() - PROCESS_START_TIME
+
+
+def render_metrics():
+    """/metrics 응답 본문과 Content-Type
+
+    다중 프로세스 모드에서는 모든 워커의 값을 합쳐서 반환합니다.
+    """
+    if not PROMETHEUS_AVAILABLE:
+        return b'# prometheus_client not installed\n', CONTENT_TYPE_LATEST
+
+    if MULTIPROC_DIR:
+        from prometheus_client import multiprocess
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid: int):
+    """gunicorn child_exit 훅에서 호출 - 종료된 워커의 live gauge 파일 정리"""
+    if PROMETHEUS_AVAILABLE and MULTIPROC_DIR:
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(pid)
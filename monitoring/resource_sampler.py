@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+EX-GPT 호스트/GPU 자원 샘플러
+- 백그라운드 스레드가 주기적으로 CPU·RSS·GPU 메모리/사용률/온도를 수집해 링 버퍼에 기록
+- 요청 처리 경로에서는 장치를 직접 조회하지 않고 마지막 샘플만 읽음
+- GPU 조회 순서: pynvml (nvidia-ml-py) → torch.cuda → 없음 (CPU 서버)
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    psutil = None
+    PSUTIL_AVAILABLE = False
+
+try:
+    import pynvml
+    NVML_AVAILABLE = True
+except ImportError:
+    pynvml = None
+    NVML_AVAILABLE = False
+
+_nvml_lock = threading.Lock()
+_nvml_ready: Optional[bool] = None
+
+
+def _init_nvml() -> bool:
+    """NVML 초기화 (한 번만 시도, 드라이버가 없으면 이후 호출은 바로 False)"""
+    global _nvml_ready
+    if _nvml_ready is not None:
+        return _nvml_ready
+    with _nvml_lock:
+        if _nvml_ready is None:
+            if not NVML_AVAILABLE:
+                _nvml_ready = False
+            else:
+                try:
+                    pynvml.nvmlInit()
+                    _nvml_ready = True
+                except Exception as e:
+                    logger.info(f"NVML 사용 불가, torch.cuda로 대체: {e}")
+                    _nvml_ready = False
+    return _nvml_ready
+
+
+def gpu_temperature(index: int) -> Optional[float]:
+    """GPU 온도(°C), 조회할 수 없으면 None"""
+    if not _init_nvml():
+        return None
+    try:
+        handle = pynvml.nvmlDeviceGetHandleByIndex(index)
+        return float(pynvml.nvmlDeviceGetTemperature(handle, pynvml.NVML_TEMPERATURE_GPU))
+    except Exception:
+        return None
+
+
+def _query_nvml() -> List[Dict[str, Any]]:
+    gpus = []
+    for i in range(pynvml.nvmlDeviceGetCount()):
+        handle = pynvml.nvmlDeviceGetHandleByIndex(i)
+        memory = pynvml.nvmlDeviceGetMemoryInfo(handle)
+        try:
+            utilization = float(pynvml.nvmlDeviceGetUtilizationRates(handle).gpu)
+        except Exception:
+            utilization = None
+        try:
+            temperature = float(pynvml.nvmlDeviceGetTemperature(handle, pynvml.NVML_TEMPERATURE_GPU))
+        except Exception:
+            temperature = None
+        name = pynvml.nvmlDeviceGetName(handle)
+        gpus.append({
+            'index': i,
+            'name': name.decode('utf-8', 'replace') if isinstance(name, bytes) else name,
+            'memory_used_gb': round(memory.used / 1024**3, 2),
+            'memory_total_gb': round(memory.total / 1024**3, 2),
+            'utilization_percent': utilization,
+            'temperature_c': temperature
+        })
+    return gpus
+
+
+def _query_torch() -> List[Dict[str, Any]]:
+    try:
+        import torch
+    except ImportError:
+        return []
+    if not torch.cuda.is_available():
+        return []
+
+    gpus = []
+    for i in range(torch.cuda.device_count()):
+        free, total = torch.cuda.mem_get_info(i)
+        gpus.append({
+            'index': i,
+            'name': torch.cuda.get_device_name(i),
+            'memory_used_gb': round((total - free) / 1024**3, 2),
+            'memory_total_gb': round(total / 1024**3, 2),
+            'utilization_percent': None,
+            'temperature_c': None
+        })
+    return gpus
+
+
+def query_gpus() -> List[Dict[str, Any]]:
+    """장치별 GPU 상태 (GPU가 없으면 빈 리스트)"""
+    try:
+        if _init_nvml():
+            return _query_nvml()
+        return _query_torch()
+    except Exception as e:
+        logger.warning(f"GPU 상태 조회 실패: {e}")
+        return []
+
+
+class ResourceSample:
+    """자원 샘플 한 건"""
+
+    __slots__ = ('timestamp', 'cpu_percent', 'rss_mb', 'system_memory_percent', 'gpus')
+
+    def __init__(self, timestamp: float, cpu_percent: Optional[float], rss_mb: Optional[float],
+                 system_memory_percent: Optional[float], gpus: List[Dict[str, Any]]):
+        self.timestamp = timestamp
+        self.cpu_percent = cpu_percent
+        self.rss_mb = rss_mb
+        self.system_memory_percent = system_memory_percent
+        self.gpus = gpus
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class ResourceSampler:
+    """주기적 자원 샘플링 스레드
+
+    사용 예:
+        sampler = ResourceSampler(stats_data['gpu_usage_history'], interval=5.0)
+        sampler.start()
+        sampler.latest()
+    """
+
+    def __init__(self, buffer, interval: float = 5.0):
+        self.buffer = buffer
+        self.interval = interval
+        self._latest: Optional[ResourceSample] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._process = psutil.Process(os.getpid()) if PSUTIL_AVAILABLE else None
+        if self._process is not None:
+            # 첫 cpu_percent 호출은 기준점만 잡고 0을 반환
+            self._process.cpu_percent(None)
+
+    def sample_once(self) -> ResourceSample:
+        cpu_percent = rss_mb = memory_percent = None
+        if self._process is not None:
+            try:
+                cpu_percent = self._process.cpu_percent(None)
+                rss_mb = round(self._process.memory_info().rss / 1024**2, 1)
+                memory_percent = psutil.virtual_memory().percent
+            except psutil.Error as e:
+                logger.debug(f"프로세스 자원 조회 실패: {e}")
+
+        sample = ResourceSample(time.time(), cpu_percent, rss_mb, memory_percent, query_gpus())
+        self._latest = sample
+        self.buffer.append(sample)
+        return sample
+
+    def latest(self) -> Optional[Dict[str, Any]]:
+        """마지막 샘플 (아직 없으면 None)"""
+        sample = self._latest
+        return sample.to_dict() if sample else None
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.sample_once()
+            except Exception as e:
+                logger.warning(f"자원 샘플링 실패: {e}")
+            self._stop.wait(self.interval)
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='resource-sampler', daemon=True)
+        self._thread.start()
+        logger.info(f"📈 자원 샘플러 시작 ({self.interval}초 간격)")
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
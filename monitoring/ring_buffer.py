@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+EX-GPT 고정 용량 링 버퍼
+- 최근 요청 로그 / 자원 사용 이력용, append O(1) (가장 오래된 항목 자동 폐기)
+- 스레드 안전 append와 스냅샷 조회
+- 선택적으로 append-only JSONL 파일에 기록해 메모리 밖 이력 보존
+  (최대 크기를 넘으면 .1 파일로 한 번 교체 - 디스크 사용량은 최대 크기의 약 2배)
+"""
+
+import json
+import logging
+import os
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class RequestLogRecord:
+    """요청 로그 한 건 (__slots__로 항목당 메모리 최소화)"""
+
+    __slots__ = ('timestamp', 'type', 'user', 'action', 'status', 'processing_time')
+
+    def __init__(self, timestamp: str, type: str, user: str, action: str, status: str, processing_time: str):
+        self.timestamp = timestamp
+        self.type = type
+        self.user = user
+        self.action = action
+        self.status = status
+        self.processing_time = processing_time
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def _as_dict(item) -> Any:
+    to_dict = getattr(item, 'to_dict', None)
+    return to_dict() if to_dict else item
+
+
+class RingBuffer:
+    """고정 용량 스레드 안전 링 버퍼
+
+    Args:
+        capacity: 메모리에 유지할 최대 항목 수
+        spill_path: 지정하면 모든 항목을 JSONL로 추가 기록 (history()에서 사용)
+        spill_max_bytes: JSONL 파일 최대 크기 - 넘으면 spill_path.1로 이름을 바꾸고 새 파일 시작
+    """
+
+    def __init__(self, capacity: int, spill_path: Optional[str] = None,
+                 spill_max_bytes: int = 50 * 1024 * 1024):
+        self.capacity = capacity
+        self.spill_path = spill_path or None
+        self.spill_max_bytes = spill_max_bytes
+        self._items: Deque[Any] = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._spill_lock = threading.Lock()
+        self._spill_file = None
+        self._spill_bytes = 0
+        self.total_appended = 0
+
+        if self.spill_path:
+            directory = os.path.dirname(self.spill_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._open_spill()
+
+    @property
+    def rollover_path(self) -> Optional[str]:
+        return f"{self.spill_path}.1" if self.spill_path else None
+
+    def _open_spill(self):
+        self._spill_file = open(self.spill_path, 'a', encoding='utf-8', buffering=1)
+        self._spill_bytes = self._spill_file.tell()
+
+    def _rollover_locked(self):
+        """현재 파일을 .1로 교체 (이전 .1은 삭제, RotatingFileHandler backupCount=1과 같은 방식)"""
+        self._spill_file.close()
+        try:
+            os.replace(self.spill_path, self.rollover_path)
+        finally:
+            self._open_spill()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def append(self, item: Any):
+        with self._lock:
+            self._items.append(item)
+            self.total_appended += 1
+
+        if self._spill_file is not None:
+            line = json.dumps(_as_dict(item), ensure_ascii=False, default=str) + '\n'
+            size = len(line.encode('utf-8'))
+            with self._spill_lock:
+                if self._spill_file is None:
+                    return
+                try:
+                    if self._spill_bytes and self._spill_bytes + size > self.spill_max_bytes:
+                        self._rollover_locked()
+                    self._spill_file.write(line)
+                    self._spill_bytes += size
+                except (OSError, ValueError) as e:
+                    logger.warning(f"링 버퍼 파일 기록 실패: {e}")
+
+    def snapshot(self, limit: Optional[int] = None, newest_first: bool = True) -> List[Any]:
+        """현재 항목 복사본 (dict로 변환, 기본은 최신순)"""
+        with self._lock:
+            items = list(self._items)
+        if newest_first:
+            items.reverse()
+        if limit is not None:
+            items = items[:limit]
+        return [_as_dict(item) for item in items]
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def history(self, limit: int) -> List[Dict]:
+        """최신순 최대 limit개 - 메모리 용량을 넘으면 JSONL 파일(부족하면 .1 파일까지) 끝에서 읽음"""
+        if limit <= len(self._items) or not self.spill_path:
+            return self.snapshot(limit)
+        lines = tail_lines(self.spill_path, limit)
+        if len(lines) < limit:
+            lines = tail_lines(self.rollover_path, limit - len(lines)) + lines
+        records = []
+        for line in reversed(lines):
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+        return records
+
+    def close(self):
+        if self._spill_file is not None:
+            with self._spill_lock:
+                self._spill_file.close()
+                self._spill_file = None
+
+
+def tail_lines(path: str, count: int, block_size: int = 64 * 1024) -> List[str]:
+    """파일 끝에서 count줄 읽기 (파일 전체를 읽지 않음)"""
+    if count <= 0 or not os.path.exists(path):
+        return []
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        data = b''
+        while position > 0 and data.count(b'\n') <= count:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            data = f.read(read_size) + data
+    lines = data.decode('utf-8', errors='replace').splitlines()
+    return [line for line in lines if line.strip()][-count:]
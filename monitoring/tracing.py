@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+EX-GPT 경량 요청 추적 (tracing)
+- contextvars 기반 스팬 (시작/종료 시각, 속성, 부모 ID)
+- 요청 단위 샘플링: 샘플링되지 않은 요청은 컨텍스트 변수 조회 한 번으로 끝남
+- 완료된 추적은 메모리에 제한된 개수만 보관하고 OTLP/JSON 파일로 내보냄
+"""
+
+import contextvars
+import functools
+import json
+import logging
+import os
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_active_span: contextvars.ContextVar = contextvars.ContextVar('exgpt_active_span', default=None)
+
+
+class Span:
+    """추적 구간"""
+
+    __slots__ = ('trace', 'span_id', 'parent_id', 'name', 'start_ns', 'end_ns', 'attributes', 'error')
+
+    def __init__(self, trace: 'Trace', name: str, parent_id: Optional[str] = None,
+                 attributes: Optional[Dict[str, Any]] = None):
+        self.trace = trace
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.name = name
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = dict(attributes) if attributes else {}
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def record_error(self, exc: BaseException):
+        self.error = f"{type(exc).__name__}: {exc}"
+
+    def end(self):
+        if self.end_ns is None:
+            self.end_ns = time.time_ns()
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+
+class _NoopSpan:
+    """샘플링되지 않은 요청에서 사용하는 빈 스팬"""
+
+    __slots__ = ()
+
+    def set_attribute(self, key, value):
+        pass
+
+    def record_error(self, exc):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Trace:
+    """요청 하나의 스팬 모음"""
+
+    __slots__ = ('trace_id', 'request_id', 'spans', 'lock')
+
+    def __init__(self, request_id: str):
+        self.trace_id = uuid.uuid4().hex
+        self.request_id = request_id
+        self.spans: List[Span] = []
+        self.lock = threading.Lock()
+
+    def add(self, span: Span):
+        with self.lock:
+            self.spans.append(span)
+
+    def to_dict(self) -> Dict:
+        """디버그 조회용 (루트 기준 상대 시각, 시작 순 정렬)"""
+        with self.lock:
+            spans = sorted(self.spans, key=lambda s: s.start_ns)
+        if not spans:
+            return {'request_id': self.request_id, 'trace_id': self.trace_id, 'spans': []}
+
+        origin = spans[0].start_ns
+        depth = {}
+        items = []
+        for span in spans:
+            depth[span.span_id] = depth.get(span.parent_id, -1) + 1
+            items.append({
+                'name': span.name,
+                'span_id': span.span_id,
+                'parent_id': span.parent_id,
+                'depth': depth[span.span_id],
+                'start_ms': round((span.start_ns - origin) / 1e6, 2),
+                'duration_ms': round(span.duration_ms, 2),
+                'attributes': span.attributes,
+                'error': span.error
+            })
+        return {
+            'request_id': self.request_id,
+            'trace_id': self.trace_id,
+            'duration_ms': items[0]['duration_ms'],
+            'spans': items
+        }
+
+
+def _otlp_value(value: Any) -> Dict:
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    return {'stringValue': str(value)}
+
+
+class OTLPJsonFileExporter:
+    """OTLP/JSON(ExportTraceServiceRequest) 형식으로 한 줄에 추적 하나씩 기록
+
+    OpenTelemetry Collector의 otlpjsonfile 수신기 등으로 그대로 읽을 수 있습니다.
+    """
+
+    def __init__(self, path: str, service_name: str = 'ex-gpt'):
+        self.path = path
+        self.service_name = service_name
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def to_otlp(self, trace: Trace) -> Dict:
+        with trace.lock:
+            spans = list(trace.spans)
+        return {
+            'resourceSpans': [{
+                'resource': {'attributes': [
+                    {'key': 'service.name', 'value': {'stringValue': self.service_name}}
+                ]},
+                'scopeSpans': [{
+                    'scope': {'name': 'exgpt.tracing'},
+                    'spans': [{
+                        'traceId': trace.trace_id,
+                        'spanId': span.span_id,
+                        'parentSpanId': span.parent_id or '',
+                        'name': span.name,
+                        'kind': 2 if span.parent_id is None else 1,
+                        'startTimeUnixNano': str(span.start_ns),
+                        'endTimeUnixNano': str(span.end_ns or span.start_ns),
+                        'attributes': [
+                            {'key': key, 'value': _otlp_value(value)}
+                            for key, value in {**span.attributes, 'request.id': trace.request_id}.items()
+                        ],
+                        'status': {'code': 2, 'message': span.error} if span.error else {'code': 1}
+                    } for span in spans]
+                }]
+            }]
+        }
+
+    def export(self, trace: Trace):
+        line = json.dumps(self.to_otlp(trace), ensure_ascii=False, default=str)
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+
+
+class Tracer:
+    """요청 단위 샘플링 추적기
+
+    사용 예:
+        handle = tracer.start_trace('POST /api/chat', request_id, force=False)
+        with tracer.span('search_documents', limit=3):
+            ...
+        tracer.end_trace(handle)
+    """
+
+    def __init__(self, sample_rate: float = 0.0, exporter: Optional[OTLPJsonFileExporter] = None,
+                 max_traces: int = 500):
+        self.sample_rate = sample_rate
+        self.exporter = exporter
+        self.max_traces = max_traces
+        self._traces: "OrderedDict[str, Trace]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def start_trace(self, name: str, request_id: str, force: bool = False,
+                    attributes: Optional[Dict[str, Any]] = None):
+        """루트 스팬 시작. 반환값은 end_trace에 그대로 전달"""
+        sampled = force or (self.sample_rate > 0 and random.random() < self.sample_rate)
+        if not sampled:
+            return None, _active_span.set(None)
+
+        trace = Trace(request_id)
+        root = Span(trace, name, attributes=attributes)
+        trace.add(root)
+        return root, _active_span.set(root)
+
+    def end_trace(self, handle, attributes: Optional[Dict[str, Any]] = None):
+        root, token = handle
+        try:
+            _active_span.reset(token)
+        except ValueError:
+            # 다른 컨텍스트에서 종료되는 경우 (스트리밍 응답 등)
+            _active_span.set(None)
+        if root is None:
+            return
+
+        if attributes:
+            root.attributes.update(attributes)
+        root.end()
+        trace = root.trace
+        with self._lock:
+            self._traces[trace.request_id] = trace
+            while len(self._traces) > self.max_traces:
+                self._traces.popitem(last=False)
+
+        if self.exporter:
+            try:
+                self.exporter.export(trace)
+            except OSError as e:
+                logger.warning(f"추적 내보내기 실패: {e}")
+
+    @staticmethod
+    def is_recording() -> bool:
+        return _active_span.get() is not None
+
+    @staticmethod
+    def current_span():
+        """현재 스팬 (샘플링되지 않았으면 빈 스팬)"""
+        return _active_span.get() or NOOP_SPAN
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        parent = _active_span.get()
+        if parent is None:
+            yield NOOP_SPAN
+            return
+
+        span = Span(parent.trace, name, parent.span_id, attributes)
+        parent.trace.add(span)
+        token = _active_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_error(e)
+            raise
+        finally:
+            span.end()
+            _active_span.reset(token)
+
+    def traced(self, name: Optional[str] = None):
+        """함수 호출을 스팬으로 기록하는 데코레이터"""
+        def decorator(func):
+            span_name = name or func.__name__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if _active_span.get() is None:
+                    return func(*args, **kwargs)
+                with self.span(span_name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    @staticmethod
+    def bind(func):
+        """현재 추적 컨텍스트를 스레드 풀 작업에 전달"""
+        context = contextvars.copy_context()
+        return functools.partial(context.run, func)
+
+    def get_trace(self, request_id: str) -> Optional[Dict]:
+        with self._lock:
+            trace = self._traces.get(request_id)
+        return trace.to_dict() if trace else None
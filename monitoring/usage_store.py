@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+EX-GPT 사용량 분석 저장소 (SQLite)
+- 요청 이벤트를 큐에 넣고 백그라운드 스레드가 배치로 기록 (요청 경로에서 디스크 I/O 없음)
+- 기록과 같은 트랜잭션에서 일별(엔드포인트·모드) 집계 테이블을 upsert
+- 대시보드는 집계 테이블만 조회, 재시작 후에도 이력 유지
+"""
+
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS usage_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts REAL NOT NULL,
+    day TEXT NOT NULL,
+    endpoint TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    user TEXT,
+    latency_ms REAL,
+    docs_found INTEGER,
+    status TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_usage_events_day ON usage_events (day);
+
+CREATE TABLE IF NOT EXISTS usage_daily (
+    day TEXT NOT NULL,
+    endpoint TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    requests INTEGER NOT NULL DEFAULT 0,
+    successes INTEGER NOT NULL DEFAULT 0,
+    failures INTEGER NOT NULL DEFAULT 0,
+    total_latency_ms REAL NOT NULL DEFAULT 0,
+    max_latency_ms REAL NOT NULL DEFAULT 0,
+    docs_found INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, endpoint, mode)
+);
+"""
+
+UPSERT_DAILY = """
+INSERT INTO usage_daily (day, endpoint, mode, requests, successes, failures,
+                         total_latency_ms, max_latency_ms, docs_found)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (day, endpoint, mode) DO UPDATE SET
+    requests = requests + excluded.requests,
+    successes = successes + excluded.successes,
+    failures = failures + excluded.failures,
+    total_latency_ms = total_latency_ms + excluded.total_latency_ms,
+    max_latency_ms = MAX(max_latency_ms, excluded.max_latency_ms),
+    docs_found = docs_found + excluded.docs_found
+"""
+
+
+class UsageStore:
+    """배치 기록 + 일별 집계 사용량 저장소
+
+    사용 예:
+        store = UsageStore('data/usage.db')
+        store.record('/api/chat', 'think', 'user1', 1.2, 'success', docs_found=3)
+        store.daily_totals(15)
+    """
+
+    def __init__(self, db_path: str = 'data/usage.db', batch_size: int = 200,
+                 flush_interval: float = 2.0, max_queue: int = 10000):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._read_lock = threading.Lock()
+        self._conn = self._connect()
+        self._conn.executescript(SCHEMA)
+        self._reader = self._connect()
+
+        self._writer = threading.Thread(target=self._run, name='usage-writer', daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def record(self, endpoint: str, mode: str, user: Optional[str], latency_seconds: Optional[float],
+               status: str, docs_found: Optional[int] = None, timestamp: Optional[float] = None):
+        """이벤트 추가 (블로킹 없음, 큐가 가득 차면 버림)"""
+        event = (timestamp or time.time(), endpoint or '', mode or '', user,
+                 latency_seconds * 1000 if latency_seconds is not None else None, docs_found, status)
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self, timeout: float = 10.0):
+        """큐에 쌓인 이벤트가 모두 기록될 때까지 대기"""
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def _run(self):
+        while True:
+            batch, markers = [], []
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if isinstance(item, threading.Event):
+                    markers.append(item)
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+
+            if batch:
+                try:
+                    self._write_batch(batch)
+                except sqlite3.Error as e:
+                    logger.error(f"❌ 사용량 기록 실패 ({len(batch)}건): {e}")
+            for marker in markers:
+                marker.set()
+
+    def _write_batch(self, batch: List[tuple]):
+        rows = []
+        rollups: Dict[tuple, List[float]] = defaultdict(lambda: [0, 0, 0, 0.0, 0.0, 0])
+        for ts, endpoint, mode, user, latency_ms, docs_found, status in batch:
+            day = datetime.fromtimestamp(ts).strftime('%Y-%m-%d')
+            rows.append((ts, day, endpoint, mode, user, latency_ms, docs_found, status))
+
+            rollup = rollups[(day, endpoint, mode)]
+            rollup[0] += 1
+            if status == 'success':
+                rollup[1] += 1
+            else:
+                rollup[2] += 1
+            rollup[3] += latency_ms or 0.0
+            rollup[4] = max(rollup[4], latency_ms or 0.0)
+            rollup[5] += docs_found or 0
+
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO usage_events (ts, day, endpoint, mode, user, latency_ms, docs_found, status) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            self._conn.executemany(UPSERT_DAILY, [key + tuple(values) for key, values in rollups.items()])
+
+    # ---- 조회 (집계 테이블만 사용) ----
+    def _query(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self._read_lock:
+            return self._reader.execute(sql, params).fetchall()
+
+    @staticmethod
+    def _first_day(days: int) -> str:
+        return (datetime.now() - timedelta(days=days - 1)).strftime('%Y-%m-%d')
+
+    def daily_totals(self, days: int = 15) -> Dict[str, int]:
+        """최근 days일 일별 요청 수 (요청이 없는 날은 0)"""
+        rows = dict(self._query(
+            "SELECT day, SUM(requests) FROM usage_daily WHERE day >= ? GROUP BY day",
+            (self._first_day(days),)))
+        today = datetime.now()
+        return {
+            date: int(rows.get(date, 0))
+            for date in ((today - timedelta(days=i)).strftime('%Y-%m-%d') for i in range(days))
+        }
+
+    def breakdown(self, days: int = 15) -> List[Dict]:
+        """엔드포인트·모드별 합계 (평균 지연 포함)"""
+        rows = self._query(
+            "SELECT endpoint, mode, SUM(requests), SUM(successes), SUM(failures), "
+            "SUM(total_latency_ms), MAX(max_latency_ms), SUM(docs_found) "
+            "FROM usage_daily WHERE day >= ? GROUP BY endpoint, mode ORDER BY SUM(requests) DESC",
+            (self._first_day(days),))
+        return [
+            {
+                'endpoint': endpoint,
+                'mode': mode,
+                'requests': requests,
+                'successes': successes,
+                'failures': failures,
+                'avg_latency_ms': round(total_latency / requests, 1) if requests else 0.0,
+                'max_latency_ms': round(max_latency, 1),
+                'avg_docs_found': round(docs / requests, 2) if requests else 0.0
+            }
+            for endpoint, mode, requests, successes, failures, total_latency, max_latency, docs in rows
+        ]
+
+    def purge_events(self, keep_days: int = 90) -> int:
+        """오래된 원본 이벤트 삭제 (일별 집계는 유지)"""
+        with self._read_lock:
+            with self._reader:
+                cursor = self._reader.execute("DELETE FROM usage_events WHERE day < ?",
+                                              (self._first_day(keep_days),))
+        return cursor.rowcount
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+대용량 PDF 파싱 벤치마크 (단일 프로세스 vs 페이지 범위 병렬)
+- 텍스트가 많은 PDF를 생성해(이미 있으면 재사용) 두 방식의 처리 시간과 결과 일치 여부 출력
+
+사용 예:
+    python scripts/benchmark_pdf_parse.py --pages 1500 --workers 2 4 8
+    python scripts/benchmark_pdf_parse.py --pdf KDS_설계기준.pdf --workers 8
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fitz  # PyMuPDF
+
+from ingestion.pdf_parallel import extract_range, get_pool, iter_pdf_parallel, shutdown_pool
+
+PARAGRAPH = (
+    "Section {page}.{line} Design load combinations for reinforced concrete members shall consider "
+    "dead load, live load, wind load, seismic load and temperature effects in accordance with the standard. "
+)
+
+
+def generate_pdf(path: str, pages: int, lines_per_page: int = 30):
+    doc = fitz.open()
+    for page_num in range(pages):
+        page = doc.new_page()
+        text = "\n".join(PARAGRAPH.format(page=page_num + 1, line=line) for line in range(lines_per_page))
+        page.insert_textbox(fitz.Rect(36, 36, page.rect.width - 36, page.rect.height - 36), text, fontsize=7)
+    doc.save(path)
+    doc.close()
+
+
+def run(label: str, parse) -> list:
+    start = time.perf_counter()
+    chunks = list(parse())
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<16} {elapsed:7.2f}초  {len(chunks) / elapsed:8.1f} 페이지/초  ({len(chunks)}개 청크)")
+    return chunks
+
+
+def main():
+    parser = argparse.ArgumentParser(description='PDF 페이지 병렬 파싱 벤치마크')
+    parser.add_argument('--pdf', help='측정할 PDF (없으면 생성)')
+    parser.add_argument('--pages', type=int, default=1500, help='생성할 PDF 페이지 수')
+    parser.add_argument('--workers', type=int, nargs='+', default=[2, 4, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    path = args.pdf
+    if not path:
+        path = os.path.join(tempfile.gettempdir(), f'exgpt_benchmark_{args.pages}p.pdf')
+        if not os.path.exists(path):
+            print(f"PDF 생성 중: {path} ({args.pages}페이지)")
+            generate_pdf(path, args.pages)
+
+    with fitz.open(path) as doc:
+        page_count = len(doc)
+    print(f"📄 {path}: {page_count}페이지, {os.path.getsize(path) / 1024 / 1024:.1f}MB, CPU {os.cpu_count()}개")
+
+    baseline = run('단일 프로세스', lambda: extract_range(path, 0, page_count))
+    for workers in sorted(set(args.workers)):
+        if workers < 2:
+            continue
+        # 프로세스 풀 시작 비용은 서버에서 한 번만 들므로 미리 띄워두고 측정
+        list(get_pool(workers).map(abs, range(workers * 4)))
+        chunks = run(f'병렬 {workers}개', lambda: iter_pdf_parallel(path, page_count, workers))
+        if chunks != baseline:
+            print(f"  ⚠️ 병렬 {workers}개 결과가 단일 프로세스 결과와 다릅니다")
+    shutdown_pool()
+
+
+if __name__ == '__main__':
+    main()
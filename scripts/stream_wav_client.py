@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+실시간 음성 스트리밍 테스트 클라이언트
+- WAV 파일을 PCM 프레임으로 잘라 /ws/voice_stream 으로 전송
+- 서버가 보내는 partial/final 이벤트 출력
+
+사용 예:
+    python scripts/stream_wav_client.py sample.wav --url ws://localhost:5001/ws/voice_stream
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+import wave
+
+import websocket  # websocket-client
+
+
+def main():
+    parser = argparse.ArgumentParser(description='EX-GPT 실시간 STT 스트리밍 클라이언트')
+    parser.add_argument('wav', help='16bit PCM WAV 파일')
+    parser.add_argument('--url', default='ws://localhost:5001/ws/voice_stream')
+    parser.add_argument('--frame-ms', type=int, default=100, help='전송 프레임 길이 (ms)')
+    parser.add_argument('--fast', action='store_true', help='실시간 속도 대신 최대 속도로 전송')
+    args = parser.parse_args()
+
+    with wave.open(args.wav, 'rb') as wav:
+        if wav.getsampwidth() != 2:
+            raise SystemExit("16bit PCM WAV 파일만 지원합니다")
+        sample_rate = wav.getframerate()
+        channels = wav.getnchannels()
+        pcm = wav.readframes(wav.getnframes())
+
+    if channels > 1:
+        import numpy as np
+        pcm = np.frombuffer(pcm, dtype='<i2').reshape(-1, channels).mean(axis=1).astype('<i2').tobytes()
+
+    ws = websocket.create_connection(args.url)
+    done = threading.Event()
+
+    def receiver():
+        while True:
+            try:
+                event = json.loads(ws.recv())
+            except Exception:
+                break
+            if event['type'] == 'partial':
+                print(f"  … {event['text']}")
+            elif event['type'] == 'final':
+                print(f"[{event['start']:7.2f} - {event['end']:7.2f}] {event['text']}")
+            elif event['type'] == 'error':
+                print(f"⚠️ 서버 오류: {event.get('message')}", file=sys.stderr)
+                break
+            elif event['type'] == 'end':
+                break
+        done.set()
+
+    threading.Thread(target=receiver, daemon=True).start()
+
+    ws.send(json.dumps({'type': 'start', 'sample_rate': sample_rate, 'encoding': 'pcm_s16le'}))
+    frame_bytes = int(sample_rate * args.frame_ms / 1000) * 2
+    started = time.time()
+
+    for i, offset in enumerate(range(0, len(pcm), frame_bytes)):
+        if done.is_set():
+            break  # 서버가 오류로 스트림을 끝냄
+        ws.send_binary(pcm[offset:offset + frame_bytes])
+        if not args.fast:
+            # 실제 녹음 속도에 맞춰 전송
+            delay = started + (i + 1) * args.frame_ms / 1000 - time.time()
+            if delay > 0:
+                time.sleep(delay)
+
+    ws.send(json.dumps({'type': 'stop'}))
+    done.wait(timeout=120)
+    ws.close()
+    print(f"총 소요 시간: {time.time() - started:.1f}초")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+# tests/test_change_detector.py
+
+import hashlib
+import os
+
+from ingestion import change_detector
+from ingestion.change_detector import check_file, hash_file
+
+
+def record_for(check):
+    return {'hash': check.file_hash, **check.signature()}
+
+
+class TestChangeDetector:
+    """stat 우선 변경 감지 테스트"""
+
+    def test_hash_file_matches_md5_for_buffered_and_mmap(self, tmp_path, monkeypatch):
+        path = tmp_path / 'doc.bin'
+        data = os.urandom(3 * 1024 * 1024 + 17)
+        path.write_bytes(data)
+        expected = hashlib.md5(data).hexdigest()
+
+        assert hash_file(str(path), buffer_size=64 * 1024) == expected
+        assert hash_file(str(path), mmap_threshold=1) == expected
+
+    def test_unchanged_stat_skips_hashing(self, tmp_path, monkeypatch):
+        path = tmp_path / 'a.txt'
+        path.write_text('내용', encoding='utf-8')
+        first = check_file(str(path), None)
+        assert first.changed and first.hashed
+
+        calls = []
+        monkeypatch.setattr(change_detector, 'hash_file', lambda p: calls.append(p) or 'x')
+        second = check_file(str(path), record_for(first))
+        assert not second.changed and not second.hashed
+        assert second.file_hash == first.file_hash
+        assert calls == []
+
+    def test_touch_without_content_change_only_refreshes_signature(self, tmp_path):
+        path = tmp_path / 'a.txt'
+        path.write_text('내용', encoding='utf-8')
+        first = check_file(str(path), None)
+
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000))
+        touched = check_file(str(path), record_for(first))
+        assert not touched.changed and touched.hashed and touched.signature_changed
+        assert touched.mtime_ns != first.mtime_ns
+
+        path.write_text('바뀐 내용', encoding='utf-8')
+        modified = check_file(str(path), record_for(touched))
+        assert modified.changed and modified.file_hash != first.file_hash
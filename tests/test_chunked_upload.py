@@ -0,0 +1,115 @@
+# tests/test_chunked_upload.py
+
+import hashlib
+import io
+import multiprocessing
+import time
+
+import pytest
+
+from audio.chunked_upload import ChunkedUploadStore, UploadError, save_stream
+
+
+class SlowStream(io.BytesIO):
+    """블록마다 지연되는 요청 본문 (동시 전송 재현용)"""
+
+    def read(self, size=-1):
+        time.sleep(0.02)
+        return super().read(size)
+
+
+def _append_in_worker(upload_dir, upload_id, data, results):
+    store = ChunkedUploadStore(upload_dir, block_size=1000)
+    try:
+        results.put(('ok', store.append(upload_id, 0, SlowStream(data))))
+    except UploadError as e:
+        results.put((e.status, e.offset))
+
+
+class TestSaveStream:
+    def test_writes_blocks_and_hashes(self, tmp_path):
+        data = b'\x01\x02' * 100000
+        path = str(tmp_path / 'a.wav')
+
+        size, digest = save_stream(io.BytesIO(data), path, block_size=4096)
+
+        assert size == len(data)
+        assert digest == hashlib.sha256(data).hexdigest()
+        assert open(path, 'rb').read() == data
+
+    def test_size_limit(self, tmp_path):
+        with pytest.raises(UploadError) as exc:
+            save_stream(io.BytesIO(b'x' * 100), str(tmp_path / 'a.wav'), max_bytes=50, block_size=10)
+        assert exc.value.status == 413
+
+
+class TestChunkedUploadStore:
+    """재개 가능한 분할 업로드 테스트"""
+
+    def test_resume_and_verify(self, tmp_path):
+        data = bytes(range(256)) * 400
+        store = ChunkedUploadStore(str(tmp_path), block_size=1000)
+        upload_id = store.create('meeting.m4a', len(data), hashlib.sha256(data).hexdigest())['upload_id']
+
+        assert store.append(upload_id, 0, io.BytesIO(data[:30000])) == 30000
+
+        # 잘못된 오프셋은 현재 위치와 함께 거절
+        with pytest.raises(UploadError) as exc:
+            store.append(upload_id, 40000, io.BytesIO(data[40000:]))
+        assert (exc.value.status, exc.value.offset) == (409, 30000)
+
+        # 다른 워커(새 저장소 인스턴스)에서 이어받기
+        other = ChunkedUploadStore(str(tmp_path), block_size=1000)
+        assert other.info(upload_id)['offset'] == 30000
+        other.append(upload_id, 30000, io.BytesIO(data[30000:]))
+
+        path, digest, info = other.complete(upload_id)
+        assert digest == hashlib.sha256(data).hexdigest()
+        assert open(path, 'rb').read() == data
+        assert info['filename'] == 'meeting.m4a'
+
+    def test_hash_mismatch_rejected(self, tmp_path):
+        store = ChunkedUploadStore(str(tmp_path))
+        upload_id = store.create('a.wav', 4, '0' * 64)['upload_id']
+        store.append(upload_id, 0, io.BytesIO(b'abcd'))
+
+        with pytest.raises(UploadError) as exc:
+            store.complete(upload_id)
+        assert exc.value.status == 422
+        assert len(store) == 0
+
+    def test_incomplete_upload_cannot_complete(self, tmp_path):
+        store = ChunkedUploadStore(str(tmp_path))
+        upload_id = store.create('a.wav', 10)['upload_id']
+        store.append(upload_id, 0, io.BytesIO(b'abc'))
+
+        with pytest.raises(UploadError) as exc:
+            store.complete(upload_id)
+        assert exc.value.offset == 3
+
+    def test_chunk_past_declared_size_rejected(self, tmp_path):
+        store = ChunkedUploadStore(str(tmp_path), block_size=2)
+        upload_id = store.create('a.wav', 4)['upload_id']
+
+        with pytest.raises(UploadError):
+            store.append(upload_id, 0, io.BytesIO(b'abcdef'))
+        assert store.offset(upload_id) == 4
+
+    def test_concurrent_workers_serialized_by_file_lock(self, tmp_path):
+        """두 워커 프로세스가 같은 오프셋으로 보내면 하나만 기록되고 다른 하나는 409"""
+        data = b'x' * 10000
+        store = ChunkedUploadStore(str(tmp_path), block_size=1000)
+        upload_id = store.create('a.wav', len(data), hashlib.sha256(data).hexdigest())['upload_id']
+
+        context = multiprocessing.get_context('fork')
+        results = context.Queue()
+        workers = [context.Process(target=_append_in_worker, args=(str(tmp_path), upload_id, data, results))
+                   for _ in range(2)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(timeout=30)
+
+        outcomes = sorted([results.get(timeout=5) for _ in workers], key=lambda r: str(r[0]))
+        assert outcomes == [(409, len(data)), ('ok', len(data))]
+        assert store.complete(upload_id)[1] == hashlib.sha256(data).hexdigest()
@@ -0,0 +1,67 @@
+# tests/test_diarization.py
+
+import numpy as np
+
+from audio.diarization import (
+    Diarizer, SpeakerTurn, assign_speakers, cluster_embeddings, format_speaker_transcript
+)
+
+
+def voice(freq, seconds, sr=16000, seed=0):
+    """기본 주파수와 배음이 다른 합성 화자 음성"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * sr)) / sr
+    signal = sum(np.sin(2 * np.pi * freq * k * t) / k for k in range(1, 6))
+    return (0.3 * signal + 0.01 * rng.standard_normal(len(t))).astype(np.float32)
+
+
+class TestClustering:
+    """임베딩 군집화 테스트"""
+
+    def test_separates_distinct_groups(self):
+        rng = np.random.default_rng(0)
+        centers = rng.standard_normal((3, 16)) * 5
+        embeddings = np.concatenate([c + rng.standard_normal((10, 16)) * 0.3 for c in centers])
+
+        labels = cluster_embeddings(embeddings, threshold=0.5)
+
+        assert len(set(labels.tolist())) == 3
+        assert labels[0] == 0  # 등장 순서대로 번호 부여
+        for group in range(3):
+            assert len(set(labels[group * 10:(group + 1) * 10].tolist())) == 1
+
+    def test_num_speakers_forces_cluster_count(self):
+        rng = np.random.default_rng(1)
+        labels = cluster_embeddings(rng.standard_normal((20, 8)), num_speakers=2)
+
+        assert len(set(labels.tolist())) == 2
+
+
+class TestSpeakerAssignment:
+    """전사 세그먼트 화자 라벨링 테스트"""
+
+    def test_label_by_max_overlap(self):
+        turns = [SpeakerTurn(0.0, 4.0, 0), SpeakerTurn(4.0, 10.0, 1)]
+        segments = [
+            {'start': 0.5, 'end': 3.0, 'text': '안녕하세요'},
+            {'start': 3.5, 'end': 8.0, 'text': '네 반갑습니다'},
+            {'start': 11.0, 'end': 12.0, 'text': '감사합니다'},
+        ]
+
+        labeled = assign_speakers(segments, turns)
+
+        assert [s['speaker'] for s in labeled] == [0, 1, 1]
+        assert format_speaker_transcript(labeled) == "[화자 1] 안녕하세요\n[화자 2] 네 반갑습니다 감사합니다"
+
+    def test_two_synthetic_speakers(self):
+        sr = 16000
+        gap = np.zeros(sr, dtype=np.float32)
+        samples = np.concatenate([voice(110, 4, seed=1), gap, voice(320, 4, seed=2), gap,
+                                  voice(110, 4, seed=3)])
+        diarizer = Diarizer(backend='mfcc')
+
+        turns = diarizer.diarize(samples, sr)
+        speakers = [t.speaker for t in turns]
+
+        assert len(set(speakers)) == 2
+        assert speakers[0] == speakers[-1] != speakers[1]
@@ -0,0 +1,54 @@
+# tests/test_embedding_batcher.py
+
+from ingestion.embedding_batcher import EmbeddingBatcher
+
+
+def encode(texts):
+    return [[float(len(text)), float(ord(text[0]))] for text in texts]
+
+
+class TestEmbeddingBatcher:
+    """파일 간 임베딩 배치 테스트"""
+
+    def test_batches_span_files_and_results_return_in_order(self):
+        calls = []
+        batcher = EmbeddingBatcher(lambda t: calls.append(list(t)) or encode(t), batch_size=4, window_batches=1)
+
+        assert batcher.add('a', ['a' * 5, 'a']) == []
+        assert batcher.add('empty', []) == [('empty', [], None)]
+        completed = batcher.add('b', ['b' * 3, 'b' * 9, 'b' * 2])
+        completed += batcher.flush()
+
+        assert [len(c) for c in calls] == [4, 1]
+        # 배치 내부는 길이순
+        assert [len(t) for t in calls[0]] == sorted(len(t) for t in calls[0])
+        results = {owner: vectors for owner, vectors, error in completed}
+        assert results['a'] == encode(['a' * 5, 'a'])
+        assert results['b'] == encode(['b' * 3, 'b' * 9, 'b' * 2])
+        assert batcher.pending_chunks == 0 and batcher.pending_owners == 0
+
+    def test_large_file_is_split_into_bounded_batches(self):
+        sizes = []
+        batcher = EmbeddingBatcher(lambda t: sizes.append(len(t)) or encode(t), batch_size=8, window_batches=2)
+        texts = [f"row {i} " + 'x' * (i % 13) for i in range(100)]
+        completed = batcher.add('sheet', texts) + batcher.flush()
+
+        assert max(sizes) <= 8
+        assert completed[0][1] == encode(texts)
+        assert batcher.stats()['chunks'] == 100
+
+    def test_failed_batch_fails_only_its_owners(self):
+        def flaky(texts):
+            if any(text.startswith('bad') for text in texts):
+                raise RuntimeError('encoder crashed')
+            return encode(texts)
+
+        batcher = EmbeddingBatcher(flaky, batch_size=2, window_batches=1)
+        completed = batcher.add('good', ['good one!'] * 2)
+        completed += batcher.add('bad', ['bad'] * 3)
+        completed += batcher.flush()
+
+        outcome = {owner: (vectors, error) for owner, vectors, error in completed}
+        assert outcome['good'][1] is None and len(outcome['good'][0]) == 2
+        assert outcome['bad'][0] is None and isinstance(outcome['bad'][1], RuntimeError)
+        assert batcher.pending_owners == 0 and batcher.pending_chunks == 0
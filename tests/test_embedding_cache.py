@@ -0,0 +1,88 @@
+# tests/test_embedding_cache.py
+
+import numpy as np
+import pytest
+
+from ingestion.embedding_cache import EmbeddingCache
+
+
+def vec(value, dim=4):
+    return np.full(dim, value, dtype=np.float32)
+
+
+class TestEmbeddingCache:
+    """디스크 임베딩 캐시 테스트"""
+
+    def test_hits_misses_and_persistence(self, tmp_path):
+        cache = EmbeddingCache(str(tmp_path), dim=4, model_name='m1', capacity=10)
+        assert cache.get_many(['a', 'b']) == [None, None]
+        cache.put_many(['a', 'b'], [vec(1), vec(2)])
+        cache.flush()
+
+        reopened = EmbeddingCache(str(tmp_path), dim=4, model_name='m1', capacity=10)
+        found = reopened.get_many(['b', 'c', 'a'])
+        assert np.array_equal(found[0], vec(2))
+        assert found[1] is None
+        assert np.array_equal(found[2], vec(1))
+        assert reopened.stats()['hits'] == 2 and reopened.stats()['misses'] == 1
+
+    def test_model_change_invalidates(self, tmp_path):
+        cache = EmbeddingCache(str(tmp_path), dim=4, model_name='m1', capacity=10)
+        cache.put_many(['a'], [vec(1)])
+        cache.flush()
+
+        other = EmbeddingCache(str(tmp_path), dim=4, model_name='m2', capacity=10)
+        assert len(other) == 0
+        assert other.get_many(['a']) == [None]
+
+    def test_lru_eviction_reuses_slots(self, tmp_path):
+        cache = EmbeddingCache(str(tmp_path), dim=4, model_name='m', capacity=3)
+        cache.put_many(['a', 'b', 'c'], [vec(1), vec(2), vec(3)])
+        cache.get_many(['a'])  # a를 최근 사용으로
+        cache.put_many(['d'], [vec(4)])
+
+        assert len(cache) == 3
+        a, b, c, d = cache.get_many(['a', 'b', 'c', 'd'])
+        assert b is None
+        assert np.array_equal(a, vec(1)) and np.array_equal(c, vec(3)) and np.array_equal(d, vec(4))
+
+    def test_rejects_wrong_dimension(self, tmp_path):
+        cache = EmbeddingCache(str(tmp_path), dim=4, model_name='m', capacity=3)
+        with pytest.raises(ValueError):
+            cache.put_many(['a'], [np.zeros(5)])
+
+
+class TestSharedCacheDirectory:
+    """여러 프로세스가 같은 캐시 디렉토리를 열 때의 테스트"""
+
+    def test_second_instance_is_read_only_and_never_serves_reused_slots(self, tmp_path):
+        writer = EmbeddingCache(str(tmp_path), dim=4, model_name='m', capacity=2)
+        writer.put_many(['a', 'b'], [vec(1), vec(2)])
+        writer.flush()
+
+        reader = EmbeddingCache(str(tmp_path), dim=4, model_name='m', capacity=2)
+        assert reader.read_only and not writer.read_only
+        reader.put_many(['x'], [vec(9)])  # 읽기 전용 - 기록하지 않음
+        assert writer.get_many(['x']) == [None]
+
+        # 기록 프로세스가 LRU로 a, b 슬롯을 c, d에 재사용
+        writer.put_many(['c', 'd'], [vec(3), vec(4)])
+        assert reader.get_many(['a', 'b']) == [None, None]
+
+        writer.close()
+        reopened = EmbeddingCache(str(tmp_path), dim=4, model_name='m', capacity=2)
+        assert not reopened.read_only
+
+    def test_unflushed_slot_reuse_is_detected_on_reopen(self, tmp_path):
+        cache = EmbeddingCache(str(tmp_path), dim=4, model_name='m', capacity=2)
+        cache.put_many(['a', 'b'], [vec(1), vec(2)])
+        cache.flush()
+        # 슬롯 재사용 후 색인을 기록하기 전에 비정상 종료
+        cache.put_many(['c'], [vec(3)])
+        cache._lock_file.close()
+
+        reopened = EmbeddingCache(str(tmp_path), dim=4, model_name='m', capacity=2)
+        a, b = reopened.get_many(['a', 'b'])
+        assert a is None
+        assert np.array_equal(b, vec(2))
+        assert len(reopened) == 1
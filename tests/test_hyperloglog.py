@@ -0,0 +1,85 @@
+# tests/test_hyperloglog.py
+
+from monitoring.hyperloglog import HyperLogLog, SlidingWindowDistinct
+
+
+class TestHyperLogLog:
+    """HyperLogLog 추정 테스트"""
+
+    def test_estimate_within_error(self):
+        for n in (10, 1000, 50000):
+            sketch = HyperLogLog(p=12)
+            sketch.update(f'user{i}' for i in range(n))
+            assert abs(sketch.count() - n) <= max(2, n * 0.05)
+
+    def test_duplicates_not_counted(self):
+        sketch = HyperLogLog()
+        for _ in range(100):
+            sketch.add('192.168.0.1')
+        assert sketch.count() == 1
+
+    def test_merge_and_serialize(self):
+        a, b = HyperLogLog(), HyperLogLog()
+        a.update(f'user{i}' for i in range(0, 3000))
+        b.update(f'user{i}' for i in range(2000, 5000))
+
+        merged = HyperLogLog.from_bytes(a.to_bytes()).merge(b)
+
+        assert abs(merged.count() - 5000) <= 250
+
+
+class TestSlidingWindowDistinct:
+    """시간 창별 고유 사용자 수 테스트"""
+
+    def test_windows(self):
+        counter = SlidingWindowDistinct()
+        now = 1_000_000_000.0
+        for i in range(50):
+            counter.add(f'old{i}', now - 7200)   # 2시간 전
+        for i in range(30):
+            counter.add(f'recent{i}', now - 1800)  # 30분 전
+        for i in range(10):
+            counter.add(f'recent{i}', now - 60)    # 1분 전 (중복 사용자)
+
+        counts = counter.counts(now)
+
+        assert abs(counts['5m'] - 10) <= 1
+        assert abs(counts['1h'] - 30) <= 2
+        assert abs(counts['24h'] - 80) <= 4
+
+    def test_old_buckets_pruned(self):
+        counter = SlidingWindowDistinct()
+        now = 1_000_000_000.0
+        counter.add('a', now - 2 * 86400)
+        counter.add('b', now)
+
+        assert counter.counts(now)['24h'] == 1
+        assert len(counter._hours) == 1
+
+    def test_shared_dir_merges_processes(self, tmp_path):
+        now = 1_000_000_000.0
+        worker_a = SlidingWindowDistinct(shared_dir=str(tmp_path))
+        worker_a.add('alice', now)
+
+        worker_b = SlidingWindowDistinct(shared_dir=str(tmp_path))
+        worker_b.add('bob', now)
+        state = worker_a.export_state()
+        minutes, hours = dict(worker_b._minutes), dict(worker_b._hours)
+        worker_b.merge_state(state, minutes, hours)
+
+        assert worker_b._window_sketch(minutes, hours, 300, now).count() == 2
+
+    def test_add_exports_without_counts(self, tmp_path, monkeypatch):
+        """count를 호출하지 않는 워커의 사용자도 다른 워커 집계에 포함"""
+        now = 1_000_000_000.0
+        silent = SlidingWindowDistinct(shared_dir=str(tmp_path), export_interval=30)
+        # 같은 프로세스 안에서 다른 워커 흉내 (상태 파일 이름이 pid 기준)
+        monkeypatch.setattr(silent, '_state_path', lambda pid: str(tmp_path / 'active_users.1.json'))
+        silent.add('alice', now)
+        silent.add('carol', now + 10)  # 내보내기 간격 전 - 다음 내보내기에 반영
+        silent.add('dave', now + 40)
+
+        reporter = SlidingWindowDistinct(shared_dir=str(tmp_path))
+        reporter.add('bob', now + 40)
+
+        assert reporter.counts(now + 40)['5m'] == 4
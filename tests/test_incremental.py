@@ -0,0 +1,83 @@
+# tests/test_incremental.py
+
+from ingestion.incremental import StreamingPlanner, assign_point_ids, batched, chunk_hash, plan_update
+from ingestion.pipeline import IngestionPipeline
+
+
+def pages(*texts):
+    return [{'content': text, 'page': i + 1, 'type': 'pdf_page'} for i, text in enumerate(texts)]
+
+
+class TestChunkPlan:
+    """청크 단위 증분 갱신 계획 테스트"""
+
+    def test_point_ids_are_deterministic_and_unique(self):
+        chunks = pages('서문', '본문', '서문')
+        ids = assign_point_ids('manual.pdf', chunks)
+
+        assert ids == assign_point_ids('manual.pdf', pages('서문', '본문', '서문'))
+        assert len(set(ids)) == 3  # 같은 내용이 반복돼도 ID는 다름
+        assert ids != assign_point_ids('other.pdf', chunks)
+        assert chunk_hash({'content': 'a', 'type': 'excel_row', 'sheet': 'S1'}) != \
+            chunk_hash({'content': 'a', 'type': 'excel_row', 'sheet': 'S2'})
+
+    def test_plan_only_touches_changed_chunks(self):
+        old = pages('1장', '2장', '3장', '4장')
+        previous = assign_point_ids('a.pdf', old)
+
+        # 앞에 페이지가 추가되고 3장이 수정, 4장이 삭제됨
+        new = pages('표지', '1장', '2장', '3장 (개정)')
+        plan = plan_update('a.pdf', new, previous)
+
+        assert plan.new_indices == [0, 3]
+        assert plan.kept_indices == [1, 2]
+        assert sorted(plan.removed_ids) == sorted([previous[2], previous[3]])
+        assert plan.summary() == {'chunks_added': 2, 'chunks_kept': 2, 'chunks_removed': 2}
+
+        unchanged = plan_update('a.pdf', old, previous)
+        assert unchanged.unchanged
+
+        forced = plan_update('a.pdf', new, previous, reembed=True)
+        assert forced.new_indices == [0, 1, 2, 3] and not forced.kept_indices
+        assert forced.removed_ids == plan.removed_ids and not forced.full_replace
+
+    def test_legacy_metadata_triggers_full_replace(self):
+        plan = plan_update('a.pdf', pages('x', 'y'), None)
+        assert plan.full_replace and plan.new_indices == [0, 1]
+
+    def test_streaming_plan_matches_whole_file_plan(self):
+        old = pages('1장', '2장', '3장', '4장', '5장')
+        previous = assign_point_ids('a.pdf', old)
+        new = pages('표지', '1장', '2장', '3장 (개정)', '5장', '부록')
+        whole = plan_update('a.pdf', new, previous)
+
+        planner = StreamingPlanner('a.pdf', previous)
+        batches = [planner.add(batch) for batch in batched(new, 4)]
+
+        assert [len(plan.point_ids) for plan in batches] == [4, 2]
+        assert [plan.offset for plan in batches] == [0, 4]
+        assert [plan.offset + i for plan in batches for i in plan.new_indices] == whole.new_indices
+        assert [plan.offset + i for plan in batches for i in plan.kept_indices] == whole.kept_indices
+        assert planner.point_ids == whole.point_ids
+        assert planner.finish() == whole.removed_ids
+        assert (planner.added, planner.kept) == (3, 3)
+
+
+class TestPipelinePlan:
+    def test_pipeline_embeds_only_planned_chunks(self):
+        embedded = []
+
+        def parse(path):
+            return {'chunks': pages('a', 'b', 'c')}
+
+        def plan(job):
+            return [1]
+
+        pipeline = IngestionPipeline(parse, lambda texts: embedded.extend(texts) or [[0.0]] * len(texts),
+                                     lambda job: {'success': True, 'chunks_added': len(job.embeddings)},
+                                     plan_fn=plan, parse_workers=0)
+        summary = pipeline.run(['/docs/a.pdf'])
+
+        assert embedded == ['b']
+        assert summary['completed_files'] == 1
+        assert pipeline.results[0].embed_indices == [1]
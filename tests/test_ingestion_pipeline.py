@@ -0,0 +1,121 @@
+# tests/test_ingestion_pipeline.py
+
+import os
+import sys
+import threading
+import time
+
+from ingestion.pipeline import IngestionPipeline, merge_progress, parse_document, split_streamed
+
+
+def fake_parse(path):
+    if 'broken' in path:
+        raise ValueError('cannot parse')
+    count = int(os.path.basename(path).split('_')[0])
+    return {'chunks': [{'content': f'{path} chunk {i}'} for i in range(count)]}
+
+
+def fake_embed(texts):
+    return [[float(len(t))] for t in texts]
+
+
+def store(job):
+    return {'success': True, 'chunks_added': len(job.chunks)}
+
+
+class TestIngestionPipeline:
+    """파싱 → 임베딩 → 저장 파이프라인 테스트"""
+
+    def test_pipeline_processes_all_files_in_thread_mode(self):
+        batches = []
+        pipeline = IngestionPipeline(fake_parse, lambda t: batches.append(len(t)) or fake_embed(t), store,
+                                     parse_workers=0, embed_batch_size=4)
+        paths = [f'/docs/{n}_file.txt' for n in (3, 10, 1)] + ['/docs/0_broken.txt']
+        summary = pipeline.run(paths)
+
+        assert summary['total_files'] == 4
+        assert summary['completed_files'] == 3
+        assert summary['failed_files'] == 1
+        assert summary['stages']['parse']['errors'] == 1
+        assert summary['stages']['store']['chunks'] == 14
+        assert max(batches) <= 4
+        stored = {job.filename: job for job in pipeline.results}
+        assert len(stored['10_file.txt'].embeddings) == 10
+        assert stored['0_broken.txt'].error.startswith('parse')
+
+    def test_pipeline_uses_process_pool(self):
+        progress = []
+        pipeline = IngestionPipeline(fake_parse, fake_embed, store, parse_workers=2,
+                                     progress_callback=progress.append)
+        summary = pipeline.run([f'/docs/{n}_file.txt' for n in range(1, 7)])
+
+        assert summary['completed_files'] == 6
+        assert summary['stages']['embed']['chunks'] == 21
+        assert len(progress) == 6
+        assert progress[-1]['percent'] == 100.0
+
+    def test_backpressure_bounds_files_in_flight(self):
+        lock = threading.Lock()
+        parsed = []
+        stored = []
+        max_gap = [0]
+
+        def counting_embed(texts):
+            return fake_embed(texts)
+
+        def slow_store(job):
+            time.sleep(0.01)
+            with lock:
+                stored.append(job.path)
+            return store(job)
+
+        def tracking_parse(path):
+            with lock:
+                parsed.append(path)
+                max_gap[0] = max(max_gap[0], len(parsed) - len(stored))
+            return fake_parse(path)
+
+        pipeline = IngestionPipeline(tracking_parse, counting_embed, slow_store, parse_workers=0,
+                                     embed_batch_size=1, store_workers=1, queue_size=2)
+        summary = pipeline.run([f'/docs/1_{i}.txt' for i in range(30)])
+
+        assert summary['completed_files'] == 30
+        # 파싱 슬롯(2 + 1) + 임베딩 배치 창(8) + 저장 대기열(2) + 저장 대기/처리 중(2) 이내로 유지
+        assert max_gap[0] <= 15
+
+
+class TestParseDocument:
+    def test_parse_document_does_not_load_knowledge_manager(self, tmp_path):
+        path = tmp_path / 'notes.txt'
+        path.write_text('첫 번째 문단은 도로 포장 보수 공사 일정에 관한 내용입니다.\n\n'
+                        '두 번째 문단은 교량 점검 결과와 후속 조치 계획을 설명합니다.\n', encoding='utf-8')
+
+        result = parse_document(str(path))
+
+        assert [c['paragraph'] for c in result['chunks']] == [1, 2]
+        assert all(c['hash'] for c in result['chunks'])
+        # 파싱 작업 프로세스에서 임베딩 모델·벡터 DB 라이브러리를 불러오지 않음
+        assert 'knowledge_manager' not in sys.modules
+        assert 'sentence_transformers' not in sys.modules
+
+
+class TestStreamedFiles:
+    """큰 파일을 파이프라인 대신 스트리밍으로 처리하는 분류 테스트"""
+
+    def test_large_files_are_routed_to_streaming(self):
+        sizes = {'/docs/a.pdf': 5, '/docs/big.pdf': 30, '/docs/b.txt': 19, '/docs/huge.xlsx': 20}
+
+        pipelined, streamed = split_streamed(list(sizes), sizes, min_bytes=20)
+
+        assert pipelined == ['/docs/a.pdf', '/docs/b.txt']
+        assert streamed == ['/docs/big.pdf', '/docs/huge.xlsx']
+        assert split_streamed(list(sizes), sizes, min_bytes=100) == (list(sizes), [])
+
+    def test_progress_includes_streamed_files(self):
+        progress = {'total_files': 2, 'completed_files': 2, 'failed_files': 0, 'percent': 100.0}
+
+        merged = merge_progress(progress, extra_files=2, completed=1, failed=0)
+
+        assert (merged['total_files'], merged['completed_files'], merged['percent']) == (4, 3, 75.0)
+        assert progress['total_files'] == 2
+        assert merge_progress({'total_files': 0, 'completed_files': 0, 'failed_files': 0}, 0, 0, 0)['percent'] == 100.0
@@ -0,0 +1,73 @@
+# tests/test_metadata_store.py
+
+import json
+
+from ingestion.metadata_store import MetadataStore
+
+
+def record(file_hash='h1'):
+    return {'hash': file_hash, 'upload_time': '2026-01-01T00:00:00', 'file_ext': '.pdf',
+            'file_size': 10, 'mtime_ns': 1, 'inode': 2}
+
+
+class TestMetadataStore:
+    """SQLite 메타데이터 저장소 테스트"""
+
+    def test_put_replaces_file_and_chunk_rows(self, tmp_path):
+        store = MetadataStore(str(tmp_path / 'meta.db'))
+        store.put('/docs/a/규정.pdf', record(), ['p1', 'p2', 'p3'], ['c1', 'c2', 'c3'])
+        store.put('/docs/b/규정.pdf', record('h2'), ['q1'], ['d1'])
+        store.put('/docs/a/규정.pdf', record('h3'), ['p2', 'p4'], ['c2', 'c4'])
+        store.commit()
+
+        a = store.get('/docs/a/규정.pdf')
+        assert a['hash'] == 'h3' and a['chunks'] == 2
+        assert a['point_ids'] == ['p2', 'p4']
+        assert store.get('/docs/b/규정.pdf')['point_ids'] == ['q1']  # 같은 파일명이어도 경로별로 구분
+        assert len(store) == 2
+        assert store.paths(prefix='/docs/a/') == ['/docs/a/규정.pdf']
+
+        store.delete('/docs/b/규정.pdf')
+        assert store.get('/docs/b/규정.pdf') is None
+
+    def test_uncommitted_batch_is_not_visible_after_reopen(self, tmp_path):
+        path = str(tmp_path / 'meta.db')
+        store = MetadataStore(path, batch_size=2, max_batch_seconds=60)
+        store.put('/docs/1.txt', record(), ['p1'], ['c1'])
+        store.put('/docs/2.txt', record(), ['p2'], ['c2'])  # 배치가 차서 커밋됨
+        store.put('/docs/3.txt', record(), ['p3'], ['c3'])
+
+        other = MetadataStore(path)
+        assert sorted(other.all_files()) == ['/docs/1.txt', '/docs/2.txt']
+
+        store.commit()
+        assert sorted(other.all_files()) == ['/docs/1.txt', '/docs/2.txt', '/docs/3.txt']
+
+    def test_open_batch_is_committed_within_time_bound(self, tmp_path):
+        path = str(tmp_path / 'meta.db')
+        store = MetadataStore(path, batch_size=50, max_batch_seconds=0.1)
+        store.put('/docs/1.txt', record(), ['p1'], ['c1'])
+        store.update_signature('/docs/1.txt', {'file_size': 20, 'mtime_ns': 3, 'inode': 2})
+
+        # 배치가 차지 않아도 쓰기 잠금을 계속 잡고 있지 않음 - 다른 프로세스가 바로 기록 가능
+        other = MetadataStore(path)
+        other.put('/docs/2.txt', record(), ['p2'], ['c2'])
+        other.commit()
+
+        assert store.get('/docs/1.txt', with_chunks=False)['file_size'] == 20
+        assert sorted(other.all_files()) == ['/docs/1.txt', '/docs/2.txt']
+
+    def test_json_migration_runs_once_and_is_adopted_by_path(self, tmp_path):
+        legacy_path = tmp_path / 'knowledge_metadata.json'
+        legacy_path.write_text(json.dumps({'규정.pdf': {**record('old'), 'chunks': 7}}), encoding='utf-8')
+        store = MetadataStore(str(tmp_path / 'meta.db'))
+
+        assert store.migrate_from_json(str(legacy_path)) == 1
+        assert store.migrate_from_json(str(legacy_path)) == 0
+
+        legacy = store.get('/docs/a/규정.pdf')
+        assert legacy['legacy'] and legacy['hash'] == 'old' and 'point_ids' not in legacy
+
+        store.put('/docs/a/규정.pdf', record('new'), ['p1'], ['c1'])
+        assert store.get('/docs/a/규정.pdf')['legacy'] is False
+        assert list(store.all_files()) == ['/docs/a/규정.pdf']
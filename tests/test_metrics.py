@@ -0,0 +1,62 @@
+# tests/test_metrics.py
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from monitoring import metrics
+
+
+class TestMetrics:
+    """메트릭 헬퍼 테스트 (prometheus_client 유무와 관계없이 동작)"""
+
+    def test_timed_stage_preserves_result(self):
+        @metrics.timed_stage('embed')
+        def embed(text):
+            return [len(text)]
+
+        assert embed('도로') == [2]
+
+    def test_stage_timer_reraises(self):
+        with pytest.raises(ValueError):
+            with metrics.stage_timer('search'):
+                raise ValueError('검색 실패')
+
+    def test_render_includes_recorded_metrics(self):
+        metrics.observe_request('/api/chat', 'POST', 'think', 200, 1.5)
+        metrics.record_cache('transcript', True)
+        metrics.observe_stt('faster-whisper', 0.2, 30.0)
+
+        body, content_type = metrics.render_metrics()
+
+        assert content_type.startswith('text/plain')
+        if metrics.PROMETHEUS_AVAILABLE:
+            text = body.decode('utf-8')
+            assert 'exgpt_request_duration_seconds_bucket' in text
+            assert 'exgpt_cache_requests_total{cache="transcript",result="hit"}' in text
+
+    def test_pending_depth_follows_submit_and_start(self):
+        def pending():
+            if not metrics.PROMETHEUS_AVAILABLE:
+                return None
+            from prometheus_client import REGISTRY
+            return REGISTRY.get_sample_value('exgpt_queue_depth', {'queue': 'test_pending'})
+
+        started, release = threading.Event(), threading.Event()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            running = metrics.submit_tracked(executor, 'test_pending', lambda: started.set() or release.wait(5))
+            started.wait(5)
+            waiting = metrics.submit_tracked(executor, 'test_pending', lambda: '완료')
+            cancelled = metrics.submit_tracked(executor, 'test_pending', lambda: '취소')
+            assert cancelled.cancel()
+            if metrics.PROMETHEUS_AVAILABLE:
+                assert pending() == 1  # 실행 중인 작업과 취소된 작업은 제외
+            release.set()
+            assert running.result() and waiting.result() == '완료'
+
+        if metrics.PROMETHEUS_AVAILABLE:
+            assert pending() == 0
+            with metrics.track_queue('test_in_flight'):
+                from prometheus_client import REGISTRY
+                assert REGISTRY.get_sample_value('exgpt_queue_depth', {'queue': 'test_in_flight'}) == 1
@@ -0,0 +1,61 @@
+# tests/test_model_loader.py
+
+import time
+
+import pytest
+
+from audio.model_loader import LazyModel
+
+
+class TestLazyModel:
+    """지연 로딩 / 유휴 언로드 테스트"""
+
+    def test_loads_once_on_first_get(self):
+        loads = []
+        model = LazyModel('test', lambda: loads.append(1) or object(), idle_timeout=0)
+
+        assert not model.is_loaded and loads == []
+        first = model.get()
+        assert model.get() is first
+        assert model.is_loaded and model.load_count == 1 and loads == [1]
+
+    def test_reaper_unloads_idle_model(self):
+        model = LazyModel('test', object, idle_timeout=0.2)
+        model.get()
+
+        deadline = time.time() + 5
+        while model.is_loaded and time.time() < deadline:
+            time.sleep(0.1)
+        assert not model.is_loaded
+
+        model.get()
+        assert model.load_count == 2
+
+    def test_unload_refused_while_in_use(self):
+        model = LazyModel('test', object, idle_timeout=0)
+
+        with model.use() as loaded:
+            assert loaded is not None
+            assert not model.unload()
+            assert model.is_loaded
+        assert model.unload()
+        assert not model.is_loaded
+
+    def test_load_failure_propagates_and_retries(self):
+        attempts = []
+
+        def loader():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise RuntimeError('CUDA out of memory')
+            return 'model'
+
+        model = LazyModel('test', loader, idle_timeout=0)
+        with pytest.raises(RuntimeError):
+            with model.use():
+                pass
+        assert not model.is_loaded
+
+        with model.use() as loaded:
+            assert loaded == 'model'
+        assert model.load_count == 1
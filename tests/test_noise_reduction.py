@@ -0,0 +1,59 @@
+# tests/test_noise_reduction.py
+
+import numpy as np
+
+from audio.noise_reduction import StreamingNoiseReducer, reduce_noise_stream
+
+SR = 16000
+
+
+def make_signal(seconds=5, speech_from=2):
+    """앞부분은 노이즈만, 이후 440Hz 톤이 섞인 테스트 신호"""
+    rng = np.random.default_rng(0)
+    signal = (rng.standard_normal(SR * seconds) * 0.01).astype(np.float32)
+    t = np.arange(SR * seconds) / SR
+    signal[SR * speech_from:] += 0.5 * np.sin(2 * np.pi * 440 * t[SR * speech_from:])
+    return signal
+
+
+def split_blocks(signal, size):
+    return [signal[i:i + size] for i in range(0, len(signal), size)]
+
+
+class TestStreamingNoiseReducer:
+    """블록 단위 노이즈 제거 테스트"""
+
+    def test_identity_without_reduction(self):
+        """감쇠가 0이면 overlap-add로 원본이 복원되어야 함"""
+        signal = make_signal()
+        output = np.concatenate(list(reduce_noise_stream(split_blocks(signal, 7000), sr=SR, prop_decrease=0.0)))
+
+        assert len(output) == len(signal)
+        assert np.allclose(output, signal, atol=1e-5)
+
+    def test_noise_reduced_speech_kept(self):
+        """노이즈 구간 에너지는 줄고 음성 구간은 유지"""
+        signal = make_signal()
+        output = np.concatenate(list(reduce_noise_stream(split_blocks(signal, 4096), sr=SR)))
+
+        assert np.std(output[:SR * 2]) < np.std(signal[:SR * 2]) * 0.5
+        assert abs(np.std(output[SR * 3:]) - np.std(signal[SR * 3:])) < 0.01
+
+    def test_block_size_independent(self):
+        """블록 크기에 관계없이 동일한 결과"""
+        signal = make_signal()
+        a = np.concatenate(list(reduce_noise_stream(split_blocks(signal, 1000), sr=SR)))
+        b = np.concatenate(list(reduce_noise_stream(split_blocks(signal, 16000), sr=SR)))
+
+        assert np.allclose(a, b, atol=1e-6)
+
+    def test_short_input_flushed(self):
+        """프로파일 길이보다 짧은 입력도 flush 시 모두 반환"""
+        reducer = StreamingNoiseReducer(sr=SR)
+        signal = make_signal(seconds=1, speech_from=0)
+
+        head = reducer.process(signal)
+        tail = reducer.flush()
+
+        assert len(head) == 0
+        assert len(tail) == len(signal)
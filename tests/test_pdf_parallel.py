@@ -0,0 +1,46 @@
+# tests/test_pdf_parallel.py
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from ingestion import pdf_parallel
+from ingestion.pdf_parallel import iter_ranges, page_ranges, should_parallelize
+
+
+class TestPdfParallel:
+    """대용량 PDF 병렬 파싱 테스트"""
+
+    def test_page_ranges_cover_document_in_order(self):
+        ranges = page_ranges(1500, workers=8)
+        assert ranges[0][0] == 0 and ranges[-1][1] == 1500
+        assert all(prev[1] == cur[0] for prev, cur in zip(ranges, ranges[1:]))
+        assert len(ranges) == 32  # 작업자당 4개
+
+        assert page_ranges(60, workers=8) == [(0, 25), (25, 50), (50, 60)]
+        assert page_ranges(0, workers=4) == []
+
+    def test_threshold_keeps_small_pdfs_single_process(self, monkeypatch):
+        monkeypatch.setattr(pdf_parallel, 'FITZ_AVAILABLE', True)
+        assert should_parallelize(1500, workers=8, min_pages=200)
+        assert not should_parallelize(150, workers=8, min_pages=200)
+        assert not should_parallelize(1500, workers=1, min_pages=200)
+
+    def test_chunks_come_back_in_page_order_with_bounded_in_flight(self):
+        submitted = []
+
+        def extract(path, start, stop):
+            submitted.append(start)
+            time.sleep(0.002 * (stop - start) * (1 if start % 20 else 3))  # 범위마다 걸리는 시간이 다름
+            return [{'content': f'p{page}', 'page': page + 1, 'type': 'pdf_page'} for page in range(start, stop)
+                    if page % 7]  # 빈 페이지는 청크 없음
+
+        ranges = page_ranges(200, 4, min_pages_per_range=10)
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            pages = []
+            for chunk in iter_ranges('big.pdf', ranges, executor, max_in_flight=3, extract=extract):
+                pages.append(chunk['page'])
+                # 소비 중인 범위보다 최대 3개 범위만 앞서 제출
+                current = next(i for i, (start, stop) in enumerate(ranges) if start < chunk['page'] <= stop)
+                assert len(submitted) <= current + 1 + 3
+
+        assert pages == [page + 1 for page in range(200) if page % 7]
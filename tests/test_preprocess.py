@@ -0,0 +1,89 @@
+# tests/test_preprocess.py
+
+import io
+
+import numpy as np
+
+from audio import preprocess
+from audio.preprocess import decode_blocks, preprocess_stream, trim_silence_stream
+
+SR = 16000
+
+
+def tone(seconds, amplitude=0.5):
+    t = np.arange(int(SR * seconds)) / SR
+    return (amplitude * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+
+
+def quiet(seconds):
+    rng = np.random.default_rng(int(seconds * 1000))
+    return (rng.standard_normal(int(SR * seconds)) * 1e-4).astype(np.float32)
+
+
+def split_blocks(signal, size):
+    return [signal[i:i + size] for i in range(0, len(signal), size)]
+
+
+class FakeFFmpeg:
+    """ffmpeg 프로세스 대역 - float32 바이트를 읽을 때마다 홀수 길이로 끊어서 반환"""
+
+    def __init__(self, samples):
+        self.stdout = self._Chunked(np.asarray(samples, dtype='<f4').tobytes())
+        self.stderr = io.BytesIO()
+
+    class _Chunked(io.BytesIO):
+        def read(self, size=-1):
+            return super().read(min(size, 4097) if size > 0 else size)
+
+    def poll(self):
+        return 0
+
+    def wait(self):
+        return 0
+
+
+class TestTrimSilence:
+    """스트리밍 무음 제거 테스트"""
+
+    def test_long_silence_trimmed_short_gap_kept(self):
+        signal = np.concatenate([quiet(0.5), tone(1), quiet(3), tone(1), quiet(0.3), tone(1)])
+        output = np.concatenate(list(trim_silence_stream(split_blocks(signal, 4000), sr=SR)))
+
+        seconds = len(output) / SR
+        # 음성 3초 + 짧은 무음 0.3초 + 긴 무음 앞뒤 유지분(0.25초씩) 정도만 남음
+        assert 3.3 <= seconds <= 4.2
+        assert len(signal) - len(output) > SR * 2.5
+
+    def test_block_size_independent(self):
+        signal = np.concatenate([quiet(0.5), tone(1), quiet(2), tone(0.5)])
+        a = np.concatenate(list(trim_silence_stream(split_blocks(signal, 1000), sr=SR)))
+        b = np.concatenate(list(trim_silence_stream(split_blocks(signal, 16000), sr=SR)))
+
+        assert np.array_equal(a, b)
+
+
+class TestPreprocessStream:
+    """디코딩 → 노이즈 제거 → 무음 제거 블록 파이프라인 테스트"""
+
+    def test_decode_reassembles_partial_samples(self, monkeypatch):
+        signal = np.concatenate([quiet(0.5), tone(1)])
+        monkeypatch.setattr(preprocess.subprocess, 'Popen', lambda *args, **kwargs: FakeFFmpeg(signal))
+
+        blocks = list(decode_blocks('meeting.m4a', sr=SR, block_seconds=0.1))
+
+        assert all(len(block) <= SR // 10 for block in blocks)
+        assert np.array_equal(np.concatenate(blocks), signal)
+
+    def test_pipeline_consumes_blocks_lazily(self):
+        consumed = []
+
+        def blocks():
+            for block in split_blocks(np.concatenate([quiet(1), tone(10)]), SR):
+                consumed.append(len(block))
+                yield block
+
+        stream = preprocess_stream(blocks(), sr=SR)
+        next(stream)
+        # 첫 출력은 노이즈 프로파일(2초)과 블록 몇 개만 읽은 뒤 나옴
+        assert len(consumed) <= 4
+        assert sum(len(block) for block in stream) > SR * 9
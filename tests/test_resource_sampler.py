@@ -0,0 +1,54 @@
+# tests/test_resource_sampler.py
+
+import time
+
+from monitoring import resource_sampler
+from monitoring.resource_sampler import ResourceSampler
+from monitoring.ring_buffer import RingBuffer
+
+
+FAKE_GPU = {
+    'index': 0, 'name': 'NVIDIA H100', 'memory_used_gb': 10.0, 'memory_total_gb': 80.0,
+    'utilization_percent': 35.0, 'temperature_c': 41.0
+}
+
+
+class TestResourceSampler:
+    """자원 사용량 샘플러 테스트"""
+
+    def test_sample_once_feeds_buffer(self, monkeypatch):
+        monkeypatch.setattr(resource_sampler, 'query_gpus', lambda: [dict(FAKE_GPU)])
+        buffer = RingBuffer(3)
+        sampler = ResourceSampler(buffer, interval=0)
+
+        assert sampler.latest() is None
+        for _ in range(5):
+            sampler.sample_once()
+
+        assert len(buffer) == 3
+        latest = sampler.latest()
+        assert latest['gpus'] == [FAKE_GPU]
+        assert buffer.snapshot(1)[0] == latest
+        if resource_sampler.PSUTIL_AVAILABLE:
+            assert latest['rss_mb'] > 0
+
+    def test_background_thread_samples_and_stops(self, monkeypatch):
+        monkeypatch.setattr(resource_sampler, 'query_gpus', lambda: [])
+        buffer = RingBuffer(100)
+        sampler = ResourceSampler(buffer, interval=0.01)
+        sampler.start()
+        deadline = time.time() + 2
+        while len(buffer) < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        sampler.stop()
+
+        count = len(buffer)
+        assert count >= 2
+        time.sleep(0.05)
+        assert len(buffer) == count
+
+    def test_gpu_absent_is_graceful(self):
+        # GPU/NVML이 없는 호스트에서도 예외 없이 빈 결과
+        assert isinstance(resource_sampler.query_gpus(), list)
+        if not resource_sampler.NVML_AVAILABLE:
+            assert resource_sampler.gpu_temperature(0) is None
@@ -0,0 +1,61 @@
+# tests/test_ring_buffer.py
+
+import json
+import os
+import threading
+
+from monitoring.ring_buffer import RequestLogRecord, RingBuffer, tail_lines
+
+
+def record(i):
+    return RequestLogRecord(f'2025-07-01T00:00:{i:02d}', '텍스트', f'user{i}', '모드: standard', 'success', '0.5초')
+
+
+class TestRingBuffer:
+    """링 버퍼 테스트"""
+
+    def test_keeps_newest_items(self):
+        buffer = RingBuffer(capacity=3)
+        for i in range(5):
+            buffer.append(record(i))
+
+        assert len(buffer) == 3
+        assert [r['user'] for r in buffer.snapshot()] == ['user4', 'user3', 'user2']
+        assert [r['user'] for r in buffer.snapshot(2, newest_first=False)] == ['user2', 'user3']
+
+    def test_concurrent_append(self):
+        buffer = RingBuffer(capacity=100)
+        threads = [threading.Thread(target=lambda: [buffer.append(i) for i in range(1000)]) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert buffer.total_appended == 4000
+        assert len(buffer) == 100
+
+    def test_history_beyond_memory_from_spill(self, tmp_path):
+        path = str(tmp_path / 'logs' / 'requests.jsonl')
+        buffer = RingBuffer(capacity=2, spill_path=path)
+        for i in range(10):
+            buffer.append(record(i))
+        buffer.close()
+
+        history = buffer.history(5)
+
+        assert [r['user'] for r in history] == ['user9', 'user8', 'user7', 'user6', 'user5']
+        assert len(tail_lines(path, 100)) == 10
+
+    def test_spill_rolls_over_once(self, tmp_path):
+        """최대 크기를 넘으면 .1 파일로 교체하고, history는 두 파일에 걸쳐 읽음"""
+        path = str(tmp_path / 'requests.jsonl')
+        line_bytes = len(json.dumps(record(0).to_dict(), ensure_ascii=False).encode('utf-8')) + 1
+        buffer = RingBuffer(capacity=2, spill_path=path, spill_max_bytes=line_bytes * 4)
+        for i in range(10):
+            buffer.append(record(i))
+        buffer.close()
+
+        assert len(tail_lines(path, 100)) == 2
+        assert len(tail_lines(path + '.1', 100)) == 4
+        assert not os.path.exists(path + '.2')
+        assert [r['user'] for r in buffer.history(5)] == ['user9', 'user8', 'user7', 'user6', 'user5']
@@ -0,0 +1,95 @@
+# tests/test_session_events.py
+
+import json
+import threading
+import time
+
+from audio.session_events import SessionStore, sse_events
+
+
+class TestSessionStore:
+    """오디오 처리 세션 저장소 테스트"""
+
+    def test_update_published_to_subscribers(self):
+        store = SessionStore()
+        session_id = store.create('user1')
+        events = store.subscribe(session_id)
+
+        store.update(session_id, 'transcribing', 60, '음성 인식 중...')
+        store.update(session_id, 'completed', 100, '처리 완료', {'status': 'success'})
+
+        first, second = events.get_nowait(), events.get_nowait()
+        assert (first['status'], first['progress']) == ('transcribing', 60)
+        assert second['result'] == {'status': 'success'}
+
+    def test_bounded_store_evicts_oldest(self):
+        store = SessionStore(max_sessions=3)
+        ids = [store.create('user') for _ in range(3)]
+        store.update(ids[0], 'transcribing', 50)
+
+        store.create('user')
+
+        assert len(store) == 3
+        assert store.get(ids[1]) is None
+        assert store.get(ids[0]) is not None
+
+    def test_ttl_expiry_closes_subscribers(self):
+        store = SessionStore(ttl_seconds=0.05)
+        session_id = store.create('user')
+        events = store.subscribe(session_id)
+
+        time.sleep(0.1)
+        assert store.evict_expired() == 1
+        assert events.get_nowait() is None
+        assert store.get(session_id) is None
+
+    def test_slow_subscriber_keeps_latest(self):
+        store = SessionStore(queue_size=2)
+        session_id = store.create('user')
+        events = store.subscribe(session_id)
+
+        for progress in range(10):
+            store.update(session_id, 'processing', progress)
+
+        assert [events.get_nowait()['progress'] for _ in range(2)] == [8, 9]
+
+    def test_claim_reuses_reserved_session(self):
+        store = SessionStore()
+        reserved = store.create('user')
+
+        assert store.claim(reserved, 'user') == reserved
+        # 이미 처리에 사용된 세션, 다른 사용자의 세션, 없는 세션은 새로 생성
+        assert store.claim(reserved, 'user') != reserved
+        assert store.claim(store.create('other'), 'user') not in (None, reserved)
+        assert store.claim('unknown', 'user') != 'unknown'
+
+
+class TestSSEEvents:
+    """처리 시작 전에 구독한 클라이언트의 진행 이벤트 수신 테스트"""
+
+    def test_subscriber_receives_intermediate_events(self):
+        store = SessionStore()
+        session_id = store.create('user')
+        stream = sse_events(store, session_id, store.subscribe(session_id), keepalive_seconds=0.01)
+        claimed = threading.Event()
+
+        def process():
+            assert store.claim(session_id, 'user') == session_id
+            claimed.set()
+            store.update(session_id, 'uploading', 20, '파일 업로드 완료')
+            time.sleep(0.05)
+            store.update(session_id, 'transcribing', 60, '음성 인식 중...')
+            store.update(session_id, 'completed', 100, '처리 완료', {'status': 'success'})
+
+        # 구독 직후 현재 상태를 먼저 받고, 처리 중 갱신을 순서대로 받음
+        first = next(stream)
+        worker = threading.Thread(target=process)
+        worker.start()
+        messages = [first] + [m for m in stream if m.startswith('event: progress')][:3]
+        worker.join()
+
+        events = [json.loads(m.split('data: ', 1)[1]) for m in messages]
+        assert claimed.is_set()
+        assert [e['status'] for e in events] == ['initialized', 'uploading', 'transcribing', 'completed']
+        assert events[-1]['result'] == {'status': 'success'}
+        assert store.stats()['subscribers'] == 0
@@ -0,0 +1,95 @@
+# tests/test_streaming_stt.py
+
+import numpy as np
+import pytest
+
+from audio.streaming_stt import StreamingConfig, StreamingTranscriber
+
+SR = 16000
+
+
+def tone(seconds, amplitude=0.3):
+    t = np.arange(int(SR * seconds)) / SR
+    return (amplitude * np.sin(2 * np.pi * 300 * t)).astype(np.float32)
+
+
+def silence(seconds):
+    rng = np.random.default_rng(1)
+    return (rng.standard_normal(int(SR * seconds)) * 0.001).astype(np.float32)
+
+
+def to_pcm(samples):
+    return (samples * 32767).astype('<i2').tobytes()
+
+
+def stream(session, samples, frame_ms=100):
+    """프레임 단위로 전송하며 이벤트 수집"""
+    pcm = to_pcm(samples)
+    step = int(SR * frame_ms / 1000) * 2
+    events = []
+    for offset in range(0, len(pcm), step):
+        events.extend(session.feed(pcm[offset:offset + step]))
+    events.extend(session.finish())
+    return events
+
+
+class TestStreamingSession:
+    """VAD 기반 스트리밍 세션 테스트"""
+
+    def test_final_segments_at_pauses(self):
+        """휴지 구간마다 확정 결과가 하나씩 생성"""
+        calls = []
+
+        def fake_transcribe(samples, final):
+            calls.append((len(samples), final))
+            return f"세그먼트 {len(samples) / SR:.1f}초" if final else "중간"
+
+        transcriber = StreamingTranscriber(fake_transcribe, max_workers=2)
+        session = transcriber.open_session(config=StreamingConfig(pause_ms=600))
+
+        audio = np.concatenate([silence(1), tone(2), silence(1.5), tone(1), silence(1.5)])
+        events = stream(session, audio)
+        finals = [e for e in events if e['type'] == 'final']
+
+        assert len(finals) == 2
+        assert finals[0]['start'] < 1.1 and finals[0]['end'] > 2.9
+        assert finals[1]['start'] > 4.0
+        assert any(not final for _, final in calls)
+        assert transcriber.active_sessions == 0
+
+    def test_resampled_input(self):
+        """48kHz 입력도 16kHz로 변환하여 처리"""
+        lengths = []
+
+        def fake_transcribe(samples, final):
+            if final:
+                lengths.append(len(samples))
+            return "텍스트"
+
+        transcriber = StreamingTranscriber(fake_transcribe)
+        session = transcriber.open_session(sample_rate=48000)
+
+        t = np.arange(48000 * 2) / 48000
+        audio = np.concatenate([np.zeros(48000, dtype=np.float32), (0.3 * np.sin(2 * np.pi * 300 * t)).astype(np.float32)])
+        events = stream(session, audio)
+
+        assert [e['type'] for e in events if e['type'] == 'final'] == ['final']
+        assert abs(lengths[0] / SR - 2.2) < 0.3
+
+    def test_long_speech_split(self):
+        """최대 세그먼트 길이를 넘으면 강제로 확정"""
+        transcriber = StreamingTranscriber(lambda samples, final: "음성")
+        session = transcriber.open_session(config=StreamingConfig(max_segment_seconds=3.0))
+
+        events = stream(session, np.concatenate([silence(0.5), tone(7)]))
+
+        assert len([e for e in events if e['type'] == 'final']) == 3
+
+    def test_failed_open_does_not_leak_session_slot(self):
+        """세션 생성이 실패하면 활성 세션 수가 늘지 않음"""
+        transcriber = StreamingTranscriber(lambda samples, final: "")
+
+        with pytest.raises(ValueError):
+            transcriber.open_session(encoding='mp3')
+
+        assert transcriber.active_sessions == 0
@@ -0,0 +1,109 @@
+# tests/test_stt_engines.py
+
+import pytest
+
+from audio.stt_engines import FasterWhisperEngine, STTEngine, STTResult, STTRouter
+
+
+class FakeEngine(STTEngine):
+    """테스트용 엔진"""
+
+    def __init__(self, name, expected_rtf=0.5, max_duration=None, offline=True, fail=False, actual_rtf=None):
+        self.name = name
+        self.expected_rtf = expected_rtf
+        self.actual_rtf = actual_rtf if actual_rtf is not None else expected_rtf
+        self.max_duration = max_duration
+        self.offline = offline
+        self.fail = fail
+        self.calls = 0
+
+    def transcribe(self, audio_path, duration):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("엔진 오류")
+        return STTResult(text=f"{self.name} 결과", engine=self.name,
+                         audio_seconds=duration, elapsed_seconds=duration * self.actual_rtf)
+
+
+class TestSTTRouter:
+    """STT 엔진 선택 및 폴백 테스트"""
+
+    def test_fastest_engine_selected(self):
+        router = STTRouter()
+        router.register(FakeEngine('slow', expected_rtf=1.0))
+        router.register(FakeEngine('fast', expected_rtf=0.1))
+
+        assert router.transcribe('a.wav', duration=10).engine == 'fast'
+
+    def test_duration_limit_respected(self):
+        """최대 길이를 넘는 오디오는 해당 엔진을 건너뜀"""
+        router = STTRouter()
+        router.register(FakeEngine('short-only', expected_rtf=0.1, max_duration=30))
+        router.register(FakeEngine('long', expected_rtf=0.5))
+
+        assert router.transcribe('a.wav', duration=10).engine == 'short-only'
+        assert router.transcribe('a.wav', duration=600).engine == 'long'
+
+    def test_fallback_on_failure(self):
+        router = STTRouter()
+        broken = FakeEngine('broken', expected_rtf=0.1, fail=True)
+        router.register(broken)
+        router.register(FakeEngine('backup', expected_rtf=0.5))
+
+        result = router.transcribe('a.wav', duration=10)
+
+        assert result.engine == 'backup'
+        assert broken.calls == 1
+        assert router.status()['broken']['failures'] == 1
+
+    def test_online_engine_disabled_by_default(self):
+        router = STTRouter()
+        router.register(FakeEngine('online', offline=False))
+
+        with pytest.raises(RuntimeError):
+            router.transcribe('a.wav', duration=10)
+
+        router.allow_online = True
+        assert router.transcribe('a.wav', duration=10).engine == 'online'
+
+    def test_measured_rtf_updates_choice(self):
+        """실측 RTF가 초기 추정보다 나쁘면 다른 엔진 선택"""
+        router = STTRouter(rtf_alpha=1.0)
+        router.register(FakeEngine('optimistic', expected_rtf=0.1, actual_rtf=2.0))
+        router.register(FakeEngine('steady', expected_rtf=0.3))
+
+        assert router.transcribe('a.wav', duration=10).engine == 'optimistic'
+        assert router.transcribe('a.wav', duration=10).engine == 'steady'
+
+    def test_queue_depth_considered(self):
+        router = STTRouter()
+        router.register(FakeEngine('gpu', expected_rtf=0.1))
+        router.register(FakeEngine('cpu', expected_rtf=0.5))
+        router._stats['gpu']['in_flight'] = 10
+
+        assert router.candidates(10)[0].name == 'cpu'
+
+    def test_result_reports_model_of_engine_that_answered(self):
+        """폴백된 엔진의 모델 이름이 결과에 남음 (전사 캐시 키용)"""
+        router = STTRouter()
+        router.register(FakeEngine('fast', expected_rtf=0.1, fail=True))
+        router.register(FakeEngine('slow', expected_rtf=0.5))
+        whisper = FasterWhisperEngine(model=None, model_size='large-v3')
+
+        assert router.transcribe('a.wav', duration=10).model == 'slow'
+        assert whisper.cache_name == 'faster-whisper:large-v3'
+
+    def test_unknown_duration_skips_duration_limited_engines(self):
+        """길이를 알 수 없으면(m4a 등 probe 실패) 최대 길이가 있는 엔진은 제외"""
+        router = STTRouter()
+        router.register(FakeEngine('short-only', expected_rtf=0.1, max_duration=30))
+        router.register(FakeEngine('long', expected_rtf=0.5))
+
+        assert [engine.name for engine in router.candidates(None)] == ['long']
+
+    def test_engine_without_transcribe_cannot_be_created(self):
+        class Incomplete(STTEngine):
+            name = 'incomplete'
+
+        with pytest.raises(TypeError):
+            Incomplete()
@@ -0,0 +1,129 @@
+# tests/test_summarizer.py
+
+from audio.summarizer import MapReduceSummarizer, chunk_text, estimate_tokens, truncate_to_tokens
+
+
+def make_transcript(n, prefix='문장'):
+    return " ".join(f"{prefix} {i}번 내용은 도로 보수 일정에 관한 것입니다." for i in range(n))
+
+
+class FakeLLM:
+    def __init__(self):
+        self.prompts = []
+
+    def __call__(self, prompt):
+        self.prompts.append(prompt)
+        return f"요약{len(self.prompts)}"
+
+
+class FlakyLLM(FakeLLM):
+    """특정 청크는 항상 실패하고, 다른 청크는 첫 시도만 실패"""
+
+    def __init__(self, always_fail, fail_once):
+        super().__init__()
+        self.always_fail = always_fail
+        self.fail_once = fail_once
+        self.failed_once = set()
+
+    def __call__(self, prompt):
+        if self.always_fail in prompt:
+            self.prompts.append(prompt)
+            raise TimeoutError('LLM 응답 시간 초과')
+        if self.fail_once in prompt and self.fail_once not in self.failed_once:
+            self.failed_once.add(self.fail_once)
+            self.prompts.append(prompt)
+            return None
+        return super().__call__(prompt)
+
+
+class TestChunking:
+    """토큰 예산 청크 분할 테스트"""
+
+    def test_chunks_respect_budget(self):
+        chunks = chunk_text(make_transcript(200), max_tokens=200)
+
+        assert len(chunks) > 1
+        assert all(estimate_tokens(c) <= 200 for c in chunks)
+
+    def test_edit_only_changes_nearby_chunks(self):
+        """앞부분을 수정해도 뒤쪽 청크는 그대로 유지"""
+        original = make_transcript(300)
+        edited = "추가된 첫 문장입니다. " + original
+
+        before = chunk_text(original, max_tokens=200)
+        after = chunk_text(edited, max_tokens=200)
+
+        assert len(set(before) & set(after)) >= len(before) - 2
+
+
+    def test_truncate_uses_token_estimate(self):
+        """한글은 글자당 1토큰이므로 글자 수가 아니라 추정 토큰 수로 자름"""
+        text = "가" * 100 + "abcd" * 100
+
+        assert truncate_to_tokens(text, 120) == "가" * 100 + "abcd" * 20
+        assert estimate_tokens(truncate_to_tokens("가나다 " * 300, 150)) <= 150
+        assert truncate_to_tokens("짧은 문장", 150) == "짧은 문장"
+
+
+class TestMapReduceSummarizer:
+    """계층 요약 테스트"""
+
+    def test_short_text_single_call(self):
+        llm = FakeLLM()
+        summarizer = MapReduceSummarizer(llm, max_chunk_tokens=500)
+
+        result = summarizer.summarize("짧은 회의 내용입니다.", "요약: {text}")
+        assert result.text == "요약1" and not result.partial
+        assert llm.prompts == ["요약: 짧은 회의 내용입니다."]
+
+    def test_long_text_is_mapped_then_reduced(self):
+        llm = FakeLLM()
+        summarizer = MapReduceSummarizer(llm, max_chunk_tokens=200)
+        text = make_transcript(200)
+
+        summarizer.summarize(text, "최종: {text}")
+        n_chunks = len(chunk_text(text, 200))
+
+        assert len(llm.prompts) == n_chunks + 1
+        assert llm.prompts[-1].startswith("최종: ")
+        assert all(estimate_tokens(p) < 400 for p in llm.prompts)
+
+    def test_resummarize_reuses_unchanged_chunks(self):
+        llm = FakeLLM()
+        summarizer = MapReduceSummarizer(llm, max_chunk_tokens=200)
+        text = make_transcript(300)
+
+        summarizer.summarize(text, "최종: {text}")
+        first_calls = len(llm.prompts)
+        summarizer.summarize("추가된 첫 문장입니다. " + text, "최종: {text}")
+
+        # 바뀐 청크 몇 개 + 최종 호출만 다시 수행
+        assert len(llm.prompts) - first_calls <= 4
+        assert summarizer.stats()['cache_hits'] > 0
+
+    def test_failed_chunk_is_retried_then_reported(self):
+        text = make_transcript(200)
+        chunks = chunk_text(text, 200)
+        llm = FlakyLLM(always_fail=chunks[1], fail_once=chunks[2])
+        summarizer = MapReduceSummarizer(llm, max_chunk_tokens=200, chunk_retries=2, retry_delay=0)
+
+        result = summarizer.summarize(text, "최종: {text}")
+
+        # 일시 실패한 청크는 재시도로 복구, 계속 실패한 청크만 누락으로 표시
+        assert result.partial
+        assert result.failed_chunks == 1 and result.chunks == len(chunks)
+        assert result.info() == {'partial': True, 'chunks': len(chunks), 'failed_chunks': 1}
+        assert sum(chunks[1] in p for p in llm.prompts) == 3
+        assert sum(chunks[2] in p for p in llm.prompts) == 2
+        # 실패한 청크는 캐시하지 않아 다음 요청에서 다시 시도
+        llm.always_fail = '<복구됨>'
+        assert not summarizer.summarize(text, "최종: {text}").partial
+
+    def test_final_call_is_retried(self):
+        llm = FlakyLLM(always_fail='<없음>', fail_once='최종:')
+        summarizer = MapReduceSummarizer(llm, max_chunk_tokens=200, chunk_retries=2, retry_delay=0)
+
+        result = summarizer.summarize("짧은 회의 내용입니다.", "최종: {text}")
+
+        assert result.text == "요약2"
+        assert len(llm.prompts) == 2
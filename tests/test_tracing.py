@@ -0,0 +1,102 @@
+# tests/test_tracing.py
+
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from monitoring.tracing import NOOP_SPAN, OTLPJsonFileExporter, Tracer
+
+
+class TestTracer:
+    """요청 추적 테스트"""
+
+    def test_unsampled_request_records_nothing(self):
+        tracer = Tracer(sample_rate=0.0)
+        calls = []
+
+        @tracer.traced('work')
+        def work():
+            calls.append(tracer.current_span())
+            return 42
+
+        handle = tracer.start_trace('GET /', 'req-1')
+        assert work() == 42
+        tracer.end_trace(handle)
+
+        assert calls == [NOOP_SPAN]
+        assert tracer.get_trace('req-1') is None
+
+    def test_nested_spans_have_parent_ids(self):
+        tracer = Tracer()
+
+        @tracer.traced('inner')
+        def inner():
+            tracer.current_span().set_attribute('k', 1)
+
+        handle = tracer.start_trace('POST /api/chat', 'req-2', force=True)
+        with tracer.span('outer'):
+            inner()
+        tracer.end_trace(handle, {'http.status_code': 200})
+
+        trace = tracer.get_trace('req-2')
+        names = [s['name'] for s in trace['spans']]
+        assert names == ['POST /api/chat', 'outer', 'inner']
+        root, outer, inner_span = trace['spans']
+        assert outer['parent_id'] == root['span_id']
+        assert inner_span['parent_id'] == outer['span_id']
+        assert inner_span['depth'] == 2
+        assert inner_span['attributes'] == {'k': 1}
+        assert root['attributes']['http.status_code'] == 200
+
+    def test_span_records_error_and_bounded_storage(self):
+        tracer = Tracer(max_traces=2)
+        for i in range(3):
+            handle = tracer.start_trace('job', f'req-{i}', force=True)
+            try:
+                with tracer.span('fail'):
+                    raise RuntimeError('boom')
+            except RuntimeError:
+                pass
+            tracer.end_trace(handle)
+
+        assert tracer.get_trace('req-0') is None
+        spans = tracer.get_trace('req-2')['spans']
+        assert spans[1]['error'] == 'RuntimeError: boom'
+
+    def test_bind_propagates_to_thread_pool(self):
+        tracer = Tracer()
+
+        @tracer.traced('background')
+        def background():
+            return threading.current_thread().name
+
+        handle = tracer.start_trace('job', 'req-3', force=True)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            executor.submit(tracer.bind(background)).result()
+            executor.submit(background).result()  # 바인딩하지 않으면 기록되지 않음
+        tracer.end_trace(handle)
+
+        names = [s['name'] for s in tracer.get_trace('req-3')['spans']]
+        assert names == ['job', 'background']
+
+
+class TestOTLPExport:
+    """OTLP JSON 내보내기 테스트"""
+
+    def test_otlp_export(self, tmp_path):
+        path = str(tmp_path / 'traces' / 'otlp.jsonl')
+        tracer = Tracer(exporter=OTLPJsonFileExporter(path))
+        handle = tracer.start_trace('GET /health', 'req-4', force=True)
+        with tracer.span('child', limit=3):
+            pass
+        tracer.end_trace(handle)
+
+        with open(path, encoding='utf-8') as f:
+            payload = json.loads(f.readline())
+        spans = payload['resourceSpans'][0]['scopeSpans'][0]['spans']
+        assert len(spans) == 2
+        assert spans[1]['parentSpanId'] == spans[0]['spanId']
+        assert len(spans[0]['traceId']) == 32
+        attrs = {a['key']: a['value'] for a in spans[1]['attributes']}
+        assert attrs['limit'] == {'intValue': '3'}
+        assert attrs['request.id'] == {'stringValue': 'req-4'}
@@ -0,0 +1,55 @@
+# tests/test_transcript_cache.py
+
+import os
+
+from audio.transcript_cache import TranscriptCache
+
+
+def write_audio(path, content):
+    with open(path, 'wb') as f:
+        f.write(content)
+    return str(path)
+
+
+class TestTranscriptCache:
+    """전사 캐시 테스트"""
+
+    def test_same_audio_reused(self, tmp_path):
+        """같은 오디오 + 같은 옵션이면 캐시 적중"""
+        cache = TranscriptCache(str(tmp_path / 'cache'))
+        first = write_audio(tmp_path / 'a.wav', b'RIFF' + b'\x01' * 1000)
+        second = write_audio(tmp_path / 'b.m4a', b'RIFF' + b'\x01' * 1000)
+
+        key = cache.make_key(cache.audio_digest(first), 'faster-whisper:medium', {'beam_size': 5})
+        assert cache.get(key) is None
+
+        cache.put(key, '안녕하세요 한국도로공사입니다.')
+        same_key = cache.make_key(cache.audio_digest(second), 'faster-whisper:medium', {'beam_size': 5})
+
+        assert cache.get(same_key)['text'] == '안녕하세요 한국도로공사입니다.'
+        assert cache.stats()['hits'] == 1
+
+    def test_key_depends_on_model_and_options(self, tmp_path):
+        """모델이나 옵션이 다르면 다른 키"""
+        digest = 'abc'
+        base = TranscriptCache.make_key(digest, 'faster-whisper:medium', {'beam_size': 5})
+
+        assert base != TranscriptCache.make_key(digest, 'faster-whisper:large-v3', {'beam_size': 5})
+        assert base != TranscriptCache.make_key(digest, 'faster-whisper:medium', {'beam_size': 1})
+
+    def test_eviction_by_size(self, tmp_path):
+        """크기 제한 초과 시 오래 사용하지 않은 항목부터 제거"""
+        cache = TranscriptCache(str(tmp_path / 'cache'), max_bytes=3000)
+
+        for i in range(3):
+            cache.put(f'key{i}', '가' * 300)
+            os.utime(cache._path(f'key{i}'), (1000 + i, 1000 + i))
+
+        # key0을 최근 사용으로 갱신
+        assert cache.get('key0') is not None
+        cache.put('key3', '나' * 300)
+
+        assert cache.get('key1') is None
+        assert cache.get('key0') is not None
+        assert cache.get('key3') is not None
+        assert cache.stats()['size_mb'] * 1024 ** 2 <= 3000
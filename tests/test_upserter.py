@@ -0,0 +1,101 @@
+# tests/test_upserter.py
+
+import threading
+
+import pytest
+
+from ingestion.incremental import assign_point_ids, plan_update
+from ingestion.upserter import BatchUpserter, UpsertCheckpoint, UpsertError, is_transient
+
+
+class HTTPError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+
+
+class FakeClient:
+    def __init__(self, fail_plan=None):
+        self.calls = []
+        self.fail_plan = dict(fail_plan or {})  # 첫 포인트 → 남은 실패 횟수와 예외
+        self.lock = threading.Lock()
+
+    def upsert(self, collection_name, points, wait):
+        with self.lock:
+            plan = self.fail_plan.get(points[0])
+            if plan and plan[0] > 0:
+                plan[0] -= 1
+                raise plan[1]
+            self.calls.append((tuple(points), wait))
+
+
+class TestBatchUpserter:
+    """배치 병렬 업서트 테스트"""
+
+    def test_batches_in_parallel_with_final_wait_barrier(self):
+        client = FakeClient()
+        upserter = BatchUpserter(client, 'documents', batch_size=3, max_in_flight=3)
+        result = upserter.upsert(list(range(10)), key='a.pdf:1')
+
+        assert result == {'batches': 4, 'sent': 4, 'resumed': 0}
+        assert sorted(p for points, _ in client.calls for p in points) == list(range(10))
+        # 장벽 배치만 wait=True이고 가장 마지막에 전송됨
+        assert [w for _, w in client.calls].count(True) == 1
+        assert client.calls[-1] == ((9,), True)
+
+    def test_transient_errors_are_retried(self):
+        client = FakeClient({3: [2, HTTPError(503)]})
+        upserter = BatchUpserter(client, 'documents', batch_size=3, backoff_seconds=0.001)
+        upserter.upsert(list(range(9)), key='b.xlsx:1')
+
+        assert upserter.stats()['retries'] == 2
+        assert len(client.calls) == 3
+
+    def test_failure_keeps_checkpoint_and_retry_resumes(self, tmp_path):
+        checkpoint_path = str(tmp_path / 'checkpoint.json')
+        client = FakeClient({3: [1, HTTPError(400)]})
+        upserter = BatchUpserter(client, 'documents', batch_size=3, max_retries=0,
+                                 checkpoint=UpsertCheckpoint(checkpoint_path))
+
+        with pytest.raises(UpsertError):
+            upserter.upsert(list(range(12)), key='c.pdf:1')
+        sent_before = {points for points, _ in client.calls}
+        assert (3, 4, 5) not in sent_before
+
+        # 새 프로세스에서도 체크포인트로 이어서 전송
+        client.calls.clear()
+        resumed = BatchUpserter(client, 'documents', batch_size=3, checkpoint=UpsertCheckpoint(checkpoint_path))
+        result = resumed.upsert(list(range(12)), key='c.pdf:1')
+
+        assert result['resumed'] == 2
+        assert {points for points, _ in client.calls} == {(3, 4, 5), (9, 10, 11)}
+
+    def test_forced_retry_does_not_reuse_batches_of_a_different_plan(self, tmp_path):
+        """같은 파일 내용이라도 force_update로 업서트 대상이 바뀌면 다른 체크포인트 키 사용"""
+        old = [{'content': f'{i}장', 'page': i + 1, 'type': 'pdf_page'} for i in range(4)]
+        previous = assign_point_ids('a.pdf', old)
+        new = old[:3] + [{'content': '3장 (개정)', 'page': 4, 'type': 'pdf_page'}]
+        plan = plan_update('a.pdf', new, previous)
+        forced = plan_update('a.pdf', new, previous, reembed=True)
+
+        assert plan.digest() != forced.digest()
+        assert plan.digest() == plan_update('a.pdf', new, previous).digest()
+
+        checkpoint = UpsertCheckpoint(str(tmp_path / 'checkpoint.json'))
+        checkpoint.mark(f'a.pdf:h1:0:{plan.digest()}', 0)
+        checkpoint.mark(f'a.pdf:h1:1:{forced.digest()}', 0)
+        checkpoint.mark('a.pdf:h2:0:x', 0)
+        assert not checkpoint.completed(f'a.pdf:h1:0:{forced.digest()}')
+
+        checkpoint.clear_prefix('a.pdf:h1:')
+        reloaded = UpsertCheckpoint(str(tmp_path / 'checkpoint.json'))
+        assert not reloaded.completed(f'a.pdf:h1:0:{plan.digest()}')
+        assert not reloaded.completed(f'a.pdf:h1:1:{forced.digest()}')
+        assert reloaded.completed('a.pdf:h2:0:x') == {0}
+
+    def test_is_transient(self):
+        assert is_transient(HTTPError(429))
+        assert is_transient(HTTPError(502))
+        assert not is_transient(HTTPError(400))
+        assert is_transient(ConnectionResetError())
+        assert not is_transient(ValueError('bad vector size'))
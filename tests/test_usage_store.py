@@ -0,0 +1,47 @@
+# tests/test_usage_store.py
+
+import time
+from datetime import datetime, timedelta
+
+from monitoring.usage_store import UsageStore
+
+
+class TestUsageStore:
+    """사용량 저장소 테스트"""
+
+    def test_batched_rollup(self, tmp_path):
+        store = UsageStore(str(tmp_path / 'usage.db'), flush_interval=0.05)
+        for i in range(10):
+            store.record('/api/chat', 'think', f'user{i}', 1.0 + i, 'success', docs_found=3)
+        store.record('/api/chat', 'standard', 'user0', 0.5, 'error')
+        store.flush()
+
+        today = datetime.now().strftime('%Y-%m-%d')
+        assert store.daily_totals(15)[today] == 11
+
+        think = next(r for r in store.breakdown() if r['mode'] == 'think')
+        assert think['requests'] == 10
+        assert think['avg_latency_ms'] == 5500.0
+        assert think['max_latency_ms'] == 10000.0
+        assert think['avg_docs_found'] == 3.0
+
+    def test_history_survives_restart(self, tmp_path):
+        path = str(tmp_path / 'usage.db')
+        store = UsageStore(path, flush_interval=0.05)
+        yesterday = time.time() - 86400
+        store.record('/api/upload_voice', 'summarize', 'user1', 30.0, 'success', timestamp=yesterday)
+        store.flush()
+
+        reopened = UsageStore(path)
+        totals = reopened.daily_totals(15)
+
+        assert len(totals) == 15
+        assert totals[(datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')] == 1
+
+    def test_purge_keeps_rollups(self, tmp_path):
+        store = UsageStore(str(tmp_path / 'usage.db'), flush_interval=0.05)
+        store.record('/api/chat', 'standard', 'user1', 1.0, 'success', timestamp=time.time() - 200 * 86400)
+        store.flush()
+
+        assert store.purge_events(keep_days=90) == 1
+        assert store.breakdown(days=365)[0]['requests'] == 1
@@ -0,0 +1,59 @@
+# tests/test_watcher.py
+
+import os
+
+from ingestion.watcher import CHANGED, DELETED, ChangeDebouncer, DirectoryWatcher
+
+
+class TestChangeDebouncer:
+    def test_debouncer_coalesces_bursts(self):
+        debouncer = ChangeDebouncer(quiet_seconds=2.0, max_delay_seconds=10.0)
+        debouncer.add('/docs/a.pdf', CHANGED, now=0.0)
+        debouncer.add('/docs/a.pdf', CHANGED, now=1.5)
+        debouncer.add('/docs/b.pdf', CHANGED, now=1.0)
+        debouncer.add('/docs/b.pdf', DELETED, now=1.2)
+
+        assert debouncer.due(now=2.5) == ([], [])
+        assert debouncer.due(now=3.3) == ([], ['/docs/b.pdf'])
+        assert debouncer.due(now=3.6) == (['/docs/a.pdf'], [])
+        assert len(debouncer) == 0
+
+        # 계속 쓰이는 파일도 max_delay가 지나면 처리
+        for t in range(0, 12):
+            debouncer.add('/docs/log.txt', CHANGED, now=float(t))
+        assert debouncer.due(now=11.0) == (['/docs/log.txt'], [])
+
+
+class TestDirectoryWatcher:
+    """디렉토리 감시 테스트"""
+
+    def test_polling_watcher_reports_only_changed_files(self, tmp_path):
+        (tmp_path / 'keep.txt').write_text('그대로', encoding='utf-8')
+        (tmp_path / 'edit.txt').write_text('이전', encoding='utf-8')
+        (tmp_path / 'gone.pdf').write_bytes(b'%PDF')
+        batches = []
+
+        watcher = DirectoryWatcher([str(tmp_path)], lambda changed, deleted: batches.append((changed, deleted)),
+                                   extensions={'.txt', '.pdf'}, debounce_seconds=0, use_watchdog=False)
+        watcher.poll_once()  # 시작 스냅샷
+
+        (tmp_path / 'edit.txt').write_text('수정된 내용', encoding='utf-8')
+        (tmp_path / 'new.txt').write_text('새 파일', encoding='utf-8')
+        (tmp_path / '~$temp.txt').write_text('임시', encoding='utf-8')
+        (tmp_path / 'image.png').write_bytes(b'png')
+        os.remove(tmp_path / 'gone.pdf')
+        watcher.poll_once()
+
+        assert watcher.dispatch_due()
+        assert batches == [([str(tmp_path / 'edit.txt'), str(tmp_path / 'new.txt')], [str(tmp_path / 'gone.pdf')])]
+        assert not watcher.dispatch_due()
+
+    def test_callback_errors_do_not_stop_watcher(self, tmp_path):
+        def fail(changed, deleted):
+            raise RuntimeError('qdrant down')
+
+        watcher = DirectoryWatcher([str(tmp_path)], fail, debounce_seconds=0, use_watchdog=False)
+        watcher.notify(str(tmp_path / 'a.txt'), CHANGED)
+
+        assert watcher.dispatch_due()
+        assert watcher.status()['errors'] == 1 and watcher.status()['mode'] == 'polling'